@@ -1,6 +1,6 @@
 """Core models and account management."""
-from .accounts import AccountRegistry
-from .models import Account, GLRecord
 
-__all__ = ["Account", "GLRecord", "AccountRegistry"]
+from .accounts import AccountRegistry
+from .models import GL_RECORD_FIELDS, Account, GLRecord, GLRecordBatch
 
+__all__ = ["Account", "GLRecord", "GLRecordBatch", "GL_RECORD_FIELDS", "AccountRegistry"]
@@ -1,36 +1,72 @@
 """Configuration management for the QByte GL Data Service."""
-from pydantic import BaseSettings, Field
+
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    """Application settings."""
+    """Application settings (each field is read from the upper-case environment variable)."""
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
 
     # API Configuration
-    app_name: str = Field(default="QByte GL Data Service", env="APP_NAME")
-    app_version: str = Field(default="1.0.0", env="APP_VERSION")
-    debug: bool = Field(default=False, env="DEBUG")
+    app_name: str = Field(default="QByte GL Data Service")
+    app_version: str = Field(default="1.0.0")
+    debug: bool = Field(default=False)
 
     # Database Configuration
-    database_url: str | None = Field(default=None, env="DATABASE_URL")
+    database_url: str | None = Field(default=None)
 
     # Redis Configuration
-    redis_url: str | None = Field(default=None, env="REDIS_URL")
+    redis_url: str | None = Field(default=None)
 
     # Data Generation Configuration
-    historical_days: int = Field(default=365, env="HISTORICAL_DAYS")
-    streaming_interval_seconds: float = Field(default=30.0, env="STREAMING_INTERVAL_SECONDS")
-    fixed_start_date: str = Field(default="2025-11-10", env="FIXED_START_DATE")
-    random_seed: int = Field(default=42, env="RANDOM_SEED")
+    historical_days: int = Field(default=365, ge=0)
+    streaming_interval_seconds: float = Field(default=30.0, gt=0)
+    fixed_start_date: str = Field(default="2025-11-10")
+    random_seed: int = Field(default=42)
+
+    # Counter-based generation: every record is derived from (seed, gl_entry_id), so any ID
+    # or date range is generated on demand; only the latest preload_days of history are
+    # kept in memory (default: all of historical_days)
+    counter_based: bool = Field(default=False)
+    preload_days: int | None = Field(default=None, ge=0)
+
+    # Generation mode: "interval" emits one record per streaming_interval_seconds;
+    # "load" emits batches at load_records_per_second for load testing
+    generation_mode: Literal["interval", "load"] = Field(default="interval")
+    load_records_per_second: float = Field(default=10_000.0, gt=0)
+    load_tick_seconds: float = Field(default=0.1, gt=0)
+    load_records_per_day: int = Field(default=1_000_000, gt=0)
+
+    # Record buffer retention
+    buffer_hot_capacity: int = Field(default=100_000, gt=0)
+    buffer_segment_directory: str | None = Field(default=None)
+    buffer_max_records: int | None = Field(default=None, gt=0)
+    buffer_max_bytes: int | None = Field(default=None, gt=0)
+
+    # Snapshot of the generated history, reused across restarts when seed/start/days match
+    history_snapshot_directory: str | None = Field(default=None)
+
+    # Cache of encoded date-range responses (bytes of bodies kept; 0 disables it)
+    response_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0)
+
+    # Checkpoints of the live generator state; a restart resumes the stream from the latest one
+    checkpoint_directory: str | None = Field(default=None)
+    checkpoint_interval_seconds: float = Field(default=5.0, gt=0)
+
+    # Multi-worker deployments: workers share one generated stream through this directory
+    # (one worker generates and publishes, the rest serve a memory-mapped view)
+    shared_store_directory: str | None = Field(default=None)
+    shared_poll_seconds: float = Field(default=0.05, gt=0)
 
     # External APIs
-    eia_api_key: str | None = Field(default=None, env="EIA_API_KEY")
+    eia_api_key: str | None = Field(default=None)
 
     # Logging
-    log_level: str = Field(default="INFO", env="LOG_LEVEL")
-
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    log_level: str = Field(default="INFO")
 
 
 # Global settings instance
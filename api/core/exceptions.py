@@ -1,4 +1,5 @@
 """Custom exceptions for the QByte GL Data Service."""
+
 from typing import Any
 
 from fastapi import HTTPException
@@ -15,34 +16,39 @@ class GLDataServiceException(Exception):
 
 class DataGenerationError(GLDataServiceException):
     """Raised when data generation fails."""
+
     pass
 
 
 class InvalidDateRangeError(GLDataServiceException):
     """Raised when invalid date range is provided."""
+
     pass
 
 
 class StreamingError(GLDataServiceException):
     """Raised when streaming operations fail."""
+
     pass
 
 
 class ConfigurationError(GLDataServiceException):
     """Raised when service configuration is invalid."""
+
+    pass
+
+
+class InvalidCursorError(GLDataServiceException):
+    """Raised when a pagination cursor cannot be decoded."""
+
     pass
 
 
 def create_http_exception(
-    status_code: int,
-    message: str,
-    details: dict[str, Any] | None = None
+    status_code: int, message: str, details: dict[str, Any] | None = None
 ) -> HTTPException:
     """Create a standardized HTTP exception."""
-    content = {
-        "error": message,
-        "status_code": status_code
-    }
+    content = {"error": message, "status_code": status_code}
     if details:
         content["details"] = details
 
@@ -57,11 +63,7 @@ def validation_error(message: str, field: str | None = None) -> HTTPException:
 
 def not_found_error(resource: str, identifier: str) -> HTTPException:
     """Create a not found error (404)."""
-    return create_http_exception(
-        404,
-        f"{resource} not found",
-        {"identifier": identifier}
-    )
+    return create_http_exception(404, f"{resource} not found", {"identifier": identifier})
 
 
 def internal_server_error(message: str = "Internal server error") -> HTTPException:
@@ -1,11 +1,16 @@
 """Data models for QByte GL records."""
+
 from dataclasses import dataclass
 from datetime import date, datetime
 
+import msgspec
+import numpy as np
+
 
 @dataclass
 class Account:
     """Represents a GL account."""
+
     code: str
     name: str
     account_type: str  # REVENUE, EXPENSE, etc.
@@ -19,9 +24,14 @@ class Account:
         return self.code.startswith("6")
 
 
-@dataclass
-class GLRecord:
-    """Represents a QByte-style GL entry."""
+class GLRecord(msgspec.Struct, gc=False):
+    """
+    Represents a QByte-style GL entry.
+
+    A msgspec Struct: instances are slotted, compared by value and encoded straight to
+    JSON by to_json() with the field order and formats of to_dict().
+    """
+
     gl_entry_id: int
     journal_batch: str
     journal_entry: str
@@ -83,6 +93,65 @@ class GLRecord:
             "basin": self.basin,
             "created_timestamp": self.created_timestamp.isoformat(),
             "created_by": self.created_by,
-            "last_modified": self.last_modified.isoformat()
+            "last_modified": self.last_modified.isoformat(),
         }
 
+    def to_json(self) -> bytes:
+        """Encode GL record as compact JSON without building an intermediate dict."""
+        return GL_RECORD_ENCODER.encode(self)
+
+
+# Shared encoder; dates and datetimes are written as ISO 8601 like to_dict()
+GL_RECORD_ENCODER = msgspec.json.Encoder()
+
+
+# Field order shared by row (GLRecord) and column (GLRecordBatch) representations
+GL_RECORD_FIELDS = GLRecord.__struct_fields__
+
+# NumPy dtype for each GLRecord field type in a GLRecordBatch (text fields use str)
+GL_FIELD_DTYPES = {
+    int: np.int64,
+    float: np.float64,
+    date: "datetime64[D]",
+    datetime: "datetime64[us]",
+}
+
+# Optional text fields; GLRecordBatch stores None as an empty string
+GL_NULLABLE_FIELDS = ("afe_number", "jib_number")
+
+
+@dataclass
+class GLRecordBatch:
+    """
+    Column-oriented batch of GL records: one NumPy array per GLRecord field.
+
+    Text columns are fixed-width unicode arrays, dates are datetime64[D] and
+    timestamps are datetime64[us]. Nullable text fields use "" for None.
+    """
+
+    columns: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        """Number of records in the batch."""
+        return len(self.columns["gl_entry_id"])
+
+    def to_records(self) -> list[GLRecord]:
+        """Materialize the batch as GLRecord instances (dates and strings become Python objects)."""
+        values = []
+        for name in GL_RECORD_FIELDS:
+            column = self.columns[name].tolist()
+            if name in GL_NULLABLE_FIELDS:
+                column = [value or None for value in column]
+            values.append(column)
+        return [GLRecord(*row) for row in zip(*values, strict=True)]
+
+    @classmethod
+    def from_records(cls, records: list[GLRecord]) -> "GLRecordBatch":
+        """Build a batch from GLRecord instances (None becomes "" in nullable fields)."""
+        columns = {}
+        for name, annotation in GLRecord.__annotations__.items():
+            values = [getattr(record, name) for record in records]
+            if name in GL_NULLABLE_FIELDS:
+                values = [value or "" for value in values]
+            columns[name] = np.array(values, dtype=GL_FIELD_DTYPES.get(annotation, str))
+        return cls(columns=columns)
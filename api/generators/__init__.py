@@ -1,8 +1,17 @@
 """Data generators for GL records."""
+
 from .amount import AmountGenerator
-from .date import DateGenerator
+from .batch import BatchGenerator, counter_uniforms
+from .date import DateGenerator, intraday_timestamps
 from .journal import JournalGenerator
 from .oil_gas import OilGasDataGenerator
 
-__all__ = ["OilGasDataGenerator", "JournalGenerator", "AmountGenerator", "DateGenerator"]
-
+__all__ = [
+    "OilGasDataGenerator",
+    "JournalGenerator",
+    "AmountGenerator",
+    "DateGenerator",
+    "BatchGenerator",
+    "counter_uniforms",
+    "intraday_timestamps",
+]
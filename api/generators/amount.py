@@ -1,4 +1,5 @@
 """Amount generators for GL transactions."""
+
 import random
 
 from core.models import Account
@@ -16,6 +17,15 @@ class AmountGenerator:
     OPEX_MIN = 500.0
     OPEX_MAX = 15000.0
 
+    def __init__(self, rng: random.Random | None = None):
+        """
+        Initialize amount generator.
+
+        Args:
+            rng: Random number generator used for amounts (default: new unseeded instance)
+        """
+        self.rng = rng if rng is not None else random.Random()
+
     def generate_for_account(self, account: Account) -> tuple[float, float]:
         """
         Generate debit and credit amounts for an account.
@@ -24,12 +34,11 @@ class AmountGenerator:
             Tuple of (debit_amount, credit_amount)
         """
         if account.is_revenue():
-            base_amount = random.uniform(self.REVENUE_MIN, self.REVENUE_MAX)
+            base_amount = self.rng.uniform(self.REVENUE_MIN, self.REVENUE_MAX)
             return (0.0, round(base_amount, 2))
         elif account.is_capex():
-            base_amount = random.uniform(self.CAPEX_MIN, self.CAPEX_MAX)
+            base_amount = self.rng.uniform(self.CAPEX_MIN, self.CAPEX_MAX)
             return (round(base_amount, 2), 0.0)
         else:  # Operating/Admin expenses
-            base_amount = random.uniform(self.OPEX_MIN, self.OPEX_MAX)
+            base_amount = self.rng.uniform(self.OPEX_MIN, self.OPEX_MAX)
             return (round(base_amount, 2), 0.0)
-
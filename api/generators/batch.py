@@ -0,0 +1,373 @@
+"""Vectorized batch generator for GL records."""
+
+from datetime import date
+from functools import cache
+
+import numpy as np
+from core.accounts import AccountRegistry
+from core.models import GLRecordBatch
+
+from .amount import AmountGenerator
+from .journal import JournalGenerator
+from .oil_gas import OilGasDataGenerator
+
+# One uniform draw per record for each of these fields, in this order
+DRAW_FIELDS = (
+    "account_group",
+    "account_pick",
+    "well_basin",
+    "well_number",
+    "afe_year",
+    "afe_number",
+    "lease_prefix",
+    "lease_suffix",
+    "property_state",
+    "property_number",
+    "jib_roll",
+    "jib_state",
+    "jib_number",
+    "cost_center_region",
+    "cost_center_number",
+    "journal_source",
+    "transaction_type",
+    "amount",
+    "state",
+    "county",
+    "basin",
+    "created_by",
+)
+
+# Cumulative account-group probabilities: 30% revenue, 40% opex, 20% capex, 10% admin
+ACCOUNT_GROUP_THRESHOLDS = np.array([0.3, 0.7, 0.9])
+
+JIB_PROBABILITY = 0.4
+JOURNAL_BATCH_SIZE = 50
+
+# Zero-padded 4-digit strings, used to format integers by table lookup
+_FOUR_DIGITS = np.array([f"{i:04d}" for i in range(10000)])
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied element-wise to uint64 values (wraps mod 2**64)."""
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def counter_uniforms(seed: int, gl_entry_ids: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Counter-based draws: one uniform [0, 1) value per record and field.
+
+    Each value is a hash of (seed, gl_entry_id, field), so any record's draws can
+    be computed directly without generating the records before it.
+    """
+    with np.errstate(over="ignore"):
+        keys = _splitmix64(
+            np.asarray(gl_entry_ids, dtype=np.int64).astype(np.uint64)
+            ^ _splitmix64(np.array([seed], dtype=np.uint64))
+        )
+        return {
+            name: (_splitmix64(keys + np.uint64(index + 1)) >> np.uint64(11)) * 2.0**-53
+            for index, name in enumerate(DRAW_FIELDS)
+        }
+
+
+def _pick(table: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Pick table entries uniformly using draws in [0, 1)."""
+    return table[(u * len(table)).astype(np.int64)]
+
+
+@cache
+def _range_table(low: int, high: int) -> np.ndarray:
+    """Decimal strings for every integer in [low, high]."""
+    return np.array([str(i) for i in range(low, high + 1)])
+
+
+def _format_range(low: int, high: int, u: np.ndarray) -> np.ndarray:
+    """Draw integers in [low, high] and format them as strings via a lookup table."""
+    return _pick(_range_table(low, high), u)
+
+
+def _zero_pad(values: np.ndarray, width: int) -> np.ndarray:
+    """Format non-negative integers zero-padded to width (like f"{v:0{width}d}")."""
+    if len(values) and values.max() >= 10**width:
+        return np.strings.zfill(values.astype(str), width)
+    result = None
+    while width > 0:
+        digits = min(width, 4)
+        table = (
+            _FOUR_DIGITS
+            if digits == 4
+            else np.array([f"{i:0{digits}d}" for i in range(10**digits)])
+        )
+        chunk = table[values % 10**digits]
+        result = chunk if result is None else np.strings.add(chunk, result)
+        values = values // 10**digits
+        width -= digits
+    return result
+
+
+def _join(*parts) -> np.ndarray:
+    """Concatenate string arrays and literals element-wise."""
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.strings.add(result, part)
+    return result
+
+
+class BatchGenerator:
+    """
+    Generates GL records N at a time as NumPy column arrays.
+
+    Fields, formats and distributions follow the per-record path in
+    GLDataStreamer, but the values differ: the draws come from NumPy rather
+    than random.Random, in one vectorized pass per batch. There are two modes:
+
+    - generate / generate_daily draw every random value for a batch in a single
+      call per field from a seeded numpy.random.Generator, so output is
+      deterministic per seed and sequence of batches
+    - generate_for_ids uses counter-based draws, so each record is a pure
+      function of (seed, gl_entry_id) and any ID range can be produced on demand
+      without replaying the records before it (used by GLDataStreamer's
+      counter-based and load-generation modes)
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        rng: np.random.Generator | None = None,
+        account_registry: AccountRegistry | None = None,
+    ):
+        """
+        Initialize batch generator.
+
+        Args:
+            seed: Seed for the NumPy generator (ignored when rng is provided)
+            rng: Explicit NumPy generator to draw from
+            account_registry: Account registry to select accounts from
+        """
+        self.seed = seed
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        registry = account_registry or AccountRegistry()
+
+        # Flat account tables with per-group offsets for vectorized selection
+        groups = [
+            registry.revenue_accounts,
+            registry.operating_expense_accounts,
+            registry.capex_accounts,
+            registry.admin_accounts,
+        ]
+        accounts = [account for group in groups for account in group]
+        self._group_sizes = np.array([len(group) for group in groups])
+        self._group_offsets = np.concatenate(([0], np.cumsum(self._group_sizes)[:-1]))
+        self._account_codes = np.array([account.code for account in accounts])
+        self._account_names = np.array([account.name for account in accounts])
+        self._account_is_capex = np.array([account.is_capex() for account in accounts])
+
+        self._basins = np.array(OilGasDataGenerator.BASINS)
+        self._well_prefixes = np.array([basin.upper()[:4] for basin in OilGasDataGenerator.BASINS])
+        self._states = np.array(OilGasDataGenerator.STATES)
+        self._counties = np.array(OilGasDataGenerator.COUNTIES)
+        self._lease_prefixes = np.array(OilGasDataGenerator.LEASE_PREFIXES)
+        self._lease_suffixes = np.array(OilGasDataGenerator.LEASE_SUFFIXES)
+        self._cost_center_regions = np.array(OilGasDataGenerator.COST_CENTER_REGIONS)
+        self._journal_sources = np.array(JournalGenerator.JOURNAL_SOURCES)
+        self._transaction_types = np.array(JournalGenerator.TRANSACTION_TYPES)
+
+    def _draw(self, count: int) -> dict[str, np.ndarray]:
+        """Draw one uniform [0, 1) value per record for every random field."""
+        return {name: self.rng.random(count) for name in DRAW_FIELDS}
+
+    def generate(
+        self,
+        transaction_dates: np.ndarray,
+        created_timestamps: np.ndarray | None = None,
+        first_gl_entry_id: int = 1,
+    ) -> GLRecordBatch:
+        """
+        Generate one GL record per transaction date.
+
+        Args:
+            transaction_dates: Transaction dates (anything convertible to datetime64[D])
+            created_timestamps: Created timestamps (defaults to midnight of each transaction date)
+            first_gl_entry_id: gl_entry_id of the first record; IDs are consecutive
+
+        Returns:
+            GLRecordBatch with one array per GLRecord field
+        """
+        transaction_dates = np.asarray(transaction_dates, dtype="datetime64[D]")
+        gl_entry_ids = np.arange(
+            first_gl_entry_id, first_gl_entry_id + len(transaction_dates), dtype=np.int64
+        )
+        return self._build(
+            gl_entry_ids,
+            transaction_dates,
+            created_timestamps,
+            self._draw(len(gl_entry_ids)),
+        )
+
+    def generate_for_ids(
+        self,
+        gl_entry_ids: np.ndarray,
+        transaction_dates: np.ndarray,
+        created_timestamps: np.ndarray | None = None,
+    ) -> GLRecordBatch:
+        """
+        Generate records keyed by ID using counter-based draws (random access).
+
+        Args:
+            gl_entry_ids: IDs of the records to generate (any order, need not be consecutive)
+            transaction_dates: Transaction date for each ID
+            created_timestamps: Created timestamp for each ID (defaults to midnight)
+
+        Returns:
+            GLRecordBatch whose rows depend only on (seed, gl_entry_id) and the given dates
+        """
+        gl_entry_ids = np.asarray(gl_entry_ids, dtype=np.int64)
+        return self._build(
+            gl_entry_ids,
+            np.asarray(transaction_dates, dtype="datetime64[D]"),
+            created_timestamps,
+            counter_uniforms(self.seed, gl_entry_ids),
+        )
+
+    def generate_daily(
+        self,
+        start_date: date,
+        days: int,
+        first_gl_entry_id: int = 1,
+    ) -> GLRecordBatch:
+        """Generate one record per day starting at start_date, stamped at midnight."""
+        transaction_dates = np.datetime64(start_date, "D") + np.arange(days)
+        return self.generate(transaction_dates, first_gl_entry_id=first_gl_entry_id)
+
+    def _build(
+        self,
+        gl_entry_ids: np.ndarray,
+        transaction_dates: np.ndarray,
+        created_timestamps: np.ndarray | None,
+        u: dict[str, np.ndarray],
+    ) -> GLRecordBatch:
+        """Turn per-field uniform draws into GL record columns."""
+        if created_timestamps is None:
+            created_timestamps = transaction_dates.astype("datetime64[us]")
+        else:
+            created_timestamps = np.asarray(created_timestamps, dtype="datetime64[us]")
+
+        # Account selection
+        group = np.searchsorted(ACCOUNT_GROUP_THRESHOLDS, u["account_group"], side="right")
+        account_idx = self._group_offsets[group] + (
+            u["account_pick"] * self._group_sizes[group]
+        ).astype(np.int64)
+        account_names = self._account_names[account_idx]
+        is_revenue = group == 0
+        is_capex = self._account_is_capex[account_idx]
+
+        # Oil & gas identifiers
+        well_ids = _join(
+            _pick(self._well_prefixes, u["well_basin"]),
+            "-",
+            _format_range(1000, 9999, u["well_number"]),
+        )
+        afe_numbers = _join(
+            "AFE-",
+            _format_range(2020, 2024, u["afe_year"]),
+            "-",
+            _format_range(1000, 9999, u["afe_number"]),
+        )
+        afe_numbers[~is_capex] = ""
+        lease_names = _join(
+            _pick(self._lease_prefixes, u["lease_prefix"]),
+            " ",
+            _pick(self._lease_suffixes, u["lease_suffix"]),
+        )
+        property_ids = _join(
+            "PROP-",
+            _pick(self._states, u["property_state"]),
+            "-",
+            _format_range(10000, 99999, u["property_number"]),
+        )
+
+        # Fiscal fields (YYYY-MM) derived from the transaction date
+        months = transaction_dates.astype("datetime64[M]").astype(np.int64)
+        fiscal_years = months // 12 + 1970
+        fiscal_months = months % 12 + 1
+        first_month = months.min() if len(months) else 0
+        month_range = np.arange(first_month, months.max() + 1 if len(months) else 0)
+        period_table = np.array(
+            [f"{m // 12 + 1970:04d}-{m % 12 + 1:02d}" for m in month_range.tolist()], dtype="U7"
+        )
+        fiscal_periods = period_table[months - first_month]
+
+        jib_numbers = _join(
+            "JIB-",
+            _pick(self._states, u["jib_state"]),
+            "-",
+            _format_range(1000, 9999, u["jib_number"]),
+            "-",
+            np.strings.replace(period_table, "-", "")[months - first_month],
+        )
+        jib_numbers[u["jib_roll"] >= JIB_PROBABILITY] = ""
+        cost_centers = _join(
+            "CC-",
+            _pick(self._cost_center_regions, u["cost_center_region"]),
+            "-",
+            _format_range(1, 9, u["cost_center_number"]),
+        )
+        journal_sources = _pick(self._journal_sources, u["journal_source"])
+        transaction_types = _pick(self._transaction_types, u["transaction_type"])
+
+        # Amounts: revenue is credited, everything else is debited
+        low = np.where(
+            is_revenue,
+            AmountGenerator.REVENUE_MIN,
+            np.where(is_capex, AmountGenerator.CAPEX_MIN, AmountGenerator.OPEX_MIN),
+        )
+        high = np.where(
+            is_revenue,
+            AmountGenerator.REVENUE_MAX,
+            np.where(is_capex, AmountGenerator.CAPEX_MAX, AmountGenerator.OPEX_MAX),
+        )
+        amounts = np.round(low + (high - low) * u["amount"], 2)
+        debit_amounts = np.where(is_revenue, 0.0, amounts)
+        credit_amounts = np.where(is_revenue, amounts, 0.0)
+
+        journal_batches = _join(
+            "BATCH-", _zero_pad((gl_entry_ids - 1) // JOURNAL_BATCH_SIZE + 1, 6)
+        )
+        journal_entries = _join("JE-", _zero_pad(gl_entry_ids, 8))
+
+        return GLRecordBatch(
+            columns={
+                "gl_entry_id": gl_entry_ids,
+                "journal_batch": journal_batches,
+                "journal_entry": journal_entries,
+                "transaction_date": transaction_dates,
+                "posting_date": transaction_dates.copy(),
+                "account_code": self._account_codes[account_idx],
+                "account_name": account_names,
+                "account_type": np.where(is_revenue, "REVENUE", "EXPENSE"),
+                "debit_amount": debit_amounts,
+                "credit_amount": credit_amounts,
+                "net_amount": np.round(credit_amounts - debit_amounts, 2),
+                "well_id": well_ids,
+                "lease_name": lease_names,
+                "property_id": property_ids,
+                "afe_number": afe_numbers,
+                "jib_number": jib_numbers,
+                "cost_center": cost_centers,
+                "journal_source": journal_sources,
+                "transaction_type": transaction_types,
+                "description": _join(transaction_types, " - ", account_names, " for ", well_ids),
+                "fiscal_period": fiscal_periods,
+                "fiscal_year": fiscal_years,
+                "fiscal_month": fiscal_months,
+                "state": _pick(self._states, u["state"]),
+                "county": _pick(self._counties, u["county"]),
+                "basin": _pick(self._basins, u["basin"]),
+                "created_timestamp": created_timestamps,
+                "created_by": _join("USER-", _format_range(100, 999, u["created_by"])),
+                "last_modified": created_timestamps.copy(),
+            }
+        )
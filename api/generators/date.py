@@ -1,11 +1,58 @@
 """Date generators for GL transactions."""
+
 import random
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Relative share of a day's postings in each hour: light overnight batch jobs,
+# peaks mid-morning and mid-afternoon, a dip over lunch
+INTRADAY_HOURLY_WEIGHTS = np.array(
+    [
+        0.5,
+        0.5,
+        0.5,
+        0.5,
+        0.5,
+        0.5,
+        1.0,
+        3.0,
+        7.0,
+        9.0,
+        9.0,
+        8.0,
+        5.0,
+        8.0,
+        9.0,
+        8.0,
+        6.0,
+        3.0,
+        1.5,
+        1.0,
+        0.8,
+        0.6,
+        0.5,
+        0.5,
+    ]
+)
+
+_INTRADAY_CDF = np.concatenate(
+    ([0.0], np.cumsum(INTRADAY_HOURLY_WEIGHTS) / INTRADAY_HOURLY_WEIGHTS.sum())
+)
 
 
 class DateGenerator:
     """Generates transaction dates."""
 
+    def __init__(self, rng: random.Random | None = None):
+        """
+        Initialize date generator.
+
+        Args:
+            rng: Random number generator used for date offsets (default: new unseeded instance)
+        """
+        self.rng = rng if rng is not None else random.Random()
+
     def generate_transaction_date(self, historical_probability: float = 0.8) -> datetime.date:
         """
         Generate transaction date, sometimes historical for realism.
@@ -13,8 +60,8 @@ class DateGenerator:
         Args:
             historical_probability: Probability of generating a historical date (default 0.8)
         """
-        if random.random() < historical_probability:
-            days_ago = random.randint(0, 30)
+        if self.rng.random() < historical_probability:
+            days_ago = self.rng.randint(0, 30)
             return (datetime.now() - timedelta(days=days_ago)).date()
         return datetime.now().date()
 
@@ -22,3 +69,28 @@ class DateGenerator:
         """Get current posting date."""
         return datetime.now().date()
 
+
+def intraday_timestamps(ordinals: np.ndarray, start_date: date, records_per_day: int) -> np.ndarray:
+    """
+    Timestamps for a stream of records_per_day records per day starting at start_date.
+
+    Record ordinal k falls on day k // records_per_day and is placed within that day by
+    the inverse CDF of INTRADAY_HOURLY_WEIGHTS, so busy hours get proportionally more
+    records and timestamps never decrease with the ordinal. The result depends only on
+    the ordinals, not on how they are batched.
+
+    Args:
+        ordinals: Zero-based record ordinals
+        start_date: Date of the first record
+        records_per_day: Records per simulated day
+
+    Returns:
+        datetime64[us] timestamps
+    """
+    days, slots = np.divmod(np.asarray(ordinals, dtype=np.int64), records_per_day)
+    seconds = np.interp((slots + 0.5) / records_per_day, _INTRADAY_CDF, np.arange(25) * 3600.0)
+    return (
+        np.datetime64(start_date, "D").astype("datetime64[us]")
+        + days * np.timedelta64(86400, "s")
+        + (seconds * 1e6).astype(np.int64).astype("timedelta64[us]")
+    )
@@ -1,4 +1,5 @@
 """Journal-related data generators."""
+
 import random
 
 
@@ -8,11 +9,19 @@ class JournalGenerator:
     JOURNAL_SOURCES = ["AP", "AR", "JIB", "PA", "PROD", "MANUAL", "ADJ"]
     TRANSACTION_TYPES = ["INV", "PAY", "ADJ", "ALLOC", "ACCR", "REV"]
 
+    def __init__(self, rng: random.Random | None = None):
+        """
+        Initialize journal generator.
+
+        Args:
+            rng: Random number generator used for sources and types (default: new unseeded instance)
+        """
+        self.rng = rng if rng is not None else random.Random()
+
     def generate_journal_source(self) -> str:
         """Generate journal source (where transaction originated)."""
-        return random.choice(self.JOURNAL_SOURCES)
+        return self.rng.choice(self.JOURNAL_SOURCES)
 
     def generate_transaction_type(self) -> str:
         """Generate transaction type."""
-        return random.choice(self.TRANSACTION_TYPES)
-
+        return self.rng.choice(self.TRANSACTION_TYPES)
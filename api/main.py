@@ -1,17 +1,35 @@
 """FastAPI application for QByte GL Data Service."""
+
 import asyncio
+import json
 import logging
 from datetime import date, datetime
 
 from core.accounts import AccountRegistry
+from core.config import settings
 from core.exceptions import (
     GLDataServiceException,
+    InvalidCursorError,
     InvalidDateRangeError,
     StreamingError,
 )
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from services.compression import (
+    MIN_COMPRESS_BYTES,
+    compress_async_chunks,
+    compress_body,
+    compress_chunks,
+    negotiate_encoding,
+)
 from services.gl_streamer import GLDataStreamer
+from services.pagination import decode_cursor
+from services.record_export import FORMAT_MEDIA_TYPES, batch_to_arrow, iter_encoded
+from services.response_cache import CachedResponse, ResponseCache, etag_matches
+from services.rollups import ROLLUP_DIMENSIONS
+
+# Seconds without new records before a live SSE/WebSocket stream sends a keep-alive
+STREAM_HEARTBEAT_SECONDS = 15.0
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +54,8 @@ app = FastAPI(
 
     Use the `/get-gl` endpoint to receive a continuous stream of GL records.
     Each record is a JSON object sent as a newline-delimited stream.
+    Use `/get-gl/events` (Server-Sent Events) or `/get-gl/ws` (WebSocket) to resume
+    after the last `gl_entry_id` received instead of starting over on reconnect.
     """,
     version="1.0.0",
     tags_metadata=[
@@ -43,6 +63,10 @@ app = FastAPI(
             "name": "streaming",
             "description": "Streaming endpoints for GL data",
         },
+        {
+            "name": "aggregates",
+            "description": "Totals computed server-side from running rollups",
+        },
         {
             "name": "info",
             "description": "Service information and metadata",
@@ -51,12 +75,29 @@ app = FastAPI(
             "name": "health",
             "description": "Health check endpoints",
         },
-    ]
+    ],
 )
 
 # Initialize the GL streamer
-gl_streamer = GLDataStreamer()
+gl_streamer = GLDataStreamer(
+    historical_days=settings.historical_days,
+    seed=settings.random_seed,
+    counter_based=settings.counter_based,
+    preload_days=settings.preload_days,
+    hot_capacity=settings.buffer_hot_capacity,
+    segment_directory=settings.buffer_segment_directory,
+    max_records=settings.buffer_max_records,
+    max_bytes=settings.buffer_max_bytes,
+    start_date=date.fromisoformat(settings.fixed_start_date),
+    records_per_day=settings.load_records_per_day if settings.generation_mode == "load" else None,
+    shared_directory=settings.shared_store_directory,
+    snapshot_directory=settings.history_snapshot_directory,
+    checkpoint_directory=settings.checkpoint_directory,
+    checkpoint_interval_seconds=settings.checkpoint_interval_seconds,
+)
 account_registry = AccountRegistry()
+# Encoded date-range responses: history is deterministic, so they never change for a given key
+response_cache = ResponseCache(settings.response_cache_max_bytes)
 
 
 # Global exception handlers
@@ -66,11 +107,7 @@ async def gl_service_exception_handler(request: Request, exc: GLDataServiceExcep
     logger.error(f"GL Service Exception: {exc.message}", extra={"details": exc.details})
     return JSONResponse(
         status_code=500,
-        content={
-            "error": exc.message,
-            "details": exc.details,
-            "type": "GLDataServiceException"
-        }
+        content={"error": exc.message, "details": exc.details, "type": "GLDataServiceException"},
     )
 
 
@@ -80,11 +117,17 @@ async def invalid_date_range_handler(request: Request, exc: InvalidDateRangeErro
     logger.warning(f"Invalid date range: {exc.message}")
     return JSONResponse(
         status_code=400,
-        content={
-            "error": exc.message,
-            "details": exc.details,
-            "type": "InvalidDateRangeError"
-        }
+        content={"error": exc.message, "details": exc.details, "type": "InvalidDateRangeError"},
+    )
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """Handle invalid pagination cursor exceptions."""
+    logger.warning(f"Invalid cursor: {exc.message}")
+    return JSONResponse(
+        status_code=400,
+        content={"error": exc.message, "details": exc.details, "type": "InvalidCursorError"},
     )
 
 
@@ -94,17 +137,201 @@ async def streaming_error_handler(request: Request, exc: StreamingError):
     logger.error(f"Streaming error: {exc.message}")
     return JSONResponse(
         status_code=500,
-        content={
-            "error": exc.message,
-            "details": exc.details,
-            "type": "StreamingError"
-        }
+        content={"error": exc.message, "details": exc.details, "type": "StreamingError"},
     )
 
 
+def build_record_filters(
+    basin: str | None, well_id: str | None, account_code: str | None, fiscal_period: str | None
+) -> dict[str, str]:
+    """Collect the optional record filter query parameters that were provided."""
+    filters = {
+        "basin": basin,
+        "well_id": well_id,
+        "account_code": account_code,
+        "fiscal_period": fiscal_period,
+    }
+    return {name: value.strip() for name, value in filters.items() if value is not None}
+
+
+def encoding_headers(encoding: str | None) -> dict[str, str]:
+    """Headers for a response sent with the negotiated content encoding (None = uncompressed)."""
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return headers
+
+
+def records_response(
+    metadata: dict, count: int, data: bytes, encoding: str | None = None
+) -> Response:
+    """
+    JSON response whose "data" array is spliced in from pre-encoded record bytes.
+
+    Args:
+        metadata: Fields to send after "count" and before "data"
+        count: Number of records in data
+        data: Encoded records joined as the inside of a JSON array
+        encoding: Negotiated content encoding (gzip or zstd), None to send uncompressed
+    """
+    head = json.dumps({"count": count, **metadata})[:-1].encode("utf-8")
+    body = head + b', "data": [' + data + b"]}"
+    if encoding and len(body) < MIN_COMPRESS_BYTES:
+        encoding = None
+    if encoding:
+        body = compress_body(body, encoding)
+    return Response(content=body, media_type="application/json", headers=encoding_headers(encoding))
+
+
+async def resume_stream(chunks: list[bytes], body_iterator):
+    """Yield already read chunks, then the rest of a streamed body."""
+    for chunk in chunks:
+        yield chunk
+    async for chunk in body_iterator:
+        yield chunk
+
+
+async def cache_response(request: Request, key: tuple, response: Response) -> Response:
+    """
+    Store a freshly built response in the response cache and send it with its ETag.
+
+    A streamed body is read into memory only up to the cache's max_bytes; a larger one
+    could never be cached, so it is streamed on as it is (uncached, without an ETag)
+    from the chunks read so far.
+    """
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    if isinstance(response, StreamingResponse):
+        chunks = []
+        size = 0
+        async for chunk in response.body_iterator:
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > response_cache.max_bytes:
+                return StreamingResponse(
+                    resume_stream(chunks, response.body_iterator),
+                    status_code=response.status_code,
+                    headers=headers,
+                )
+        body = b"".join(chunks)
+    else:
+        body = response.body
+    return cached_response(request, response_cache.put(key, body, headers))
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Send a cached response with its ETag, or 304 Not Modified if the client has it already."""
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers={"ETag": entry.etag, "Vary": "Accept-Encoding"})
+    return Response(content=entry.body, headers={**entry.headers, "ETag": entry.etag})
+
+
+def negotiate_format(output_format: str | None, accept: str | None) -> str:
+    """
+    Pick the batch output format from the format parameter, else the Accept header.
+
+    Args:
+        output_format: Explicit format (json, arrow, parquet or csv); wins over Accept
+        accept: Accept header value; the first supported media type listed is used
+
+    Returns:
+        Format name (json when nothing supported is requested)
+    """
+    if output_format:
+        return output_format
+    formats_by_media_type = {media_type: name for name, media_type in FORMAT_MEDIA_TYPES.items()}
+    for media_range in (accept or "").split(","):
+        media_type = media_range.split(";")[0].strip().lower()
+        if media_type in formats_by_media_type:
+            return formats_by_media_type[media_type]
+    return "json"
+
+
+def build_batch_response(
+    start_date: date | None,
+    end_date: date | None,
+    filters: dict[str, str],
+    limit: int,
+    after: int,
+    response_format: str,
+    encoding: str | None,
+) -> Response:
+    """
+    Select and encode one /get-gl-batch page.
+
+    Args:
+        start_date: Start of the transaction date range (None for all buffered records)
+        end_date: End of the transaction date range
+        filters: Exact-match record filters
+        limit: Page size
+        after: Resume after this gl_entry_id
+        response_format: json, arrow, parquet or csv
+        encoding: Negotiated content encoding, None for uncompressed
+
+    Returns:
+        JSON response, or a streamed Arrow/Parquet/CSV response
+    """
+    # Get one page of records in gl_entry_id order: from the historical batch (plus live
+    # records in range) when a date range is given, otherwise from all buffered records
+    page = gl_streamer.select_records(start_date, end_date, filters, limit, after)
+    next_cursor = page.next_cursor(after)
+
+    if response_format != "json":
+        # Columnar formats are gathered straight from the buffer's columns
+        content = iter_encoded(batch_to_arrow(gl_streamer.page_batch(page)), response_format)
+        if encoding:
+            content = compress_chunks(content, encoding)
+        return StreamingResponse(
+            content,
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers={
+                "X-Record-Count": str(len(page)),
+                "X-Next-Cursor": next_cursor,
+                "X-Has-More": "true" if page.has_more else "false",
+                **encoding_headers(encoding),
+            },
+        )
+
+    return records_response(
+        {
+            "limit": limit,
+            "start_date": str(start_date) if start_date else None,
+            "end_date": str(end_date) if end_date else None,
+            "filters": filters,
+            "next_cursor": next_cursor,
+            "has_more": page.has_more,
+        },
+        len(page),
+        gl_streamer.encode_page_json(page),
+        encoding,
+    )
+
+
+async def sse_events(after_gl_entry_id: int, filters: dict[str, str]):
+    """Format a resumable record stream as Server-Sent Events, one event per record."""
+    async for gl_entry_ids, encoded_records in gl_streamer.stream_since(
+        after_gl_entry_id, filters, heartbeat_seconds=STREAM_HEARTBEAT_SECONDS
+    ):
+        if not encoded_records:
+            yield b": keep-alive\n\n"
+            continue
+        # The event id is the gl_entry_id, so a reconnecting client resumes via Last-Event-ID
+        yield b"".join(
+            b"id: %d\nevent: gl_record\ndata: %b\n\n" % (gl_entry_id, encoded)
+            for gl_entry_id, encoded in zip(gl_entry_ids.tolist(), encoded_records, strict=True)
+        )
+
+
 async def background_stream_task():
     """Background task that continuously generates records and stores them in buffer."""
-    await gl_streamer.background_generate()
+    if gl_streamer.is_shared_reader:
+        # Another worker generates; this one serves what it publishes
+        await gl_streamer.follow_shared(settings.shared_poll_seconds)
+    elif settings.generation_mode == "load":
+        await gl_streamer.background_generate_load(
+            settings.load_records_per_second, settings.load_tick_seconds
+        )
+    else:
+        await gl_streamer.background_generate(settings.streaming_interval_seconds)
 
 
 @app.on_event("startup")
@@ -113,6 +340,12 @@ async def startup_event():
     asyncio.create_task(background_stream_task())
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Checkpoint the live stream and remove spilled record buffer segments on server shutdown."""
+    gl_streamer.close()
+
+
 @app.get("/", tags=["info"], summary="API Information")
 async def root():
     """Get API information and available endpoints."""
@@ -123,11 +356,16 @@ async def root():
         "endpoints": {
             "/health": "Health check endpoint",
             "/get-gl": "Stream GL records (instant buffered records + real-time streaming)",
+            "/get-gl/events": (
+                "Stream GL records as Server-Sent Events, resuming from Last-Event-ID"
+            ),
+            "/get-gl/ws": "Stream GL records over a WebSocket, resuming from since_gl_entry_id",
             "/get-gl-batch": "Get a fixed batch of GL records (non-streaming)",
+            "/get-gl-by-id": "Get the GL records of a gl_entry_id range",
             "/docs": "Interactive API documentation",
-            "/openapi.json": "OpenAPI schema"
+            "/openapi.json": "OpenAPI schema",
         },
-        "account_types": account_registry.get_account_types_info()
+        "account_types": account_registry.get_account_types_info(),
     }
 
 
@@ -139,22 +377,34 @@ async def root():
     Streams QByte-style General Ledger records.
 
     **Modes:**
-    1. **Continuous streaming**: When no date range is provided, first streams 1000 pre-generated historical
-       records (generated at startup at 3 per hour spacing), then continues generating new real-time records
-       indefinitely, one per second.
-    2. **Date range filter**: When `start_date` and `end_date` are provided, returns a JSON array of records
-       from the pre-generated historical batch that fall within the specified date range.
+    1. **Continuous streaming**: When no date range is provided, first streams 1000 pre-generated
+       historical records (generated at startup at 3 per hour spacing), then continues generating
+       new real-time records indefinitely, one per second.
+    2. **Date range filter**: When `start_date` and `end_date` are provided, returns a JSON array of
+       records from the pre-generated historical batch (and any live records) that fall within the
+       specified date range.
 
     **Parameters:**
-    - **start_date**: Start date for historical records (YYYY-MM-DD format). If provided, `end_date` is required.
-    - **end_date**: End date for historical records (YYYY-MM-DD format). If provided, `start_date` is required.
+    - **start_date**: Start date for historical records (YYYY-MM-DD format). If provided,
+      `end_date` is required.
+    - **end_date**: End date for historical records (YYYY-MM-DD format). If provided,
+      `start_date` is required.
+    - **basin**, **well_id**, **account_code**, **fiscal_period** (YYYY-MM): Optional exact-match
+      filters, applied to both modes.
 
     **Response Format:**
-    - **Without date range**: Streaming response - each line is a JSON object (newline-delimited JSON).
+    - **Without date range**: Streaming response - each line is a JSON object
+      (newline-delimited JSON).
       Streams 1000 pre-generated historical records, then continues with new records indefinitely.
-    - **With date range**: JSON response - returns a JSON array of records that match the date range.
+    - **With date range**: JSON response - returns a JSON array of records that match the date
+      range.
       Example: `{"count": 150, "data": [{...}, {...}, ...]}`
     - Each record contains a complete GL entry with oil & gas specific fields
+    - Compressed with gzip or zstd when requested in `Accept-Encoding`; streamed responses flush
+      a compressed frame per record batch, so live records are not delayed
+    - Historical date-range responses are cached and carry a strong `ETag`; `If-None-Match` with a
+      matching tag gets `304 Not Modified` (the tag changes if retention evicts records in the
+      range)
 
     **Example Record:**
     ```json
@@ -178,29 +428,44 @@ async def root():
     **Examples:**
     - Real-time: `GET /get-gl`
     - Historical: `GET /get-gl?start_date=2024-01-01&end_date=2024-01-15`
+    - Filtered:
+      `GET /get-gl?start_date=2024-01-01&end_date=2024-03-31&basin=Permian&account_code=4100`
 
     **Note:** This is a streaming endpoint. Use Ctrl+C or close the connection to stop.
     """,
-    response_description="Stream of GL records as newline-delimited JSON"
+    response_description="Stream of GL records as newline-delimited JSON",
 )
 async def stream_gl_data(
+    request: Request,
     start_date: str = Query(None, description="Start date for historical records (YYYY-MM-DD)"),
-    end_date: str = Query(None, description="End date for historical records (YYYY-MM-DD)")
+    end_date: str = Query(None, description="End date for historical records (YYYY-MM-DD)"),
+    basin: str = Query(None, description="Only records from this basin"),
+    well_id: str = Query(None, description="Only records for this well"),
+    account_code: str = Query(None, description="Only records posted to this account code"),
+    fiscal_period: str = Query(None, description="Only records in this fiscal period (YYYY-MM)"),
 ) -> StreamingResponse:
     """
     Stream GL data records.
 
     If date range is provided, filters and returns records from the pre-generated historical batch
-    that fall within the date range. Otherwise, first streams the pre-generated batch of 1000 historical
-    records (created at startup), then continues generating new real-time records indefinitely.
+    that fall within the date range. Otherwise, first streams the pre-generated batch of 1000
+    historical records (created at startup), then continues generating new real-time records
+    indefinitely.
 
     Args:
         start_date: Start date for historical batch generation (YYYY-MM-DD format)
         end_date: End date for historical batch generation (YYYY-MM-DD format)
+        basin: Optional basin filter
+        well_id: Optional well filter
+        account_code: Optional account code filter
+        fiscal_period: Optional fiscal period filter (YYYY-MM)
 
     Returns:
         StreamingResponse with GL records as newline-delimited JSON
     """
+    filters = build_record_filters(basin, well_id, account_code, fiscal_period)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
     # Parse and validate date parameters
     parsed_start_date = None
     parsed_end_date = None
@@ -208,8 +473,7 @@ async def stream_gl_data(
     if start_date is not None or end_date is not None:
         if start_date is None or end_date is None:
             raise HTTPException(
-                status_code=400,
-                detail="Both start_date and end_date must be provided together"
+                status_code=400, detail="Both start_date and end_date must be provided together"
             )
 
         # Strip whitespace and parse dates
@@ -219,39 +483,173 @@ async def stream_gl_data(
         except ValueError as e:
             raise InvalidDateRangeError(
                 f"Invalid date format. Use YYYY-MM-DD format. Error: {str(e)}",
-                {"start_date": start_date, "end_date": end_date}
+                {"start_date": start_date, "end_date": end_date},
             ) from e
 
         if parsed_start_date > parsed_end_date:
             raise InvalidDateRangeError(
                 "start_date must be before or equal to end_date",
-                {"start_date": str(parsed_start_date), "end_date": str(parsed_end_date)}
+                {"start_date": str(parsed_start_date), "end_date": str(parsed_end_date)},
             )
 
-        # Get filtered records and return as JSON array
-        filtered_records = gl_streamer.get_historical_range(parsed_start_date, parsed_end_date)
+        def build_response() -> Response:
+            # Get filtered records and return as JSON array
+            page = gl_streamer.select_records(parsed_start_date, parsed_end_date, filters)
+            return records_response(
+                {"start_date": str(parsed_start_date), "end_date": str(parsed_end_date)},
+                len(page),
+                gl_streamer.encode_page_json(page),
+                encoding,
+            )
 
-        return JSONResponse(
-            content={
-                "count": len(filtered_records),
-                "start_date": str(parsed_start_date),
-                "end_date": str(parsed_end_date),
-                "data": [record.to_dict() for record in filtered_records]
-            }
+        if not gl_streamer.is_historical_range(parsed_end_date):
+            # The range reaches into live records, which are still being appended
+            return build_response()
+        # History only changes when retention evicts some of it, so the encoded response is
+        # cached per request and per retention horizon
+        cache_key = (
+            "get-gl",
+            settings.random_seed,
+            gl_streamer.get_evicted_historical_count(),
+            parsed_start_date,
+            parsed_end_date,
+            tuple(sorted(filters.items())),
+            encoding,
         )
+        entry = response_cache.get(cache_key)
+        if entry is None:
+            return await cache_response(request, cache_key, build_response())
+        return cached_response(request, entry)
 
     # Otherwise, return buffered records first, then stream new ones
+    content = gl_streamer.stream_with_instant_buffer(filters=filters)
+    if encoding:
+        # One flushed frame per yielded chunk, so each live record is decodable on arrival
+        content = compress_async_chunks(content, encoding)
     return StreamingResponse(
-        gl_streamer.stream_with_instant_buffer(),
+        content,
         media_type="application/json",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
+            "X-Accel-Buffering": "no",
+            **encoding_headers(encoding),
+        },
+    )
+
+
+@app.get(
+    "/get-gl/events",
+    tags=["streaming"],
+    summary="Stream GL Data (Server-Sent Events)",
+    description="""
+    Streams GL records as Server-Sent Events, starting after a resume point.
+
+    Each record is one `gl_record` event whose `id` is its `gl_entry_id` and whose `data` is the
+    record JSON. Browsers' `EventSource` reconnects automatically and sends the last id received
+    in the `Last-Event-ID` header, so a reconnect only receives records it has not seen yet.
+    A `: keep-alive` comment is sent after 15 seconds without new records.
+
+    **Parameters:**
+    - **since_gl_entry_id**: Only send records with a greater `gl_entry_id` (default: 0, all
+      buffered records)
+    - **Last-Event-ID** (header): Same as `since_gl_entry_id`; takes precedence when both are given
+    - **basin**, **well_id**, **account_code**, **fiscal_period** (YYYY-MM): Optional exact-match
+      filters
+
+    **Examples:**
+    - From the start: `GET /get-gl/events`
+    - Resume: `GET /get-gl/events?since_gl_entry_id=1200`
+    """,
+    response_description="Stream of GL records as Server-Sent Events",
+)
+async def stream_gl_events(
+    since_gl_entry_id: int = Query(0, ge=0, description="Only records with a greater gl_entry_id"),
+    last_event_id: str = Header(None, alias="Last-Event-ID", description="Last event id received"),
+    basin: str = Query(None, description="Only records from this basin"),
+    well_id: str = Query(None, description="Only records for this well"),
+    account_code: str = Query(None, description="Only records posted to this account code"),
+    fiscal_period: str = Query(None, description="Only records in this fiscal period (YYYY-MM)"),
+) -> StreamingResponse:
+    """
+    Stream GL data records as Server-Sent Events.
+
+    Args:
+        since_gl_entry_id: Resume after this gl_entry_id
+        last_event_id: Resume after this event id (sent by reconnecting EventSource clients)
+        basin: Optional basin filter
+        well_id: Optional well filter
+        account_code: Optional account code filter
+        fiscal_period: Optional fiscal period filter (YYYY-MM)
+
+    Returns:
+        StreamingResponse with GL records as text/event-stream
+    """
+    filters = build_record_filters(basin, well_id, account_code, fiscal_period)
+
+    after_gl_entry_id = since_gl_entry_id
+    if last_event_id:
+        try:
+            after_gl_entry_id = int(last_event_id.strip())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400, detail="Last-Event-ID must be a gl_entry_id"
+            ) from e
+
+    return StreamingResponse(
+        sse_events(after_gl_entry_id, filters),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
     )
 
 
+@app.websocket("/get-gl/ws")
+async def stream_gl_websocket(
+    websocket: WebSocket,
+    since_gl_entry_id: int = Query(0, ge=0),
+    basin: str = Query(None),
+    well_id: str = Query(None),
+    account_code: str = Query(None),
+    fiscal_period: str = Query(None),
+):
+    """
+    Stream GL data records over a WebSocket, starting after since_gl_entry_id.
+
+    Each text message is `{"type": "records", "count": n, "last_gl_entry_id": id, "data": [...]}`;
+    a client reconnects with since_gl_entry_id set to the last_gl_entry_id it received.
+    `{"type": "heartbeat"}` is sent after 15 seconds without new records.
+
+    Args:
+        websocket: WebSocket connection
+        since_gl_entry_id: Resume after this gl_entry_id
+        basin: Optional basin filter
+        well_id: Optional well filter
+        account_code: Optional account code filter
+        fiscal_period: Optional fiscal period filter (YYYY-MM)
+    """
+    filters = build_record_filters(basin, well_id, account_code, fiscal_period)
+    await websocket.accept()
+    try:
+        async for gl_entry_ids, encoded_records in gl_streamer.stream_since(
+            since_gl_entry_id, filters, heartbeat_seconds=STREAM_HEARTBEAT_SECONDS
+        ):
+            if not encoded_records:
+                await websocket.send_text('{"type": "heartbeat"}')
+                continue
+            message = b'{"type": "records", "count": %d, "last_gl_entry_id": %d, "data": [%b]}' % (
+                len(encoded_records),
+                gl_entry_ids[-1],
+                b",".join(encoded_records),
+            )
+            await websocket.send_text(message.decode("utf-8"))
+    except WebSocketDisconnect:
+        logger.info("WebSocket client disconnected")
+
+
 @app.get(
     "/get-gl-batch",
     tags=["streaming"],
@@ -263,25 +661,66 @@ async def stream_gl_data(
     finite set of records without the complexity of streaming.
 
     **Parameters:**
-    - **limit**: Maximum number of records to return (default: 1000, max: 10000)
+    - **limit**: Maximum number of records to return (default: 1000, max: 10000) - the page size
+    - **cursor**: `next_cursor` from the previous response, to fetch the next page
+    - **after_gl_entry_id**: Start after this `gl_entry_id` (alternative to `cursor`)
     - **start_date**: Start date for historical records (YYYY-MM-DD format, optional)
-    - **end_date**: End date for historical records (YYYY-MM-DD format, optional)
+    - **end_date**: End date for historical records (YYYY-MM-DD format, optional); live records
+      in the range are included after the historical ones
+    - **basin**, **well_id**, **account_code**, **fiscal_period** (YYYY-MM): Optional exact-match
+      filters
+
+    - **format**: Output format - `json` (default), `arrow`, `parquet` or `csv`. Can also be
+      negotiated with the `Accept` header (`application/vnd.apache.arrow.stream`,
+      `application/vnd.apache.parquet`, `text/csv`); the parameter wins.
 
     **Response Format:**
     - JSON response with a fixed array of records
-    - Example: `{"count": 1000, "data": [{...}, {...}, ...]}`
+    - Example:
+      `{"count": 1000, "next_cursor": "...", "has_more": true, "data": [{...}, {...}, ...]}`
+    - Records are ordered by `gl_entry_id`; keep passing `next_cursor` while `has_more` is true to
+      extract any number of records in constant-size pages
+    - Arrow IPC stream, Parquet and CSV responses are streamed in chunks with the same columns
+      as the JSON records; the record count, next cursor and has-more flag are sent in the
+      `X-Record-Count`, `X-Next-Cursor` and `X-Has-More` headers
+    - Date ranges ending before the live records start are cached and carry a strong `ETag`;
+      send it back in `If-None-Match` to get `304 Not Modified` when nothing changed (the tag
+      changes if retention evicts records in the range)
+    - JSON, Arrow and CSV responses are compressed with gzip or zstd when requested in
+      `Accept-Encoding` (Parquet is already compressed)
 
     **Examples:**
     - Get 1000 records: `GET /get-gl-batch`
     - Get 500 records: `GET /get-gl-batch?limit=500`
-    - Get records for date range: `GET /get-gl-batch?start_date=2024-01-01&end_date=2024-01-15&limit=2000`
+    - Get records for date range:
+      `GET /get-gl-batch?start_date=2024-01-01&end_date=2024-01-15&limit=2000`
+    - Get one well's records for a period:
+      `GET /get-gl-batch?well_id=PERM-1234&fiscal_period=2024-01`
+    - Get records as Arrow: `GET /get-gl-batch?format=arrow&limit=10000`
     """,
-    response_description="JSON array of GL records"
+    response_description="JSON array of GL records",
 )
 async def get_gl_batch(
+    request: Request,
     limit: int = Query(1000, ge=1, le=10000, description="Maximum number of records to return"),
     start_date: str = Query(None, description="Start date for historical records (YYYY-MM-DD)"),
-    end_date: str = Query(None, description="End date for historical records (YYYY-MM-DD)")
+    end_date: str = Query(None, description="End date for historical records (YYYY-MM-DD)"),
+    basin: str = Query(None, description="Only records from this basin"),
+    well_id: str = Query(None, description="Only records for this well"),
+    account_code: str = Query(None, description="Only records posted to this account code"),
+    fiscal_period: str = Query(None, description="Only records in this fiscal period (YYYY-MM)"),
+    output_format: str = Query(
+        None,
+        alias="format",
+        pattern="^(json|arrow|parquet|csv)$",
+        description=(
+            "Output format: json, arrow, parquet or csv (default: from Accept header, else json)"
+        ),
+    ),
+    cursor: str = Query(None, description="Opaque next_cursor from the previous page"),
+    after_gl_entry_id: int = Query(
+        None, ge=0, description="Only records with a greater gl_entry_id"
+    ),
 ):
     """
     Get a batch of GL records (non-streaming).
@@ -293,10 +732,19 @@ async def get_gl_batch(
         limit: Maximum number of records to return (1-10000)
         start_date: Start date for historical records (YYYY-MM-DD format)
         end_date: End date for historical records (YYYY-MM-DD format)
+        basin: Optional basin filter
+        well_id: Optional well filter
+        account_code: Optional account code filter
+        fiscal_period: Optional fiscal period filter (YYYY-MM)
+        output_format: Output format (json, arrow, parquet or csv)
+        cursor: Opaque cursor (next_cursor of the previous page) to resume after
+        after_gl_entry_id: Resume after this gl_entry_id (ignored when cursor is given)
 
     Returns:
-        JSON response with GL records array
+        JSON response with GL records array, or a streamed Arrow/Parquet/CSV response
     """
+    filters = build_record_filters(basin, well_id, account_code, fiscal_period)
+
     # Parse and validate date parameters if provided
     parsed_start_date = None
     parsed_end_date = None
@@ -304,8 +752,7 @@ async def get_gl_batch(
     if start_date or end_date:
         if start_date is None or end_date is None:
             raise HTTPException(
-                status_code=400,
-                detail="Both start_date and end_date must be provided together"
+                status_code=400, detail="Both start_date and end_date must be provided together"
             )
 
         # Strip whitespace and parse dates
@@ -315,36 +762,164 @@ async def get_gl_batch(
         except ValueError as e:
             raise InvalidDateRangeError(
                 f"Invalid date format. Use YYYY-MM-DD format. Error: {str(e)}",
-                {"start_date": start_date, "end_date": end_date}
+                {"start_date": start_date, "end_date": end_date},
             ) from e
 
         if parsed_start_date > parsed_end_date:
             raise InvalidDateRangeError(
                 "start_date must be before or equal to end_date",
-                {"start_date": str(parsed_start_date), "end_date": str(parsed_end_date)}
+                {"start_date": str(parsed_start_date), "end_date": str(parsed_end_date)},
             )
 
-    # Get records based on parameters
-    if parsed_start_date and parsed_end_date:
-        # Get filtered records from historical batch
-        records = gl_streamer.get_historical_range(parsed_start_date, parsed_end_date)
-        # Apply limit
-        records = records[:limit]
-    else:
-        # Get records from the buffered historical batch
-        records = gl_streamer.get_buffered_records(limit)
+    # Resume point: the opaque cursor wins over a raw after_gl_entry_id
+    after = decode_cursor(cursor) if cursor else (after_gl_entry_id or 0)
+
+    response_format = negotiate_format(output_format, request.headers.get("accept"))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if response_format == "parquet":
+        # Parquet pages are compressed already
+        encoding = None
+
+    # Date ranges that end before the live records start only read the history, which
+    # only changes when retention evicts some of it, so their pages are cached per
+    # retention horizon
+    if parsed_start_date is not None and gl_streamer.is_historical_range(parsed_end_date):
+        cache_key = (
+            "get-gl-batch",
+            settings.random_seed,
+            gl_streamer.get_evicted_historical_count(),
+            parsed_start_date,
+            parsed_end_date,
+            limit,
+            response_format,
+            tuple(sorted(filters.items())),
+            after,
+            encoding,
+        )
+        entry = response_cache.get(cache_key)
+        if entry is not None:
+            return cached_response(request, entry)
+        response = build_batch_response(
+            parsed_start_date, parsed_end_date, filters, limit, after, response_format, encoding
+        )
+        return await cache_response(request, cache_key, response)
 
-    return JSONResponse(
-        content={
-            "count": len(records),
-            "limit": limit,
-            "start_date": str(parsed_start_date) if parsed_start_date else None,
-            "end_date": str(parsed_end_date) if parsed_end_date else None,
-            "data": [record.to_dict() for record in records]
-        }
+    return build_batch_response(
+        parsed_start_date, parsed_end_date, filters, limit, after, response_format, encoding
     )
 
 
+@app.get(
+    "/get-gl-by-id",
+    tags=["streaming"],
+    summary="Get GL Data by ID Range",
+    description="""
+    Returns the GL records of an inclusive `gl_entry_id` range (non-streaming).
+
+    Buffered records are served from the record buffer. With counter-based generation
+    (`COUNTER_BASED=true`) every record is a pure function of the seed and its `gl_entry_id`,
+    so records outside the buffer - history before the preloaded `PRELOAD_DAYS`, or live
+    records already evicted - are regenerated on demand; otherwise only retained records
+    are returned.
+
+    **Parameters:**
+    - **first_gl_entry_id**: First ID of the range (inclusive)
+    - **last_gl_entry_id**: Last ID of the range (inclusive, at most 10000 IDs after the first);
+      IDs past the latest generated record are ignored
+
+    **Response Format:**
+    - `{"count": 100, "first_gl_entry_id": 1, "last_gl_entry_id": 100, "data": [{...}, ...]}`
+    - Compressed with gzip or zstd when requested in `Accept-Encoding`
+
+    **Examples:**
+    - `GET /get-gl-by-id?first_gl_entry_id=1&last_gl_entry_id=100`
+    """,
+    response_description="JSON array of GL records",
+)
+async def get_gl_by_id(
+    request: Request,
+    first_gl_entry_id: int = Query(
+        ..., ge=1, description="First gl_entry_id of the range (inclusive)"
+    ),
+    last_gl_entry_id: int = Query(
+        ..., ge=1, description="Last gl_entry_id of the range (inclusive)"
+    ),
+):
+    """
+    Get the GL records of a gl_entry_id range.
+
+    Args:
+        first_gl_entry_id: First ID of the range (inclusive)
+        last_gl_entry_id: Last ID of the range (inclusive)
+
+    Returns:
+        JSON response with the records of the range in gl_entry_id order
+    """
+    if first_gl_entry_id > last_gl_entry_id:
+        raise HTTPException(
+            status_code=400,
+            detail="first_gl_entry_id must be less than or equal to last_gl_entry_id",
+        )
+    if last_gl_entry_id - first_gl_entry_id >= 10000:
+        raise HTTPException(status_code=400, detail="An ID range may span at most 10000 records")
+
+    page = gl_streamer.select_id_range(first_gl_entry_id, last_gl_entry_id)
+    return records_response(
+        {"first_gl_entry_id": first_gl_entry_id, "last_gl_entry_id": last_gl_entry_id},
+        len(page),
+        gl_streamer.encode_page_json(page),
+        negotiate_encoding(request.headers.get("accept-encoding")),
+    )
+
+
+@app.get(
+    "/gl/aggregate",
+    tags=["aggregates"],
+    summary="Aggregate GL Amounts",
+    description="""
+    Returns record counts and the sums and averages of `debit_amount`, `credit_amount` and
+    `net_amount`, overall and optionally grouped by one dimension.
+
+    The aggregates are maintained incrementally as records are generated, so a query reads
+    running totals instead of scanning records. They cover every record up to
+    `last_gl_entry_id`: the whole history (also the part counter-based mode generates on
+    demand), live records from before a checkpoint resume, and records since evicted from
+    the buffer. A reader process in a shared deployment leaves out records the producer
+    had already evicted when the reader mapped them.
+
+    **Parameters:**
+    - **group_by**: `fiscal_period`, `basin`, `state`, `account_code` or `well_id` (optional)
+
+    **Response Format:**
+    - `{"group_by": "basin", "last_gl_entry_id": 400, "totals": {...},
+      "groups": [{"basin": "Permian", ...}]}`
+    - Each aggregate has `count` plus `<amount>_sum` and `<amount>_avg` for each amount field
+
+    **Examples:**
+    - Totals: `GET /gl/aggregate`
+    - Per basin: `GET /gl/aggregate?group_by=basin`
+    """,
+    response_description="Aggregated GL amounts",
+)
+async def aggregate_gl(
+    group_by: str = Query(
+        None,
+        pattern=f"^({'|'.join(ROLLUP_DIMENSIONS)})$",
+        description="Dimension to group by: " + ", ".join(ROLLUP_DIMENSIONS),
+    ),
+):
+    """
+    Get aggregated GL amounts from the streamer's running rollups.
+
+    Args:
+        group_by: Optional dimension to group by
+
+    Returns:
+        Overall totals, plus one aggregate per value of group_by if given
+    """
+    return gl_streamer.get_aggregates(group_by)
+
+
 @app.get("/health", tags=["health"], summary="Health Check")
 async def health_check():
     """
@@ -356,10 +931,16 @@ async def health_check():
         "status": "healthy",
         "service": "QByte GL Data Service",
         "version": "1.0.0",
-        "historical_records": len(gl_streamer._historical_batch),
+        "historical_records": gl_streamer.get_historical_count(),
         "total_streamed": gl_streamer.get_total_streamed_count(),
-        "total_records": len(gl_streamer._historical_batch) + gl_streamer.get_total_streamed_count(),
-        "timestamp": datetime.now().isoformat()
+        "total_records": gl_streamer.get_historical_count()
+        + gl_streamer.get_total_streamed_count(),
+        "last_gl_entry_id": gl_streamer.get_last_gl_entry_id(),
+        "buffer_bytes": gl_streamer.get_buffer_nbytes(),
+        "buffer_memory_bytes": gl_streamer.get_buffer_memory_nbytes(),
+        "buffer_segments": gl_streamer.get_buffer_segment_count(),
+        "stream_subscribers": gl_streamer.get_subscriber_count(),
+        "shared_role": gl_streamer.get_shared_role(),
+        "response_cache": response_cache.stats(),
+        "timestamp": datetime.now().isoformat(),
     }
-
-
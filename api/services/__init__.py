@@ -1,5 +1,7 @@
 """Service layer for GL data streaming."""
-from .gl_streamer import GLDataStreamer
 
-__all__ = ["GLDataStreamer"]
+from .gl_streamer import GLDataStreamer
+from .record_store import ColumnarRecordStore
+from .segment_store import TieredRecordStore
 
+__all__ = ["GLDataStreamer", "ColumnarRecordStore", "TieredRecordStore"]
@@ -0,0 +1,83 @@
+"""Checkpoints of the live generator state, so a restarted service continues the stream."""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from .history_snapshot import rng_state_from_json
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def checkpoint_path(directory: str | Path, key: dict) -> Path:
+    """Checkpoint file for a generator configuration (from history_snapshot.snapshot_key)."""
+    name = (
+        f"checkpoint-v{CHECKPOINT_FORMAT_VERSION}-seed{key['seed']}"
+        f"-{key['start_date']}-{key['historical_days']}d"
+    )
+    if key["counter_based"]:
+        name += f"-counter{key['preload_days']}"
+    if key.get("records_per_day"):
+        name += f"-load{key['records_per_day']}"
+    return Path(directory) / f"{name}.json"
+
+
+@dataclass
+class GeneratorCheckpoint:
+    """Live generator state after the last record emitted before the checkpoint."""
+
+    counter: int
+    journal_batch: int
+    rng_state: tuple
+    # created_timestamp of the next interval-mode record
+    live_datetime: datetime
+    current_records_count: int
+    total_streamed_count: int
+
+
+def write_checkpoint(path: str | Path, key: dict, state: dict):
+    """
+    Atomically replace the checkpoint at path.
+
+    The state is written to a temporary file, flushed to disk and renamed over the old
+    checkpoint, so a crash mid-write leaves the previous checkpoint intact.
+
+    Args:
+        path: Checkpoint file (from checkpoint_path)
+        key: Generator configuration the state belongs to
+        state: counter, journal_batch, rng_state (from rng_state_to_json), live_datetime
+            (ISO format), current_records_count and total_streamed_count
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(staging, "w") as file:
+        json.dump({"version": CHECKPOINT_FORMAT_VERSION, "key": key, **state}, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(staging, path)
+
+
+def load_checkpoint(path: str | Path, key: dict) -> GeneratorCheckpoint | None:
+    """
+    Read the checkpoint at path if it exists and was written for key.
+
+    Returns:
+        The checkpoint, or None if it is missing, unreadable or for another configuration
+    """
+    try:
+        state = json.loads(Path(path).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if state.get("version") != CHECKPOINT_FORMAT_VERSION or state.get("key") != key:
+        return None
+    return GeneratorCheckpoint(
+        counter=state["counter"],
+        journal_batch=state["journal_batch"],
+        rng_state=rng_state_from_json(state["rng_state"]),
+        live_datetime=datetime.fromisoformat(state["live_datetime"]),
+        current_records_count=state["current_records_count"],
+        total_streamed_count=state["total_streamed_count"],
+    )
@@ -0,0 +1,110 @@
+"""Negotiated gzip/zstd compression for full and streamed responses."""
+
+import zlib
+from collections.abc import AsyncIterator, Iterator
+
+try:
+    import zstandard
+except ImportError:  # zstd is an optional extra; gzip is always available
+    zstandard = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+# Bodies smaller than this are sent uncompressed (the framing would outweigh the savings)
+MIN_COMPRESS_BYTES = 512
+
+# Supported encodings in server preference order
+SUPPORTED_ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Pick a content encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Accept-Encoding header value, e.g. "gzip, zstd;q=0.9"
+
+    Returns:
+        "zstd" or "gzip", or None to send the response uncompressed
+    """
+    weights = {}
+    for entry in (accept_encoding or "").split(","):
+        coding, _, params = entry.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if coding:
+            weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        # Ties go to the server's preference (the earlier encoding)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class StreamCompressor:
+    """
+    Incremental compressor that emits a decodable frame for every chunk.
+
+    Each compress() call ends with a flush (a zlib sync flush / a zstd block), so the
+    client can decode everything sent so far without waiting for the stream to end.
+    """
+
+    def __init__(self, encoding: str):
+        """
+        Initialize a stream compressor.
+
+        Args:
+            encoding: "gzip" or "zstd"
+        """
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            # wbits 31 = gzip header and trailer
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk and flush it, returning the bytes to send."""
+        return self._compressor.compress(chunk) + self._compressor.flush(self._flush_mode)
+
+    def finish(self) -> bytes:
+        """End the stream, returning the trailing bytes to send."""
+        return self._compressor.flush()
+
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    """Compress a complete response body in one frame."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return zlib.compress(data, GZIP_LEVEL, wbits=31)
+
+
+def compress_chunks(chunks: Iterator[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a synchronous byte stream, one flushed frame per chunk."""
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk)
+    yield compressor.finish()
+
+
+async def compress_async_chunks(
+    chunks: AsyncIterator[bytes], encoding: str
+) -> AsyncIterator[bytes]:
+    """Compress an asynchronous byte stream, one flushed frame per chunk."""
+    compressor = StreamCompressor(encoding)
+    async for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk)
+    yield compressor.finish()
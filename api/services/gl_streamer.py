@@ -1,13 +1,144 @@
 """GL data streaming service."""
+
 import asyncio
-import json
+import logging
 import random
-from collections.abc import AsyncGenerator
+import time
+import uuid
+from collections.abc import AsyncGenerator, Iterator
 from datetime import date, datetime, timedelta
+from pathlib import Path
 
+import numpy as np
 from core.accounts import AccountRegistry
-from core.models import Account, GLRecord
-from generators import AmountGenerator, DateGenerator, JournalGenerator, OilGasDataGenerator
+from core.exceptions import ConfigurationError
+from core.models import Account, GLRecord, GLRecordBatch
+from generators import (
+    AmountGenerator,
+    BatchGenerator,
+    DateGenerator,
+    JournalGenerator,
+    OilGasDataGenerator,
+    intraday_timestamps,
+)
+
+from .checkpoint import GeneratorCheckpoint, checkpoint_path, load_checkpoint, write_checkpoint
+from .history_snapshot import (
+    HistorySnapshot,
+    load_snapshot,
+    rng_state_to_json,
+    snapshot_key,
+    snapshot_path,
+    write_snapshot,
+)
+from .pagination import RecordPage
+from .record_cache import EncodedRecordLog, encode_record
+from .record_index import RecordIndex
+from .rollups import RecordRollups
+from .segment_store import DEFAULT_HOT_CAPACITY, TieredRecordStore
+from .shared_store import SharedRecordReader, acquire_producer_lock, reset_shared_directory
+
+logger = logging.getLogger(__name__)
+
+# Maximum records per chunk when a resumed stream catches up on buffered records
+STREAM_CHUNK_RECORDS = 1000
+
+# Records scanned per chunk when filtering the buffer for one page of results
+PAGE_SCAN_RECORDS = 65_536
+
+
+class GenerationStream:
+    """
+    One logical stream of generated GL records.
+
+    Owns a seeded RNG shared by its generators together with the gl_entry_id and
+    journal batch counters, so separate streams (the live stream, ad-hoc batches)
+    never touch global or each other's state and can run in different threads.
+    """
+
+    JOURNAL_BATCH_SIZE = 50
+
+    def __init__(self, seed: int, counter: int = 0, journal_batch: int = 1):
+        """
+        Initialize a generation stream.
+
+        Args:
+            seed: Seed for the stream's RNG
+            counter: Number of records already emitted (last gl_entry_id)
+            journal_batch: Current journal batch number
+        """
+        self.rng = random.Random(seed)
+        self.oil_gas_generator = OilGasDataGenerator(self.rng)
+        self.journal_generator = JournalGenerator(self.rng)
+        self.amount_generator = AmountGenerator(self.rng)
+        self.date_generator = DateGenerator(self.rng)
+        self.counter = counter
+        self.journal_batch = journal_batch
+
+    def advance(self):
+        """Move past the record that was just emitted."""
+        self.counter += 1
+        if self.counter % self.JOURNAL_BATCH_SIZE == 0:
+            self.journal_batch += 1
+
+
+class RecordBroadcaster:
+    """
+    Wakes live-stream subscribers as soon as new records are appended to the buffer.
+
+    The producer publishes the new end position after each append; subscribers wait for
+    the end position to move past the one they have sent. Every wait shares one event
+    that is set and replaced on publish, so an append wakes each waiting subscriber
+    exactly once, idle subscribers cost nothing, and no lock is taken to wake or check.
+    """
+
+    def __init__(self, stop: int = 0):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            stop: Current end position of the buffer
+        """
+        self._stop = stop
+        self._published = asyncio.Event()
+        self._subscribers = 0
+
+    @property
+    def stop(self) -> int:
+        """Last published end position."""
+        return self._stop
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of subscribers currently waiting for records."""
+        return self._subscribers
+
+    def publish(self, stop: int):
+        """Publish a new end position and wake every waiting subscriber."""
+        self._stop = stop
+        published, self._published = self._published, asyncio.Event()
+        published.set()
+
+    async def wait(self, position: int, timeout: float | None = None) -> int:
+        """
+        Wait until the end position moves past position.
+
+        Args:
+            position: End position the subscriber has already sent up to
+            timeout: Give up after this many seconds (default: wait indefinitely)
+
+        Returns:
+            The current end position (equal to position if the wait timed out)
+        """
+        self._subscribers += 1
+        try:
+            while self._stop <= position:
+                await asyncio.wait_for(self._published.wait(), timeout)
+        except TimeoutError:
+            pass
+        finally:
+            self._subscribers -= 1
+        return self._stop
 
 
 class GLDataStreamer:
@@ -17,141 +148,729 @@ class GLDataStreamer:
     FIXED_START_DATE = date(2025, 11, 10)
     FIXED_START_DATETIME = datetime(2025, 11, 10, 0, 0, 0)
 
-    def __init__(self, historical_days: int = 365):
+    def __init__(
+        self,
+        historical_days: int = 365,
+        seed: int = 42,
+        counter_based: bool = False,
+        preload_days: int | None = None,
+        hot_capacity: int = DEFAULT_HOT_CAPACITY,
+        segment_directory: str | None = None,
+        max_records: int | None = None,
+        max_bytes: int | None = None,
+        start_date: date | None = None,
+        records_per_day: int | None = None,
+        shared_directory: str | None = None,
+        snapshot_directory: str | None = None,
+        checkpoint_directory: str | None = None,
+        checkpoint_interval_seconds: float = 5.0,
+    ):
         """
         Initialize GL data streamer.
 
         Args:
-            historical_days: Number of days back from FIXED_START_DATE to generate historical records (default 365)
+            historical_days: Number of days back from FIXED_START_DATE to generate historical
+                records (default 365)
+            seed: Seed for deterministic data generation (default 42)
+            counter_based: Derive every record from (seed, gl_entry_id) instead of a sequential
+                RNG stream, so any date or ID range can be generated on demand
+            preload_days: Counter-based mode only - number of most recent historical days to keep
+                in memory (default: all of historical_days)
+            hot_capacity: Maximum number of records held in memory; older records spill to
+                memory-mapped segment files
+            segment_directory: Directory for spilled segments (default: a temporary directory)
+            max_records: Retention limit on records kept across memory and disk (default: unbounded)
+            max_bytes: Retention limit on bytes kept across memory and disk (default: unbounded)
+            start_date: Date live records start at; history ends the day before
+                (default: FIXED_START_DATE)
+            records_per_day: Load-generation layout - live records get intraday timestamps,
+                records_per_day per simulated day (required by background_generate_load)
+            shared_directory: Share one record stream between processes through this directory.
+                The first process to lock it generates and publishes records (segment_directory
+                is ignored); every other process serves a read-only memory-mapped view of them
+                and should run follow_shared instead of a generator
+            snapshot_directory: Keep a snapshot of the generated history and generator state here,
+                keyed by seed, start date and historical_days; a matching snapshot is memory-mapped
+                at startup instead of regenerating history
+            checkpoint_directory: Checkpoint the live generator state here at most every
+                checkpoint_interval_seconds and on close; a matching checkpoint is resumed at
+                startup (regenerating the live records before it), so live gl_entry_ids and
+                timestamps continue instead of starting over
+            checkpoint_interval_seconds: Minimum time between periodic checkpoints
         """
+        if start_date is not None:
+            self.FIXED_START_DATE = start_date
+            self.FIXED_START_DATETIME = datetime.combine(start_date, datetime.min.time())
+        self._records_per_day = records_per_day
         self.account_registry = AccountRegistry()
-        self.oil_gas_generator = OilGasDataGenerator()
-        self.journal_generator = JournalGenerator()
-        self.amount_generator = AmountGenerator()
-        self.date_generator = DateGenerator()
-        self._counter = 0
-        self._journal_batch = 1
-        self._historical_batch: list[GLRecord] = []
-        # Create a seeded RNG instance for ALL data (deterministic)
-        self._deterministic_rng = random.Random(42)
+        # Number of historical records at the start of the record buffer
+        self._historical_count = 0
+        self._seed = seed
+        # Seeded stream for historical + live records; its counter continues from history into live
+        self._stream = GenerationStream(seed)
         # One record per day
         self._historical_days = historical_days
+        # Counter-based mode: records are pure functions of (seed, gl_entry_id)
+        self._counter_based = counter_based
+        self._preload_days = (
+            historical_days if preload_days is None else min(preload_days, historical_days)
+        )
+        self._counter_generator = BatchGenerator(seed=seed, account_registry=self.account_registry)
         # Track current records generated (new records after historical batch)
         self._current_records_count = 0
         # Track total records streamed (including historical)
         self._total_streamed_count = 0
-        # Buffer to store generated records for clients to consume
-        self._record_buffer: list[GLRecord] = []
+        # created_timestamp of the next interval-mode live record
+        self._live_datetime = self.FIXED_START_DATETIME
+        self._hot_capacity = hot_capacity
+        # Multi-process mode: the holder of the directory lock produces, everyone else reads
+        self._producer_lock = acquire_producer_lock(shared_directory) if shared_directory else None
+        self._shared_epoch: str | None = None
         self._buffer_lock = asyncio.Lock()
-        self._initialize_historical_batch()
-        # Pre-load all historical records into buffer immediately
-        self._preload_historical_records()
+        if shared_directory and self._producer_lock is None:
+            self._record_buffer = SharedRecordReader(shared_directory)
+            self._record_buffer.refresh()
+            self._apply_shared_metadata()
+        else:
+            if self._producer_lock is not None:
+                reset_shared_directory(shared_directory)
+                segment_directory = shared_directory
+                self._shared_epoch = uuid.uuid4().hex
+            # Columnar buffer of generated records (historical first, then live) for clients to
+            # consume; positions are absolute, so cursors stay valid as records spill to disk or
+            # are evicted
+            self._record_buffer = TieredRecordStore(
+                directory=segment_directory,
+                hot_capacity=hot_capacity,
+                max_records=max_records,
+                max_bytes=max_bytes,
+            )
+        snapshot = None
+        if snapshot_directory and not self.is_shared_reader:
+            key = snapshot_key(
+                seed, self.FIXED_START_DATE, historical_days, counter_based, self._preload_days
+            )
+            snapshot = load_snapshot(snapshot_path(snapshot_directory, key), key)
+            if snapshot is not None:
+                self._restore_snapshot(snapshot)
+        if not self.is_shared_reader and snapshot is None:
+            self._initialize_historical_batch()
+            # Pre-load all historical records into buffer immediately
+            self._preload_historical_records()
+        # History never changes once generated, so it is indexed once for range queries
+        self._historical_index = RecordIndex(self._record_buffer, 0, self._historical_count)
+        # Running aggregates for /gl/aggregate, folded in on every append from here on
+        self._rollups = RecordRollups()
+        self._reset_rollups()
+        # JSON encoding of each recent record, made once and shared by every response
+        encoded_first = max(
+            self._record_buffer.first_position, len(self._record_buffer) - hot_capacity
+        )
+        if snapshot is not None and snapshot.encoded_first_position <= encoded_first:
+            self._encoded_log = EncodedRecordLog.load(
+                snapshot.path, snapshot.encoded_first_position, hot_capacity
+            )
+        else:
+            self._encode_recent_records()
+        if snapshot_directory and not self.is_shared_reader and snapshot is None:
+            self._write_snapshot(snapshot_path(snapshot_directory, key), key)
+        # Resume the live stream where the previous run left off (after the snapshot is written,
+        # so the snapshot only ever holds the state at the end of history)
+        self._checkpoint_path: Path | None = None
+        self._checkpoint_key: dict | None = None
+        self._checkpoint_interval = checkpoint_interval_seconds
+        self._last_checkpoint = time.monotonic()
+        if checkpoint_directory and not self.is_shared_reader:
+            self._checkpoint_key = {
+                **snapshot_key(
+                    seed, self.FIXED_START_DATE, historical_days, counter_based, self._preload_days
+                ),
+                "records_per_day": records_per_day,
+            }
+            self._checkpoint_path = checkpoint_path(checkpoint_directory, self._checkpoint_key)
+            checkpoint = load_checkpoint(self._checkpoint_path, self._checkpoint_key)
+            if checkpoint is not None and checkpoint.counter >= self._stream.counter:
+                self._restore_checkpoint(checkpoint)
+        # Pushes each append to live subscribers instead of every client polling the buffer
+        self._broadcaster = RecordBroadcaster(len(self._record_buffer))
+        if self._producer_lock is not None:
+            self._record_buffer.publish(self._shared_metadata())
 
     def _initialize_historical_batch(self):
         """Generate historical records going back historical_days from FIXED_START_DATE."""
-        # Save current counter state
+        if self._counter_based:
+            # Only materialize the most recent preload_days; older history is generated on demand
+            first_id = self._historical_days - self._preload_days + 1
+            self._record_buffer.extend_batch(
+                self._generate_batch_by_ids(first_id, self._historical_days)
+            )
+            self._historical_count = len(self._record_buffer)
+            self._stream.counter = self._historical_days
+            self._stream.journal_batch = (
+                self._stream.counter // GenerationStream.JOURNAL_BATCH_SIZE + 1
+            )
+            return
 
         # Calculate start date: go back historical_days from FIXED_START_DATE
-        start_date = self.FIXED_START_DATE - timedelta(days=self._historical_days)
-        datetime.combine(start_date, datetime.min.time())
+        current_date = self.FIXED_START_DATE - timedelta(days=self._historical_days)
+
+        # Generate one record per day for historical_days
+        for _i in range(self._historical_days):
+            current_datetime = datetime.combine(current_date, datetime.min.time())
+            gl_record = self._generate_gl_record(
+                self._stream, transaction_date=current_date, transaction_datetime=current_datetime
+            )
+            self._record_buffer.append(gl_record)
+            current_date += timedelta(days=1)
+
+        self._historical_count = len(self._record_buffer)
+
+        # The stream counter continues from here so gl_entry_id values stay unique
+        # across historical and real-time records
+
+    def _restore_snapshot(self, snapshot: HistorySnapshot):
+        """Map a snapshot's historical records into the buffer and resume the stream after them."""
+        self._record_buffer.attach(snapshot.path)
+        self._historical_count = snapshot.historical_count
+        self._stream.counter = snapshot.counter
+        self._stream.journal_batch = snapshot.journal_batch
+        self._stream.rng.setstate(snapshot.rng_state)
+        self._preload_historical_records()
 
-        # Temporarily replace generators' random with our seeded RNG
-        original_random = random.random
-        original_choice = random.choice
-        original_uniform = random.uniform
-        original_randint = random.randint
+    def _write_snapshot(self, path: Path, key: dict):
+        """Persist the freshly generated history, its encodings and the generator state."""
+
+        def write_records(directory: Path):
+            self._record_buffer.save(directory, 0, self._historical_count)
+            self._encoded_log.save(directory)
+
+        written = write_snapshot(
+            path,
+            key,
+            write_records,
+            {
+                "historical_count": self._historical_count,
+                "counter": self._stream.counter,
+                "journal_batch": self._stream.journal_batch,
+                "rng_state": rng_state_to_json(self._stream.rng.getstate()),
+                "encoded_first_position": self._encoded_log.first_position,
+            },
+        )
+        if written:
+            logger.info(f"Wrote history snapshot {path}")
 
-        # Monkey-patch random functions to use our seeded RNG
-        random.random = self._deterministic_rng.random
-        random.choice = self._deterministic_rng.choice
-        random.uniform = self._deterministic_rng.uniform
-        random.randint = self._deterministic_rng.randint
+    def _reset_rollups(self):
+        """
+        Rebuild the rollups from the complete history and the buffered records after it.
 
-        try:
-            current_date = start_date
-            # Generate one record per day for historical_days
-            for _i in range(self._historical_days):
-                current_datetime = datetime.combine(current_date, datetime.min.time())
-                gl_record = self._generate_gl_record(
-                    transaction_date=current_date,
-                    transaction_datetime=current_datetime
-                )
-                self._historical_batch.append(gl_record)
-                current_date += timedelta(days=1)
-        finally:
-            # Restore original random functions
-            random.random = original_random
-            random.choice = original_choice
-            random.uniform = original_uniform
-            random.randint = original_randint
+        In counter-based mode the history before the preloaded window is never buffered,
+        so it is generated (PAGE_SCAN_RECORDS at a time) just to be folded in.
+        """
+        self._rollups.reset()
+        if self._counter_based:
+            first_preloaded_id = self._historical_days - self._preload_days + 1
+            for first_id in range(1, first_preloaded_id, PAGE_SCAN_RECORDS):
+                last_id = min(first_id + PAGE_SCAN_RECORDS, first_preloaded_id) - 1
+                self._rollups.add_unbuffered_batch(self._generate_batch_by_ids(first_id, last_id))
+        self._rollups.add_range(self._record_buffer)
+
+    def _encode_recent_records(self):
+        """Start a fresh encoded log holding the most recent hot_capacity buffered records."""
+        encoded_first = max(
+            self._record_buffer.first_position, len(self._record_buffer) - self._hot_capacity
+        )
+        self._encoded_log = EncodedRecordLog(encoded_first, max_records=self._hot_capacity)
+        for gl_record in self._record_buffer.slice(encoded_first):
+            self._encoded_log.append(encode_record(gl_record))
+
+    def _restore_checkpoint(self, checkpoint: GeneratorCheckpoint):
+        """
+        Continue the live stream from a checkpoint.
+
+        The live records emitted before the restart are regenerated into the buffer first
+        (subject to retention, like any append) and folded into the rollups, so their IDs
+        stay readable by cursor and by ID; new records continue after the checkpointed
+        gl_entry_id.
+        """
+        started = time.monotonic()
+        replayed = self._regenerate_live_records(checkpoint.counter)
+        if replayed and self._stream.rng.getstate() != checkpoint.rng_state:
+            logger.warning(
+                "Replayed live stream does not match the checkpoint; continuing from the replay"
+            )
+        self._encode_recent_records()
+        self._live_datetime = checkpoint.live_datetime
+        self._current_records_count = checkpoint.current_records_count
+        self._total_streamed_count = checkpoint.total_streamed_count
+        logger.info(
+            f"Resumed live stream from checkpoint at gl_entry_id {checkpoint.counter} "
+            f"(regenerated the records before it in {time.monotonic() - started:.1f}s)"
+        )
+
+    def _regenerate_live_records(self, last_gl_entry_id: int) -> bool:
+        """
+        Generate the live records up to last_gl_entry_id again, appending them to the buffer.
 
-        # Don't reset counter state - let it continue for unique IDs
-        # The counter should continue from where historical batch generation left off
-        # to ensure all gl_entry_id values are unique across historical and real-time records
+        Counter-based and load-generation records are pure functions of their ID and are
+        generated PAGE_SCAN_RECORDS at a time; interval-mode records of the sequential stream
+        are replayed one by one from the end of history, one simulated second apart, which
+        leaves the stream in the state it had when they were first generated.
+
+        Returns:
+            True if the sequential stream was replayed, False if records were generated by ID
+        """
+        if self._counter_based or self._records_per_day:
+            for first_id in range(
+                self._stream.counter + 1, last_gl_entry_id + 1, PAGE_SCAN_RECORDS
+            ):
+                last_id = min(first_id + PAGE_SCAN_RECORDS - 1, last_gl_entry_id)
+                batch = self._generate_batch_by_ids(first_id, last_id)
+                self._record_buffer.extend_batch(batch)
+                self._rollups.add_batch(batch)
+            self._stream.counter = max(self._stream.counter, last_gl_entry_id)
+            self._stream.journal_batch = (
+                self._stream.counter // GenerationStream.JOURNAL_BATCH_SIZE + 1
+            )
+            return False
+
+        current_datetime = self.FIXED_START_DATETIME
+        while self._stream.counter < last_gl_entry_id:
+            gl_record = self._generate_gl_record(
+                self._stream,
+                transaction_date=current_datetime.date(),
+                transaction_datetime=current_datetime,
+            )
+            self._record_buffer.append(gl_record)
+            self._rollups.add_record(gl_record)
+            current_datetime += timedelta(seconds=1)
+        return True
+
+    def _checkpoint_state(self) -> dict:
+        """The live generator state as written by write_checkpoint."""
+        return {
+            "counter": self._stream.counter,
+            "journal_batch": self._stream.journal_batch,
+            "rng_state": rng_state_to_json(self._stream.rng.getstate()),
+            "live_datetime": self._live_datetime.isoformat(),
+            "current_records_count": self._current_records_count,
+            "total_streamed_count": self._total_streamed_count,
+        }
+
+    async def _checkpoint(self):
+        """Write a checkpoint if checkpointing is enabled and the interval has passed."""
+        if (
+            self._checkpoint_path is None
+            or time.monotonic() - self._last_checkpoint < self._checkpoint_interval
+        ):
+            return
+        self._last_checkpoint = time.monotonic()
+        # The state is captured now; only the file write runs off the event loop
+        try:
+            await asyncio.to_thread(
+                write_checkpoint,
+                self._checkpoint_path,
+                self._checkpoint_key,
+                self._checkpoint_state(),
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write checkpoint {self._checkpoint_path}: {e}")
 
     def _preload_historical_records(self):
-        """Pre-load all historical records into buffer immediately."""
-        # Add all historical records to buffer
-        self._record_buffer.extend(self._historical_batch)
-        # Set counter to reflect historical records
-        self._total_streamed_count = len(self._historical_batch)
+        """Count the historical records (generated straight into the buffer) as streamed."""
+        self._total_streamed_count = self._historical_count
+
+    def _history_start_date(self) -> date:
+        """First transaction date of the historical window."""
+        return self.FIXED_START_DATE - timedelta(days=self._historical_days)
+
+    def _counter_layout(self, gl_entry_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Transaction dates and created timestamps for IDs in counter-based mode.
+
+        Historical IDs 1..historical_days fall one per day at midnight; later (live) IDs
+        are one per second from FIXED_START_DATETIME, matching background_generate, or
+        spread over intraday timestamps with records_per_day, matching background_generate_load.
+        """
+        history_start = np.datetime64(self._history_start_date(), "D")
+        historical_ts = (history_start + (gl_entry_ids - 1)).astype("datetime64[us]")
+        live_ordinals = np.maximum(gl_entry_ids - self._historical_days - 1, 0)
+        if self._records_per_day:
+            live_ts = intraday_timestamps(
+                live_ordinals, self.FIXED_START_DATE, self._records_per_day
+            )
+        else:
+            live_ts = np.datetime64(
+                self.FIXED_START_DATETIME, "us"
+            ) + live_ordinals * np.timedelta64(1, "s")
+        created_timestamps = np.where(gl_entry_ids > self._historical_days, live_ts, historical_ts)
+        return created_timestamps.astype("datetime64[D]"), created_timestamps
+
+    def get_records_by_id_range(
+        self, first_gl_entry_id: int, last_gl_entry_id: int
+    ) -> list[GLRecord]:
+        """
+        Get records by gl_entry_id range (inclusive).
+
+        In counter-based mode each record is computed directly from (seed, gl_entry_id),
+        so the cost is O(range) regardless of how far back the range lies. In sequential
+        mode the range is looked up in the buffer of already generated records.
+
+        Args:
+            first_gl_entry_id: First ID of the range (inclusive, >= 1)
+            last_gl_entry_id: Last ID of the range (inclusive, capped at the last generated ID)
+
+        Returns:
+            List of GLRecord objects ordered by gl_entry_id
+        """
+        if not self._counter_based:
+            # IDs increase with buffer position, so the range is one contiguous slice
+            return self._record_buffer.slice(
+                self._record_buffer.searchsorted("gl_entry_id", first_gl_entry_id, side="left"),
+                self._record_buffer.searchsorted("gl_entry_id", last_gl_entry_id, side="right"),
+            )
+
+        return self._generate_by_ids(
+            max(first_gl_entry_id, 1), min(last_gl_entry_id, self._stream.counter)
+        )
+
+    def select_id_range(self, first_gl_entry_id: int, last_gl_entry_id: int) -> RecordPage:
+        """
+        Select the records of an inclusive gl_entry_id range as a page.
+
+        Buffered records are read from the buffer (with their cached encodings); in
+        counter-based mode records no longer or never buffered (history before the
+        preloaded window, evicted live records) are generated by ID instead.
+
+        Args:
+            first_gl_entry_id: First ID of the range (inclusive)
+            last_gl_entry_id: Last ID of the range (inclusive, capped at the last generated ID)
+
+        Returns:
+            RecordPage to pass to encode_page_json or page_batch
+        """
+        first_gl_entry_id = max(first_gl_entry_id, 1)
+        last_gl_entry_id = min(last_gl_entry_id, self._stream.counter)
+        start = max(
+            self._record_buffer.searchsorted("gl_entry_id", first_gl_entry_id, side="left"),
+            self._record_buffer.first_position,
+        )
+        stop = max(
+            start, self._record_buffer.searchsorted("gl_entry_id", last_gl_entry_id, side="right")
+        )
+        # IDs are unique and sorted, so the buffer holds the whole range iff the counts match
+        if self._counter_based and stop - start < last_gl_entry_id - first_gl_entry_id + 1:
+            records = self.get_records_by_id_range(first_gl_entry_id, last_gl_entry_id)
+            return RecordPage(
+                records=records, last_gl_entry_id=records[-1].gl_entry_id if records else None
+            )
+        positions = np.arange(start, stop)
+        last_id = None
+        if len(positions):
+            last_id = int(self._record_buffer.column("gl_entry_id", stop - 1, stop)[0])
+        return RecordPage(positions=positions, last_gl_entry_id=last_id)
+
+    def _generate_batch_by_ids(
+        self, first_gl_entry_id: int, last_gl_entry_id: int
+    ) -> GLRecordBatch:
+        """Generate an inclusive ID range as columns with the counter-based generator."""
+        gl_entry_ids = np.arange(
+            first_gl_entry_id, max(last_gl_entry_id + 1, first_gl_entry_id), dtype=np.int64
+        )
+        transaction_dates, created_timestamps = self._counter_layout(gl_entry_ids)
+        return self._counter_generator.generate_for_ids(
+            gl_entry_ids, transaction_dates, created_timestamps
+        )
+
+    def _generate_by_ids(self, first_gl_entry_id: int, last_gl_entry_id: int) -> list[GLRecord]:
+        """Generate an inclusive ID range as GLRecord instances."""
+        return self._generate_batch_by_ids(first_gl_entry_id, last_gl_entry_id).to_records()
+
+    def _buffer_record(self, gl_record: GLRecord, encoded: bytes):
+        """Append a record and its encoding (call while holding the buffer lock)."""
+        self._record_buffer.append(gl_record)
+        self._rollups.add_record(gl_record)
+        self._encoded_log.append(encoded)
+        self._encoded_log.drop_before(self._record_buffer.first_position)
+
+    @property
+    def is_shared_reader(self) -> bool:
+        """Whether this process serves records published by another process's generator."""
+        return isinstance(self._record_buffer, SharedRecordReader)
+
+    def _shared_metadata(self) -> dict:
+        """Counters published with the records for reader processes to adopt."""
+        return {
+            "epoch": self._shared_epoch,
+            "historical_count": self._historical_count,
+            "last_gl_entry_id": self._stream.counter,
+            "current_records_count": self._current_records_count,
+            "total_streamed_count": self._total_streamed_count,
+        }
+
+    async def _publish_shared(self):
+        """
+        Publish buffered records to reader processes (no-op unless this process is the producer).
+
+        Call while holding the buffer lock: the segment and manifest files are written in a
+        worker thread, so the event loop keeps serving requests while no append can interleave.
+        """
+        if self._producer_lock is None:
+            return
+        await asyncio.to_thread(self._record_buffer.publish, self._shared_metadata())
+
+    def _apply_shared_metadata(self) -> bool:
+        """Adopt the producer's counters; returns True if a new producer has taken over."""
+        metadata = self._record_buffer.metadata
+        self._historical_count = metadata.get("historical_count", 0)
+        self._stream.counter = metadata.get("last_gl_entry_id", 0)
+        self._stream.journal_batch = self._stream.counter // GenerationStream.JOURNAL_BATCH_SIZE + 1
+        self._current_records_count = metadata.get("current_records_count", 0)
+        self._total_streamed_count = metadata.get("total_streamed_count", 0)
+        epoch = metadata.get("epoch")
+        restarted = epoch != self._shared_epoch
+        self._shared_epoch = epoch
+        return restarted
+
+    async def follow_shared(self, poll_seconds: float = 0.05):
+        """
+        Background task for reader processes: pick up records the producer publishes.
+
+        New records are encoded into this process's cache and announced to its live
+        subscribers, exactly as if they had been generated locally.
+
+        Args:
+            poll_seconds: Time between checks for a new manifest
+        """
+        unsupported_manifest = None
+        while True:
+            await asyncio.sleep(poll_seconds)
+            try:
+                changed = self._record_buffer.refresh()
+            except ValueError as e:
+                # Keep serving the records already mapped until a compatible producer publishes
+                if str(e) != unsupported_manifest:
+                    logger.error(f"Cannot follow shared record store: {e}")
+                    unsupported_manifest = str(e)
+                continue
+            unsupported_manifest = None
+            if not changed:
+                continue
+
+            if self._apply_shared_metadata():
+                # A new producer republished from scratch: rebuild what was derived from history
+                self._historical_index = RecordIndex(self._record_buffer, 0, self._historical_count)
+                self._reset_rollups()
+            stop = len(self._record_buffer)
+            self._rollups.add_range(self._record_buffer, stop)
+            first = max(self._record_buffer.first_position, stop - self._hot_capacity)
+            if not first <= self._encoded_log.stop <= stop:
+                self._encoded_log = EncodedRecordLog(first, max_records=self._hot_capacity)
+            self._encoded_log.extend(
+                [
+                    encode_record(gl_record)
+                    for gl_record in self._record_buffer.slice(self._encoded_log.stop, stop)
+                ]
+            )
+            self._encoded_log.drop_before(self._record_buffer.first_position)
+            self._broadcaster.publish(stop)
+
+    def _encode_positions(self, positions: np.ndarray) -> list[bytes]:
+        """Encoded records at buffer positions, re-encoding only those no longer cached."""
+        positions = np.asarray(positions, dtype=np.int64)
+        cached = self._encoded_log.contains(positions)
+        encoded = [
+            self._encoded_log.get(position) if hit else None
+            for position, hit in zip(positions.tolist(), cached.tolist(), strict=True)
+        ]
+        misses = np.flatnonzero(~cached)
+        if len(misses):
+            for slot, gl_record in zip(
+                misses.tolist(), self._record_buffer.take(positions[misses]), strict=True
+            ):
+                encoded[slot] = encode_record(gl_record)
+        return encoded
+
+    def _encode_array(self, positions: np.ndarray) -> bytes:
+        """JSON array body (without brackets) for records at buffer positions."""
+        positions = np.asarray(positions, dtype=np.int64)
+        if (
+            len(positions)
+            and self._encoded_log.contains(positions).all()
+            and (positions[-1] - positions[0] == len(positions) - 1)
+        ):
+            # A contiguous cached run is a single slice of the log
+            return self._encoded_log.span(int(positions[0]), int(positions[-1]) + 1)
+        return EncodedRecordLog.SEPARATOR.join(self._encode_positions(positions))
+
+    def _chunk_positions(
+        self,
+        start: int,
+        stop: int,
+        filters: dict[str, str],
+        chunk_records: int,
+        date_range: tuple[date, date] | None = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Positions in [start, stop) matching filters, scanning chunk_records positions at a time.
+
+        Chunks may be empty when nothing in a window matches. Positions evicted between
+        chunks are skipped, so a slow consumer never reads a record that is gone.
+        """
+        position = start
+        while position < stop:
+            position = max(position, self._record_buffer.first_position)
+            window_stop = min(stop, position + chunk_records)
+            if filters or date_range is not None:
+                yield self._record_buffer.filter(position, window_stop, date_range, **filters)
+            else:
+                yield np.arange(position, window_stop)
+            position = window_stop
 
     def get_current_records_count(self) -> int:
         """Get the current number of records generated."""
         return self._current_records_count
 
+    def get_historical_count(self) -> int:
+        """Get the number of pre-generated historical records held in the buffer."""
+        return self._historical_count
+
+    def get_evicted_historical_count(self) -> int:
+        """
+        Get the number of historical records retention has evicted from the buffer.
+
+        Historical range responses only change when this does (in counter-based mode history
+        is regenerated on demand, so it is always 0), so it belongs in their cache keys.
+        """
+        if self._counter_based:
+            return 0
+        return min(self._record_buffer.first_position, self._historical_count)
+
+    def get_buffer_nbytes(self) -> int:
+        """Get the approximate bytes retained by the record buffer (memory and disk)."""
+        return self._record_buffer.nbytes()
+
+    def get_buffer_memory_nbytes(self) -> int:
+        """Get the approximate memory used by the in-memory tier of the record buffer."""
+        return self._record_buffer.memory_nbytes()
+
+    def get_buffer_segment_count(self) -> int:
+        """Get the number of record buffer segments spilled to disk."""
+        return self._record_buffer.segment_count
+
+    def get_aggregates(self, group_by: str | None = None) -> dict:
+        """
+        Get record counts and debit/credit/net sums and averages from the running rollups.
+
+        Args:
+            group_by: Dimension to group by (one of RecordRollups.dimensions), or None for
+                totals only
+
+        Returns:
+            Dict with the overall totals, the groups (if grouped) and the last gl_entry_id
+            they include
+        """
+        aggregates = {
+            "group_by": group_by,
+            "last_gl_entry_id": self._stream.counter,
+            "totals": self._rollups.totals(),
+        }
+        if group_by is not None:
+            aggregates["groups"] = self._rollups.group(group_by)
+        return aggregates
+
+    def get_shared_role(self) -> str | None:
+        """Get this process's role in a shared deployment: "producer", "reader" or None."""
+        if self._producer_lock is not None:
+            return "producer"
+        return "reader" if self.is_shared_reader else None
+
+    def close(self):
+        """Checkpoint the live stream, then release the buffer's segment files and producer lock."""
+        if self._checkpoint_path is not None:
+            try:
+                write_checkpoint(
+                    self._checkpoint_path, self._checkpoint_key, self._checkpoint_state()
+                )
+            except OSError as e:
+                logger.warning(f"Failed to write checkpoint {self._checkpoint_path}: {e}")
+        self._record_buffer.close()
+        if self._producer_lock is not None:
+            self._producer_lock.close()
+            self._producer_lock = None
+
+    def get_subscriber_count(self) -> int:
+        """Get the number of live-stream clients waiting for new records."""
+        return self._broadcaster.subscriber_count
+
     def get_total_streamed_count(self) -> int:
         """Get the total number of records streamed including historical."""
         return self._total_streamed_count
 
+    def get_last_gl_entry_id(self) -> int:
+        """Get the gl_entry_id of the latest generated record (ingestion resumes after it)."""
+        return self._stream.counter
 
-    def _select_account(self) -> tuple[Account, bool]:
+    def _select_account(self, rng: random.Random) -> tuple[Account, bool]:
         """
         Select an account based on transaction type probability.
 
+        Args:
+            rng: Random number generator of the stream generating the record
+
         Returns:
             Tuple of (account, is_revenue)
         """
-        account_type_roll = random.random()
+        account_type_roll = rng.random()
         if account_type_roll < 0.3:  # 30% revenue
-            account = random.choice(self.account_registry.revenue_accounts)
+            account = rng.choice(self.account_registry.revenue_accounts)
             return (account, True)
         elif account_type_roll < 0.7:  # 40% operating expense
-            account = random.choice(self.account_registry.operating_expense_accounts)
+            account = rng.choice(self.account_registry.operating_expense_accounts)
             return (account, False)
         elif account_type_roll < 0.9:  # 20% capex
-            account = random.choice(self.account_registry.capex_accounts)
+            account = rng.choice(self.account_registry.capex_accounts)
             return (account, False)
         else:  # 10% admin
-            account = random.choice(self.account_registry.admin_accounts)
+            account = rng.choice(self.account_registry.admin_accounts)
             return (account, False)
 
-    def _generate_gl_record(self, transaction_date: datetime.date = None, transaction_datetime: datetime = None) -> GLRecord:
+    def _generate_gl_record(
+        self,
+        stream: GenerationStream,
+        transaction_date: datetime.date = None,
+        transaction_datetime: datetime = None,
+    ) -> GLRecord:
         """
         Generate a single GL record.
 
         Args:
+            stream: Generation stream supplying the RNG and ID counters (advanced by one)
             transaction_date: Specific transaction date (if None, uses date generator)
             transaction_datetime: Specific transaction datetime for created_timestamp
         """
-        account, is_revenue = self._select_account()
+        account, is_revenue = self._select_account(stream.rng)
+        oil_gas_generator = stream.oil_gas_generator
 
         # Generate dates first (needed for JIB number)
         if transaction_date is None:
-            transaction_date = self.date_generator.generate_transaction_date()
+            transaction_date = stream.date_generator.generate_transaction_date()
 
         # Generate oil & gas specific data
-        well_id = self.oil_gas_generator.generate_well_id()
-        afe_number = self.oil_gas_generator.generate_afe_number() if account.is_capex() else None
-        lease_name = self.oil_gas_generator.generate_lease_name()
-        property_id = self.oil_gas_generator.generate_property_id()
-        jib_number = self.oil_gas_generator.generate_jib_number(transaction_date) if random.random() < 0.4 else None
-        cost_center = self.oil_gas_generator.generate_cost_center()
-        journal_source = self.journal_generator.generate_journal_source()
-        transaction_type = self.journal_generator.generate_transaction_type()
+        well_id = oil_gas_generator.generate_well_id()
+        afe_number = oil_gas_generator.generate_afe_number() if account.is_capex() else None
+        lease_name = oil_gas_generator.generate_lease_name()
+        property_id = oil_gas_generator.generate_property_id()
+        jib_number = (
+            oil_gas_generator.generate_jib_number(transaction_date)
+            if stream.rng.random() < 0.4
+            else None
+        )
+        cost_center = oil_gas_generator.generate_cost_center()
+        journal_source = stream.journal_generator.generate_journal_source()
+        transaction_type = stream.journal_generator.generate_transaction_type()
 
         # Generate amounts
-        debit_amount, credit_amount = self.amount_generator.generate_for_account(account)
+        debit_amount, credit_amount = stream.amount_generator.generate_for_account(account)
 
         # Posting date (use transaction date as posting date for historical records)
         posting_date = transaction_date
@@ -161,9 +880,9 @@ class GLDataStreamer:
 
         # Create GL record
         gl_record = GLRecord(
-            gl_entry_id=self._counter + 1,
-            journal_batch=f"BATCH-{self._journal_batch:06d}",
-            journal_entry=f"JE-{self._counter + 1:08d}",
+            gl_entry_id=stream.counter + 1,
+            journal_batch=f"BATCH-{stream.journal_batch:06d}",
+            journal_entry=f"JE-{stream.counter + 1:08d}",
             transaction_date=transaction_date,
             posting_date=posting_date,
             account_code=account.code,
@@ -184,18 +903,16 @@ class GLDataStreamer:
             fiscal_period=transaction_date.strftime("%Y-%m"),
             fiscal_year=transaction_date.year,
             fiscal_month=transaction_date.month,
-            state=self.oil_gas_generator.generate_state(),
-            county=self.oil_gas_generator.generate_county(),
-            basin=self.oil_gas_generator.generate_basin(),
+            state=oil_gas_generator.generate_state(),
+            county=oil_gas_generator.generate_county(),
+            basin=oil_gas_generator.generate_basin(),
             created_timestamp=created_dt,
-            created_by=f"USER-{random.randint(100, 999)}",
-            last_modified=created_dt
+            created_by=f"USER-{stream.rng.randint(100, 999)}",
+            last_modified=created_dt,
         )
 
         # Update counters
-        self._counter += 1
-        if self._counter % 50 == 0:
-            self._journal_batch += 1
+        stream.advance()
 
         return gl_record
 
@@ -208,93 +925,167 @@ class GLDataStreamer:
             interval_seconds: Time between records in seconds (default 1.0)
         """
         # Historical records are already pre-loaded, start generating new records immediately
-        # Start from FIXED_START_DATETIME (after historical batch)
-        # Start from FIXED_START_DATETIME (after historical batch)
-        record_number = len(self._historical_batch)
-        current_datetime = self.FIXED_START_DATETIME
+        # Start from FIXED_START_DATETIME (after historical batch), or where a checkpoint left off
+        current_datetime = self._live_datetime
 
-        # Temporarily replace generators' random with our seeded RNG
-        original_random = random.random
-        original_choice = random.choice
-        original_uniform = random.uniform
-        original_randint = random.randint
-
-        # Monkey-patch random functions to use our seeded RNG
-        random.random = self._deterministic_rng.random
-        random.choice = self._deterministic_rng.choice
-        random.uniform = self._deterministic_rng.uniform
-        random.randint = self._deterministic_rng.randint
-
-        try:
-            while True:
-                await asyncio.sleep(interval_seconds)
+        while True:
+            await asyncio.sleep(interval_seconds)
 
-                # Calculate transaction datetime deterministically: one record per second
-                transaction_date = current_datetime.date()
+            # Calculate transaction datetime deterministically: one record per second
+            transaction_date = current_datetime.date()
 
+            if self._counter_based:
+                gl_record = self._generate_by_ids(
+                    self._stream.counter + 1, self._stream.counter + 1
+                )[0]
+                self._stream.advance()
+            else:
                 gl_record = self._generate_gl_record(
+                    self._stream,
                     transaction_date=transaction_date,
-                    transaction_datetime=current_datetime
+                    transaction_datetime=current_datetime,
                 )
 
-                # Increment current records counter
-                self._current_records_count += 1
-                self._total_streamed_count += 1
+            # Increment current records counter
+            self._current_records_count += 1
+            self._total_streamed_count += 1
 
-                # Store in buffer
-                async with self._buffer_lock:
-                    self._record_buffer.append(gl_record)
+            # Encode once, then store in buffer
+            encoded = encode_record(gl_record)
+            async with self._buffer_lock:
+                self._buffer_record(gl_record, encoded)
+                await self._publish_shared()
+            self._broadcaster.publish(len(self._record_buffer))
 
-                # Move to next second (deterministic progression)
-                current_datetime += timedelta(seconds=1)
-                record_number += 1
-        finally:
-            # Restore original random functions
-            random.random = original_random
-            random.choice = original_choice
-            random.uniform = original_uniform
-            random.randint = original_randint
+            # Move to next second (deterministic progression)
+            current_datetime += timedelta(seconds=1)
+            self._live_datetime = current_datetime
+            await self._checkpoint()
 
-    async def stream_with_instant_buffer(self, interval_seconds: float = 30.0) -> AsyncGenerator[bytes]:
+    async def background_generate_load(self, records_per_second: float, tick_seconds: float = 0.1):
         """
-        Stream GL records: first sends all buffered records instantly as JSON, then streams new ones.
+        Background task that generates records in batches at a target rate, for load testing.
 
-        First sends all buffered records (historical + any new) as a single JSON array,
-        then continues streaming new records as they're generated. All records are deterministic
-        based on the fixed start date and seeded RNG.
+        Every tick_seconds a batch of the records due since the task started is generated
+        with the vectorized counter-based generator, so each record is a pure function of
+        (seed, gl_entry_id) and the output is the same however it is batched. Timestamps
+        follow the intraday layout of records_per_day. Generation and encoding run in a
+        worker thread; if they fall more than ten ticks behind, the backlog is logged and
+        skipped rather than generated.
 
         Args:
-            interval_seconds: Time between records in seconds (default 1.0)
+            records_per_second: Target generation rate
+            tick_seconds: Time between batches in seconds
+
+        Raises:
+            ConfigurationError: If the streamer was created without records_per_day
         """
-        # First, send all buffered records instantly as JSON
-        async with self._buffer_lock:
-            buffered_records = self._record_buffer.copy()
-            last_buffer_size = len(self._record_buffer)
+        if not self._records_per_day:
+            raise ConfigurationError(
+                "Load generation requires records_per_day",
+                {"records_per_day": self._records_per_day},
+            )
+
+        # Never generate more than ten ticks' worth at once, so one batch cannot stall clients
+        max_batch = max(int(records_per_second * tick_seconds), 1) * 10
+        started = next_tick = time.monotonic()
+        emitted = 0
+        while True:
+            next_tick += tick_seconds
+            await asyncio.sleep(max(next_tick - time.monotonic(), 0))
+
+            now = time.monotonic()
+            count = int((now - started) * records_per_second) - emitted
+            if count > max_batch:
+                # Drop the backlog rather than fall further and further behind
+                logger.warning(
+                    f"Load generation is {count - max_batch} records behind target, skipping them"
+                )
+                started += (count - max_batch) / records_per_second
+                count = max_batch
+            next_tick = max(next_tick, now - tick_seconds)
+            if count <= 0:
+                continue
+
+            first_id = self._stream.counter + 1
+            batch, encoded = await asyncio.to_thread(
+                self._generate_encoded_batch, first_id, first_id + count - 1
+            )
+            self._stream.counter += count
+            self._stream.journal_batch = (
+                self._stream.counter // GenerationStream.JOURNAL_BATCH_SIZE + 1
+            )
+            emitted += count
+
+            self._current_records_count += count
+            self._total_streamed_count += count
+            async with self._buffer_lock:
+                self._record_buffer.extend_batch(batch)
+                self._rollups.add_batch(batch)
+                self._encoded_log.extend(encoded)
+                self._encoded_log.drop_before(self._record_buffer.first_position)
+                await self._publish_shared()
+            self._broadcaster.publish(len(self._record_buffer))
+            await self._checkpoint()
+
+    def _generate_encoded_batch(
+        self, first_gl_entry_id: int, last_gl_entry_id: int
+    ) -> tuple[GLRecordBatch, list[bytes]]:
+        """Generate an ID range with the counter-based generator, plus each record's encoding."""
+        batch = self._generate_batch_by_ids(first_gl_entry_id, last_gl_entry_id)
+        return batch, [encode_record(gl_record) for gl_record in batch.to_records()]
+
+    async def stream_with_instant_buffer(
+        self, filters: dict[str, str] | None = None, chunk_records: int = STREAM_CHUNK_RECORDS
+    ) -> AsyncGenerator[bytes]:
+        """
+        Stream GL records: first sends all buffered records instantly as JSON, then streams new ones.
 
-        # Send all buffered records as a single JSON response
-        buffered_data = {
-            "type": "buffered_records",
-            "count": len(buffered_records),
-            "data": [record.to_dict() for record in buffered_records]
-        }
-        yield (json.dumps(buffered_data) + "\n").encode("utf-8")
+        First sends all buffered records (historical + any new) as a single JSON line,
+        then continues streaming new records as soon as they're generated. All records are
+        deterministic based on the fixed start date and seeded RNG.
 
-        # Then continue streaming new records as they're generated
-        while True:
-            await asyncio.sleep(interval_seconds)
+        The buffered_records line is written chunk_records records at a time from their
+        cached encodings, with its count after the data, so the first byte goes out
+        immediately and a client holds at most one chunk in memory. Each chunk waits for
+        the transport to accept the previous one, so slow clients are paced by backpressure.
 
-            async with self._buffer_lock:
-                current_buffer_size = len(self._record_buffer)
-                if current_buffer_size > last_buffer_size:
-                    # New records available, stream them
-                    for i in range(last_buffer_size, current_buffer_size):
-                        gl_record = self._record_buffer[i]
-                        new_record_data = {
-                            "type": "new_record",
-                            "data": gl_record.to_dict()
-                        }
-                        yield (json.dumps(new_record_data) + "\n").encode("utf-8")
-                    last_buffer_size = current_buffer_size
+        Args:
+            filters: Exact-match conditions on record fields; only matching records are sent
+            chunk_records: Maximum records encoded per chunk of the buffered_records line
+        """
+        filters = filters or {}
+        # First, send all buffered records as one JSON line, chunk by chunk
+        last_buffer_size = len(self._record_buffer)
+        count = 0
+        yield b'{"type": "buffered_records", "data": ['
+        for positions in self._chunk_positions(
+            self._record_buffer.first_position, last_buffer_size, filters, chunk_records
+        ):
+            if len(positions):
+                chunk = self._encode_array(positions)
+                yield EncodedRecordLog.SEPARATOR + chunk if count else chunk
+                count += len(positions)
+            else:
+                # Let other tasks run while a filter scans through a long backlog
+                await asyncio.sleep(0)
+        yield b'], "count": %d}\n' % count
+
+        # Then continue streaming new records as soon as they're generated
+        while True:
+            current_buffer_size = await self._broadcaster.wait(last_buffer_size)
+
+            # New records available, collect them (skipping any already evicted); nothing
+            # awaits between here and the yield, so no append can interleave with the read
+            positions = self._record_buffer.filter(last_buffer_size, current_buffer_size, **filters)
+            encoded_records = self._encode_positions(positions)
+            last_buffer_size = max(last_buffer_size, current_buffer_size)
+
+            # Send outside the lock so a slow client never blocks the generator
+            if encoded_records:
+                yield b"".join(
+                    b'{"type": "new_record", "data": %b}\n' % encoded for encoded in encoded_records
+                )
 
     async def stream(self, interval_seconds: float = 30.0) -> AsyncGenerator[bytes]:
         """
@@ -305,82 +1096,330 @@ class GLDataStreamer:
         based on the fixed start date and seeded RNG.
 
         Args:
-            interval_seconds: Time between records in seconds (default 1.0)
+            interval_seconds: Time between buffered records in seconds; new records are
+                sent as soon as they're generated
         """
         # First, stream all buffered records
         buffer_index = 0
         while True:
             async with self._buffer_lock:
+                # A slow reader that fell behind retention resumes at the oldest retained record
+                buffer_index = max(buffer_index, self._record_buffer.first_position)
                 if buffer_index < len(self._record_buffer):
-                    gl_record = self._record_buffer[buffer_index]
+                    encoded = self._encode_positions(np.array([buffer_index]))[0]
                     buffer_index += 1
                 else:
                     # No more buffered records, wait for new ones
                     break
 
             await asyncio.sleep(interval_seconds)
-            yield (json.dumps(gl_record.to_dict()) + "\n").encode("utf-8")
+            yield encoded + b"\n"
 
         # Then continue streaming new records as they're generated
         last_buffer_size = len(self._record_buffer)
         while True:
-            await asyncio.sleep(interval_seconds)
+            current_buffer_size = await self._broadcaster.wait(last_buffer_size)
 
-            async with self._buffer_lock:
-                current_buffer_size = len(self._record_buffer)
-                if current_buffer_size > last_buffer_size:
-                    # New records available, stream them
-                    for i in range(last_buffer_size, current_buffer_size):
-                        gl_record = self._record_buffer[i]
-                        yield (json.dumps(gl_record.to_dict()) + "\n").encode("utf-8")
-                    last_buffer_size = current_buffer_size
+            # New records available, collect them (skipping any already evicted)
+            first = max(last_buffer_size, self._record_buffer.first_position)
+            encoded_records = self._encode_positions(np.arange(first, current_buffer_size))
+            last_buffer_size = max(last_buffer_size, current_buffer_size)
+
+            # Send outside the lock so a slow client never blocks the generator
+            if encoded_records:
+                yield b"".join(encoded + b"\n" for encoded in encoded_records)
+
+    async def stream_since(
+        self,
+        after_gl_entry_id: int = 0,
+        filters: dict[str, str] | None = None,
+        chunk_records: int = STREAM_CHUNK_RECORDS,
+        heartbeat_seconds: float | None = None,
+    ) -> AsyncGenerator[tuple[np.ndarray, list[bytes]]]:
+        """
+        Stream records with a gl_entry_id after a resume point, then new ones as they arrive.
+
+        Buffered records after the resume point are sent first, chunk_records at a time,
+        then new records as soon as they're generated. A resume point older than the
+        retained records resumes at the oldest one.
+
+        Args:
+            after_gl_entry_id: Last gl_entry_id the client already has (0 for everything)
+            filters: Exact-match conditions on record fields; only matching records are sent
+            chunk_records: Maximum records per chunk
+            heartbeat_seconds: Yield an empty chunk after this long without new records
+                (default: never), so transports can send keep-alives
+
+        Yields:
+            Tuples of (gl_entry_ids, encoded records) in gl_entry_id order
+        """
+        filters = filters or {}
+        position = self._record_buffer.searchsorted("gl_entry_id", after_gl_entry_id, side="right")
+        while True:
+            stop = len(self._record_buffer)
+            if position >= stop:
+                stop = await self._broadcaster.wait(position, heartbeat_seconds)
+                if stop <= position:
+                    yield np.empty(0, dtype=np.int64), []
+                    continue
+
+            for positions in self._chunk_positions(position, stop, filters, chunk_records):
+                if len(positions):
+                    first = int(positions[0])
+                    gl_entry_ids = self._record_buffer.column(
+                        "gl_entry_id", first, int(positions[-1]) + 1
+                    )
+                    yield gl_entry_ids[positions - first], self._encode_positions(positions)
+                else:
+                    # Let other tasks run while a filter scans through a long backlog
+                    await asyncio.sleep(0)
+            position = stop
 
-    def get_buffered_records(self, limit: int = None) -> list[GLRecord]:
+    def get_buffered_records(
+        self, limit: int = None, filters: dict[str, str] | None = None
+    ) -> list[GLRecord]:
         """
-        Get buffered records (historical + any new records generated).
+        Get buffered records (historical + any new records generated), oldest retained first.
 
         Args:
             limit: Maximum number of records to return (if None, returns all)
+            filters: Exact-match conditions on record fields, e.g. {"basin": "Permian"}
 
         Returns:
             List of GLRecord objects from the buffer
         """
-        if limit is None:
-            return self._record_buffer.copy()
-        else:
-            return self._record_buffer[:limit]
+        return self._record_buffer.take(self._buffered_positions(limit, filters))
+
+    def _buffered_positions(self, limit: int | None, filters: dict[str, str] | None) -> np.ndarray:
+        """Positions of the first limit retained records matching filters."""
+        if filters:
+            return self._record_buffer.filter(**filters)[:limit]
+        start = self._record_buffer.first_position
+        stop = (
+            len(self._record_buffer)
+            if limit is None
+            else min(start + limit, len(self._record_buffer))
+        )
+        return np.arange(start, stop)
 
     def get_historical_range(
         self,
         start_date: datetime.date,
-        end_date: datetime.date
+        end_date: datetime.date,
+        filters: dict[str, str] | None = None,
     ) -> list[GLRecord]:
         """
         Get historical GL records within a date range from pre-generated batch.
 
-        Filters and returns records from the pre-generated historical batch that fall
-        within the specified date range.
+        Looks the range up in the date-sorted index of the pre-generated historical batch,
+        narrowed by the secondary indexes when filters are given. In counter-based mode the
+        matching records are generated on demand instead, covering the full
+        historical_days window in O(range).
 
         Args:
             start_date: Start date for the range (inclusive)
             end_date: End date for the range (inclusive)
+            filters: Exact-match conditions on indexed fields (basin, well_id, account_code,
+                fiscal_period)
 
         Returns:
-            List of GLRecord objects that fall within the date range
+            List of GLRecord objects that fall within the date range, ordered by date
         """
-        # Filter pre-generated records that fall within the date range
-        filtered_records = [
-            record for record in self._historical_batch
-            if start_date <= record.transaction_date <= end_date
-        ]
+        if self._counter_based:
+            return self._generate_historical_range(start_date, end_date, filters or {})
+        return self._record_buffer.take(
+            self._historical_positions(start_date, end_date, filters or {})
+        )
+
+    def select_records(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        filters: dict[str, str] | None = None,
+        limit: int | None = None,
+        after_gl_entry_id: int = 0,
+    ) -> RecordPage:
+        """
+        Select one page of records in gl_entry_id order, for paginated extraction.
+
+        With a date range the page comes from the historical batch (via its indexes, or
+        generated on demand in counter-based mode) followed by any buffered live records
+        in the range; otherwise from all buffered records.
+        Because gl_entry_id only grows, resuming after the last ID of a page never skips
+        or repeats a record, even while new records are being appended.
+
+        Args:
+            start_date: Start date for the range (inclusive, requires end_date)
+            end_date: End date for the range (inclusive)
+            filters: Exact-match conditions on record fields
+            limit: Maximum number of records in the page (if None, no limit)
+            after_gl_entry_id: Only records with a greater gl_entry_id (0 starts at the beginning)
+
+        Returns:
+            RecordPage to pass to encode_page_json or page_batch
+        """
+        filters = filters or {}
+        first = self._record_buffer.searchsorted("gl_entry_id", after_gl_entry_id, side="right")
+        fetch = None if limit is None else limit + 1
+        if start_date is not None and self._counter_based:
+            records = self._generate_historical_range(
+                start_date, end_date, filters, after_gl_entry_id, limit
+            )
+            if fetch is None or len(records) < fetch:
+                live = self._live_positions(
+                    first,
+                    start_date,
+                    end_date,
+                    filters,
+                    None if fetch is None else fetch - len(records),
+                )
+                records += self._record_buffer.take(live)
+            page = records[:limit]
+            return RecordPage(
+                records=page,
+                has_more=len(page) < len(records),
+                last_gl_entry_id=page[-1].gl_entry_id if page else None,
+            )
+
+        if start_date is not None:
+            positions = np.sort(self._historical_positions(start_date, end_date, filters))
+            positions = positions[positions >= first][:fetch]
+            if fetch is None or len(positions) < fetch:
+                live = self._live_positions(
+                    first,
+                    start_date,
+                    end_date,
+                    filters,
+                    None if fetch is None else fetch - len(positions),
+                )
+                positions = np.concatenate([positions, live])
+        elif filters:
+            positions = self._scan_positions(first, filters, fetch)
+        else:
+            stop = (
+                len(self._record_buffer)
+                if fetch is None
+                else min(first + fetch, len(self._record_buffer))
+            )
+            positions = np.arange(first, stop)
+
+        page = positions[:limit]
+        last_gl_entry_id = None
+        if len(page):
+            last_gl_entry_id = int(
+                self._record_buffer.column("gl_entry_id", int(page[-1]), int(page[-1]) + 1)[0]
+            )
+        return RecordPage(
+            positions=page, has_more=len(page) < len(positions), last_gl_entry_id=last_gl_entry_id
+        )
 
-        return filtered_records
+    def _live_positions(
+        self,
+        first: int,
+        start_date: date,
+        end_date: date,
+        filters: dict[str, str],
+        limit: int | None = None,
+    ) -> np.ndarray:
+        """First limit buffer positions from first on of live records in an inclusive date range."""
+        if end_date < self.FIXED_START_DATE:
+            # Live records are dated from FIXED_START_DATE on
+            return np.empty(0, dtype=np.int64)
+        return self._scan_positions(
+            max(first, self._historical_count), filters, limit, (start_date, end_date)
+        )
+
+    def _scan_positions(
+        self,
+        first: int,
+        filters: dict[str, str],
+        limit: int | None,
+        date_range: tuple[date, date] | None = None,
+    ) -> np.ndarray:
+        """
+        First limit buffer positions from first on matching filters and date_range.
+
+        The buffer is scanned PAGE_SCAN_RECORDS positions at a time and the scan stops as
+        soon as limit positions are found, so a page costs the same wherever its cursor lies.
+        """
+        found = []
+        count = 0
+        for positions in self._chunk_positions(
+            first, len(self._record_buffer), filters, PAGE_SCAN_RECORDS, date_range
+        ):
+            found.append(positions)
+            count += len(positions)
+            if limit is not None and count >= limit:
+                break
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(found)[:limit]
+
+    def is_historical_range(self, end_date: date) -> bool:
+        """
+        Whether a date range ending on end_date holds only historical records.
+
+        Such ranges never gain records, and only lose them to retention (see
+        get_evicted_historical_count).
+        """
+        return end_date < self.FIXED_START_DATE
+
+    def encode_page_json(self, page: RecordPage) -> bytes:
+        """Records of a page as a pre-encoded JSON array body (without brackets)."""
+        if page.positions is not None:
+            return self._encode_array(page.positions)
+        return EncodedRecordLog.SEPARATOR.join(encode_record(record) for record in page.records)
+
+    def page_batch(self, page: RecordPage) -> GLRecordBatch:
+        """Records of a page as columns, for Arrow/Parquet/CSV export."""
+        if page.positions is not None:
+            return self._record_buffer.take_batch(page.positions)
+        return GLRecordBatch.from_records(page.records)
+
+    def _historical_positions(
+        self, start_date: date, end_date: date, filters: dict[str, str]
+    ) -> np.ndarray:
+        """Buffer positions of retained historical records in a date range, ordered by date."""
+        positions = self._historical_index.lookup((start_date, end_date), **filters)
+        # Skip history that retention has already evicted from the buffer
+        return positions[positions >= self._record_buffer.first_position]
+
+    def _generate_historical_range(
+        self,
+        start_date: date,
+        end_date: date,
+        filters: dict[str, str],
+        after_gl_entry_id: int = 0,
+        limit: int | None = None,
+    ) -> list[GLRecord]:
+        """
+        Counter-based mode: generate the historical records in a date range on demand.
+
+        Without filters at most limit + 1 records are generated (enough to tell if more follow).
+        """
+        # Historical record N falls on history start + (N - 1) days
+        history_start = self._history_start_date()
+        first_day = max(start_date, history_start)
+        last_day = min(end_date, self.FIXED_START_DATE - timedelta(days=1))
+        first_id = max((first_day - history_start).days + 1, after_gl_entry_id + 1)
+        last_id = (last_day - history_start).days + 1
+        if limit is not None and not filters:
+            last_id = min(last_id, first_id + limit)
+        if first_id > last_id:
+            return []
+        records = self.get_records_by_id_range(first_id, last_id)
+        return [
+            record
+            for record in records
+            if all(getattr(record, name) == value for name, value in filters.items())
+        ]
 
     async def stream_historical_range(
         self,
         start_date: datetime.date,
         end_date: datetime.date,
-        interval_seconds: float = 1.0
+        interval_seconds: float = 1.0,
+        filters: dict[str, str] | None = None,
     ) -> AsyncGenerator[bytes]:
         """
         Stream historical GL records within a date range from pre-generated batch.
@@ -392,20 +1431,17 @@ class GLDataStreamer:
             start_date: Start date for the range (inclusive)
             end_date: End date for the range (inclusive)
             interval_seconds: Time between records in seconds (default 1.0)
+            filters: Exact-match conditions on indexed fields
         """
         # Get filtered records
-        filtered_records = self.get_historical_range(start_date, end_date)
+        filtered_records = self.get_historical_range(start_date, end_date, filters)
 
         # Stream the filtered records
         for gl_record in filtered_records:
             await asyncio.sleep(interval_seconds)
-            yield (json.dumps(gl_record.to_dict()) + "\n").encode("utf-8")
+            yield encode_record(gl_record) + b"\n"
 
-    def generate_historical_batch(
-        self,
-        days: int = 365,
-        start_date: date = None
-    ) -> list[GLRecord]:
+    def generate_historical_batch(self, days: int = 365, start_date: date = None) -> list[GLRecord]:
         """
         Generate a batch of historical GL records, one per day.
 
@@ -420,39 +1456,21 @@ class GLDataStreamer:
         if start_date is None:
             start_date = self.FIXED_START_DATE - timedelta(days=days)
 
-        # Temporarily replace generators' random with our seeded RNG
-        original_random = random.random
-        original_choice = random.choice
-        original_uniform = random.uniform
-        original_randint = random.randint
-
-        # Monkey-patch random functions to use our seeded RNG
-        random.random = self._deterministic_rng.random
-        random.choice = self._deterministic_rng.choice
-        random.uniform = self._deterministic_rng.uniform
-        random.randint = self._deterministic_rng.randint
+        # Independent stream per call: deterministic for the same arguments, safe to run
+        # concurrently (e.g. in a thread pool) and never advances the live stream
+        stream = GenerationStream(self._seed)
+        records = []
+        current_date = start_date
 
-        try:
-            records = []
-            current_date = start_date
-
-            for _i in range(days):
-                # Generate record with specific transaction date and datetime
-                transaction_datetime = datetime.combine(current_date, datetime.min.time())
-                gl_record = self._generate_gl_record(
-                    transaction_date=current_date,
-                    transaction_datetime=transaction_datetime
-                )
-                records.append(gl_record)
-
-                # Move to next day
-                current_date += timedelta(days=1)
+        for _i in range(days):
+            # Generate record with specific transaction date and datetime
+            transaction_datetime = datetime.combine(current_date, datetime.min.time())
+            gl_record = self._generate_gl_record(
+                stream, transaction_date=current_date, transaction_datetime=transaction_datetime
+            )
+            records.append(gl_record)
 
-            return records
-        finally:
-            # Restore original random functions
-            random.random = original_random
-            random.choice = original_choice
-            random.uniform = original_uniform
-            random.randint = original_randint
+            # Move to next day
+            current_date += timedelta(days=1)
 
+        return records
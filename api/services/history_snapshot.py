@@ -0,0 +1,127 @@
+"""Persistent snapshots of the generated historical batch, for fast startup."""
+
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from .record_store import STORE_FORMAT_VERSION
+
+# Bump when the snapshot layout or the generated records change; older snapshots are then
+# regenerated
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_STATE_NAME = "snapshot.json"
+
+
+def snapshot_key(
+    seed: int,
+    start_date: date,
+    historical_days: int,
+    counter_based: bool = False,
+    preload_days: int | None = None,
+) -> dict:
+    """Everything the generated history depends on; a snapshot is only reused if its key matches."""
+    return {
+        "snapshot_format": SNAPSHOT_FORMAT_VERSION,
+        "store_format": STORE_FORMAT_VERSION,
+        "seed": seed,
+        "start_date": start_date.isoformat(),
+        "historical_days": historical_days,
+        "counter_based": counter_based,
+        "preload_days": preload_days if counter_based else None,
+    }
+
+
+def snapshot_path(directory: str | Path, key: dict) -> Path:
+    """Directory of the snapshot for key (one per key, so differently configured runs coexist)."""
+    name = (
+        f"history-v{key['snapshot_format']}-seed{key['seed']}"
+        f"-{key['start_date']}-{key['historical_days']}d"
+    )
+    if key["counter_based"]:
+        name += f"-counter{key['preload_days']}"
+    return Path(directory) / name
+
+
+def rng_state_to_json(state: tuple) -> list:
+    """Convert random.Random.getstate() to JSON-serializable lists."""
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def rng_state_from_json(state: list) -> tuple:
+    """Inverse of rng_state_to_json, for random.Random.setstate()."""
+    version, internal, gauss_next = state
+    return (version, tuple(internal), gauss_next)
+
+
+@dataclass
+class HistorySnapshot:
+    """A valid snapshot on disk: the historical records plus the generator state after them."""
+
+    path: Path
+    historical_count: int
+    counter: int
+    journal_batch: int
+    rng_state: tuple
+    # Buffer position of the first record in the saved encoded-record cache
+    encoded_first_position: int
+
+
+def load_snapshot(path: str | Path, key: dict) -> HistorySnapshot | None:
+    """
+    Open the snapshot at path if it exists and was written for key.
+
+    Returns:
+        The snapshot, or None if it is missing, incomplete or for another key/version
+    """
+    path = Path(path)
+    try:
+        state = json.loads((path / SNAPSHOT_STATE_NAME).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if state.get("key") != key:
+        return None
+    return HistorySnapshot(
+        path=path,
+        historical_count=state["historical_count"],
+        counter=state["counter"],
+        journal_batch=state["journal_batch"],
+        rng_state=rng_state_from_json(state["rng_state"]),
+        encoded_first_position=state["encoded_first_position"],
+    )
+
+
+def write_snapshot(path: str | Path, key: dict, write_records, state: dict) -> bool:
+    """
+    Write a snapshot atomically: files go to a staging directory that is renamed into place.
+
+    Args:
+        path: Snapshot directory (from snapshot_path)
+        key: Snapshot key (from snapshot_key)
+        write_records: Callable that writes the records and encoded cache into a directory
+        state: historical_count, counter, journal_batch, rng_state (from rng_state_to_json)
+            and encoded_first_position
+
+    Returns:
+        True if written, False if another process published the snapshot first
+    """
+    path = Path(path)
+    staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    try:
+        write_records(staging)
+        # The state file is written last: a snapshot without it is never loaded
+        (staging / SNAPSHOT_STATE_NAME).write_text(json.dumps({"key": key, **state}))
+        if path.exists() and load_snapshot(path, key) is None:
+            # Stale snapshot for an older version of the same key
+            shutil.rmtree(path, ignore_errors=True)
+        os.rename(staging, path)
+        return True
+    except OSError:
+        return False
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
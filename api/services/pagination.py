@@ -0,0 +1,63 @@
+"""Opaque cursors and result pages for paginated record extraction."""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+import numpy as np
+from core.exceptions import InvalidCursorError
+from core.models import GLRecord
+
+# Bump when the cursor payload changes; older cursors are then rejected
+CURSOR_VERSION = 1
+
+
+def encode_cursor(after_gl_entry_id: int) -> str:
+    """Encode a resume point (last gl_entry_id returned) as an opaque URL-safe token."""
+    payload = json.dumps(
+        {"v": CURSOR_VERSION, "after": int(after_gl_entry_id)}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a token from encode_cursor back to the gl_entry_id to resume after.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or from another cursor version
+    """
+    try:
+        padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["v"] != CURSOR_VERSION or int(payload["after"]) < 0:
+            raise ValueError("unsupported cursor")
+        return int(payload["after"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor", {"cursor": cursor}) from e
+
+
+@dataclass
+class RecordPage:
+    """
+    One page of records ordered by gl_entry_id.
+
+    Holds either buffer positions (records still to be read from the buffer) or records
+    generated on demand, plus what the caller needs to ask for the next page.
+    """
+
+    positions: np.ndarray | None = None
+    records: list[GLRecord] | None = None
+    has_more: bool = False
+    last_gl_entry_id: int | None = None
+
+    def __len__(self) -> int:
+        """Number of records in the page."""
+        return len(self.positions) if self.positions is not None else len(self.records or [])
+
+    def next_cursor(self, after_gl_entry_id: int) -> str:
+        """Cursor for the following page (resumes at the same point when the page is empty)."""
+        return encode_cursor(
+            self.last_gl_entry_id if self.last_gl_entry_id is not None else after_gl_entry_id
+        )
@@ -0,0 +1,127 @@
+"""Cache of GL records pre-encoded as JSON bytes."""
+
+from pathlib import Path
+
+import numpy as np
+from core.models import GLRecord
+
+DEFAULT_CACHE_RECORDS = 100_000
+
+
+def encode_record(record: GLRecord) -> bytes:
+    """Encode a record as compact JSON bytes (same content as record.to_dict())."""
+    return record.to_json()
+
+
+class EncodedRecordLog:
+    """
+    Append-only log of encoded records addressed by buffer position.
+
+    Entries are stored back to back in one buffer, each followed by SEPARATOR, so the
+    JSON array body for any contiguous run of positions is a single slice of the buffer
+    - the snapshot of all cached records grows with each append instead of being
+    re-encoded per client. Only the most recent max_records entries are kept; older
+    positions must be encoded again by the caller.
+    """
+
+    SEPARATOR = b","
+
+    def __init__(self, first_position: int = 0, max_records: int = DEFAULT_CACHE_RECORDS):
+        """
+        Initialize an empty log.
+
+        Args:
+            first_position: Buffer position of the first entry that will be appended
+            max_records: Maximum number of entries to keep (oldest are dropped in chunks)
+        """
+        self._heap = bytearray()
+        # Start offset of each entry in the heap, plus the end of the last one
+        self._offsets = [0]
+        self._first_position = first_position
+        self._max_records = max(max_records, 1)
+
+    @property
+    def first_position(self) -> int:
+        """Buffer position of the oldest cached entry."""
+        return self._first_position
+
+    @property
+    def stop(self) -> int:
+        """Buffer position after the newest cached entry."""
+        return self._first_position + len(self._offsets) - 1
+
+    def append(self, encoded: bytes):
+        """Append the encoding of the record at position stop."""
+        self._heap += encoded
+        self._heap += self.SEPARATOR
+        self._offsets.append(len(self._heap))
+        if len(self._offsets) - 1 > self._max_records:
+            # Drop in chunks so trimming costs O(1) amortized per append
+            self.drop_before(self.stop - self._max_records // 2)
+
+    def extend(self, encoded_records: list[bytes]):
+        """Append the encodings of consecutive records starting at position stop."""
+        if not encoded_records:
+            return
+        base = len(self._heap)
+        self._heap += self.SEPARATOR.join(encoded_records)
+        self._heap += self.SEPARATOR
+        lengths = np.fromiter(
+            (len(encoded) for encoded in encoded_records), np.int64, len(encoded_records)
+        )
+        self._offsets.extend((base + np.cumsum(lengths + len(self.SEPARATOR))).tolist())
+        if len(self._offsets) - 1 > self._max_records:
+            self.drop_before(self.stop - self._max_records // 2)
+
+    def drop_before(self, position: int):
+        """Discard entries before position (e.g. records evicted from the buffer)."""
+        count = min(max(position - self._first_position, 0), len(self._offsets) - 1)
+        if not count:
+            return
+        base = self._offsets[count]
+        del self._heap[:base]
+        self._offsets = [offset - base for offset in self._offsets[count:]]
+        self._first_position += count
+
+    def get(self, position: int) -> bytes:
+        """Encoded record at position."""
+        index = position - self._first_position
+        return bytes(
+            self._heap[self._offsets[index] : self._offsets[index + 1] - len(self.SEPARATOR)]
+        )
+
+    def span(self, start: int, stop: int) -> bytes:
+        """JSON array body (entries joined by SEPARATOR) for cached positions [start, stop)."""
+        if stop <= start:
+            return b""
+        first, last = start - self._first_position, stop - self._first_position
+        return bytes(self._heap[self._offsets[first] : self._offsets[last] - len(self.SEPARATOR)])
+
+    def contains(self, positions: np.ndarray) -> np.ndarray:
+        """Mask of positions that are cached."""
+        return (positions >= self._first_position) & (positions < self.stop)
+
+    def save(self, directory: str | Path):
+        """Write the cached entries to directory (see load)."""
+        directory = Path(directory)
+        (directory / "encoded.heap").write_bytes(self._heap)
+        np.save(directory / "encoded.offsets.npy", np.asarray(self._offsets, dtype=np.int64))
+
+    @classmethod
+    def load(
+        cls, directory: str | Path, first_position: int, max_records: int = DEFAULT_CACHE_RECORDS
+    ) -> "EncodedRecordLog":
+        """
+        Read entries written by save().
+
+        Args:
+            directory: Directory written by save()
+            first_position: Buffer position of the first saved entry
+            max_records: Maximum number of entries to keep (the oldest saved ones are dropped)
+        """
+        directory = Path(directory)
+        log = cls(first_position, max_records)
+        log._heap = bytearray((directory / "encoded.heap").read_bytes())
+        log._offsets = np.load(directory / "encoded.offsets.npy").tolist()
+        log.drop_before(log.stop - log._max_records)
+        return log
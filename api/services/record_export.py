@@ -0,0 +1,119 @@
+"""Columnar export formats (Arrow IPC, Parquet, CSV) for GL record batches."""
+
+from collections.abc import Iterator
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from core.models import GL_NULLABLE_FIELDS, GL_RECORD_FIELDS, GLRecordBatch
+
+# Rows per Arrow record batch / Parquet row group / CSV chunk when streaming
+EXPORT_CHUNK_ROWS = 65_536
+
+# Media type for each supported output format
+FORMAT_MEDIA_TYPES = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv",
+}
+
+_ARROW_TYPES = {
+    "gl_entry_id": pa.int64(),
+    "transaction_date": pa.date32(),
+    "posting_date": pa.date32(),
+    "debit_amount": pa.float64(),
+    "credit_amount": pa.float64(),
+    "net_amount": pa.float64(),
+    "fiscal_year": pa.int32(),
+    "fiscal_month": pa.int32(),
+    "created_timestamp": pa.timestamp("us"),
+    "last_modified": pa.timestamp("us"),
+}
+
+# Arrow schema of exported GL records (field order matches the JSON records)
+GL_ARROW_SCHEMA = pa.schema(
+    [
+        pa.field(name, _ARROW_TYPES.get(name, pa.string()), nullable=name in GL_NULLABLE_FIELDS)
+        for name in GL_RECORD_FIELDS
+    ]
+)
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def batch_to_arrow(batch: GLRecordBatch) -> pa.Table:
+    """Convert a GLRecordBatch to an Arrow table with GL_ARROW_SCHEMA."""
+    arrays = []
+    for field in GL_ARROW_SCHEMA:
+        values = batch.columns[field.name]
+        mask = values == "" if field.name in GL_NULLABLE_FIELDS else None
+        arrays.append(pa.array(values, type=field.type, mask=mask))
+    return pa.Table.from_arrays(arrays, schema=GL_ARROW_SCHEMA)
+
+
+def iter_encoded(
+    table: pa.Table, output_format: str, chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """
+    Encode a table chunk by chunk, yielding bytes as soon as each chunk is written.
+
+    Args:
+        table: Records to encode
+        output_format: "arrow" (IPC stream), "parquet" or "csv"
+        chunk_rows: Rows per record batch, row group or CSV chunk
+
+    Raises:
+        ValueError: If output_format is not a columnar format
+    """
+    sink = _ChunkSink()
+    if output_format == "arrow":
+        writer = pa.ipc.new_stream(sink, table.schema)
+    elif output_format == "parquet":
+        writer = pq.ParquetWriter(sink, table.schema)
+    elif output_format == "csv":
+        writer = pa_csv.CSVWriter(sink, table.schema)
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    with writer:
+        for batch in table.to_batches(max_chunksize=chunk_rows):
+            if output_format == "parquet":
+                writer.write_table(pa.Table.from_batches([batch], schema=table.schema))
+            else:
+                writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # End-of-stream marker / Parquet footer
+    tail = sink.drain()
+    if tail:
+        yield tail
@@ -0,0 +1,98 @@
+"""Lookup indexes over an immutable range of buffered GL records."""
+
+from datetime import date
+
+import numpy as np
+
+from .segment_store import TieredRecordStore
+
+# Fields that get a secondary (value -> positions) index
+INDEXED_FIELDS = ("basin", "well_id", "account_code", "fiscal_period")
+
+
+class RecordIndex:
+    """
+    Date-sorted index plus secondary indexes over buffer positions [start, stop).
+
+    Transaction dates are kept sorted alongside their buffer positions, so a date range
+    is two binary searches instead of a scan. Each secondary index maps a field value to
+    the sorted positions holding it; equality filters intersect those with the date hits.
+    The indexed range must not change after the index is built (e.g. historical records).
+    """
+
+    def __init__(
+        self,
+        store: TieredRecordStore,
+        start: int = 0,
+        stop: int | None = None,
+        fields: tuple[str, ...] = INDEXED_FIELDS,
+    ):
+        """
+        Build the indexes.
+
+        Args:
+            store: Record store holding the records
+            start: First buffer position to index
+            stop: Position to stop before (default: end of store)
+            fields: Categorical fields to build secondary indexes for
+        """
+        dates = store.column("transaction_date", start, stop)
+        start = max(start, store.first_position)
+        order = np.argsort(dates, kind="stable")
+        self._dates = dates[order]
+        self._positions = order.astype(np.int64) + start
+        self._secondary = {
+            field: self._group(store.column(field, start, stop), start) for field in fields
+        }
+
+    @staticmethod
+    def _group(values: np.ndarray, start: int) -> dict[str, np.ndarray]:
+        """Map each distinct value to the sorted positions holding it."""
+        order = np.argsort(values, kind="stable")
+        ordered = values[order]
+        boundaries = np.flatnonzero(ordered[1:] != ordered[:-1]) + 1
+        return {
+            group_values[0]: positions + start
+            for group_values, positions in zip(
+                np.split(ordered, boundaries),
+                np.split(order.astype(np.int64), boundaries),
+                strict=True,
+            )
+            if len(group_values)
+        }
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Fields with a secondary index."""
+        return tuple(self._secondary)
+
+    def lookup(self, date_range: tuple[date, date] | None = None, **equals: str) -> np.ndarray:
+        """
+        Find positions matching an inclusive date range and exact field values.
+
+        Args:
+            date_range: Inclusive (start_date, end_date) bound on transaction_date
+            **equals: Exact-match conditions on indexed fields
+
+        Returns:
+            Matching positions ordered by transaction_date (then position)
+
+        Raises:
+            ValueError: If a condition names a field without a secondary index
+        """
+        positions = self._positions
+        if date_range is not None:
+            first, last = (np.datetime64(day, "D") for day in date_range)
+            positions = positions[
+                np.searchsorted(self._dates, first, side="left") : np.searchsorted(
+                    self._dates, last, side="right"
+                )
+            ]
+        for name, value in equals.items():
+            if name not in self._secondary:
+                raise ValueError(f"No index on field '{name}'")
+            matches = self._secondary[name].get(value)
+            if matches is None:
+                return np.empty(0, dtype=np.int64)
+            positions = positions[np.isin(positions, matches, assume_unique=True)]
+        return positions
@@ -0,0 +1,493 @@
+"""Columnar (struct-of-arrays) storage for GL records."""
+
+import json
+import mmap
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from core.models import GL_NULLABLE_FIELDS, GL_RECORD_FIELDS, GLRecord, GLRecordBatch
+
+# Day 0 of the int32 date columns and microsecond 0 of the int64 timestamp columns
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH_DATETIME = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Fixed-width columns: stored dtype per field
+NUMERIC_COLUMNS = {
+    "gl_entry_id": np.int64,
+    "transaction_date": np.int32,  # days since 1970-01-01
+    "posting_date": np.int32,  # days since 1970-01-01
+    "debit_amount": np.float64,
+    "credit_amount": np.float64,
+    "net_amount": np.float64,
+    "fiscal_year": np.int16,
+    "fiscal_month": np.int8,
+    "created_timestamp": np.int64,  # microseconds since 1970-01-01
+    "last_modified": np.int64,  # microseconds since 1970-01-01
+}
+DATE_COLUMNS = ("transaction_date", "posting_date")
+TIMESTAMP_COLUMNS = ("created_timestamp", "last_modified")
+
+# Low-cardinality text: dictionary-encoded
+CATEGORICAL_COLUMNS = (
+    "journal_batch",
+    "account_code",
+    "account_name",
+    "account_type",
+    "well_id",
+    "lease_name",
+    "cost_center",
+    "journal_source",
+    "transaction_type",
+    "fiscal_period",
+    "state",
+    "county",
+    "basin",
+    "created_by",
+)
+
+# High-cardinality text: UTF-8 heap plus offsets
+TEXT_COLUMNS = (
+    "journal_entry",
+    "property_id",
+    "afe_number",
+    "jib_number",
+    "description",
+)
+
+INITIAL_CAPACITY = 1024
+
+# Bump when the on-disk layout written by ColumnarRecordStore.save changes
+STORE_FORMAT_VERSION = 1
+
+
+class CategoricalColumn:
+    """Dictionary-encoded text column: each distinct value is stored once."""
+
+    def __init__(self, capacity: int):
+        self.values: list[str | None] = []
+        self._codes_by_value: dict[str | None, int] = {}
+        self.codes = np.zeros(capacity, dtype=np.uint32)
+
+    def encode(self, value: str | None) -> int:
+        """Get the code for a value, adding it to the dictionary if new."""
+        code = self._codes_by_value.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes_by_value[value] = code
+        return code
+
+    def lookup(self, value: str | None) -> int | None:
+        """Get the code for a value without adding it (None if never seen)."""
+        return self._codes_by_value.get(value)
+
+    def resize(self, capacity: int):
+        """Grow the code array."""
+        self.codes = np.resize(self.codes, capacity)
+
+    def set_many(self, start: int, values: np.ndarray, nullable: bool = False):
+        """Encode an array of strings into positions start..start+len(values)."""
+        uniques, inverse = np.unique(values, return_inverse=True)
+        codes = np.array(
+            [self.encode((value or None) if nullable else value) for value in uniques.tolist()],
+            dtype=np.uint32,
+        )
+        self.codes[start : start + len(values)] = codes[inverse]
+
+    def take(self, positions: np.ndarray) -> list[str | None]:
+        """Decode values at the given positions."""
+        values = self.values
+        return [values[code] for code in self.codes[positions].tolist()]
+
+    def compacted(self, start: int, stop: int) -> tuple[np.ndarray, list[str | None]]:
+        """Re-encode rows [start, stop) against a dictionary of only the values they use."""
+        used, codes = np.unique(self.codes[start:stop], return_inverse=True)
+        return codes.astype(np.uint32), [self.values[code] for code in used.tolist()]
+
+    def reset(self, codes: np.ndarray, values: list[str | None], capacity: int):
+        """Replace codes and dictionary (codes must refer to values)."""
+        self.values = values
+        self._codes_by_value = {value: code for code, value in enumerate(values)}
+        self.codes = np.resize(codes, capacity) if capacity != len(codes) else codes
+
+    def nbytes(self, length: int) -> int:
+        """Approximate bytes used by codes and dictionary for the first length rows."""
+        return self.codes[:length].nbytes + sum(len(value or "") + 8 for value in self.values)
+
+
+class TextColumn:
+    """High-cardinality text column: values packed into one UTF-8 buffer with offsets."""
+
+    def __init__(self, capacity: int):
+        self.heap = bytearray()
+        self.offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self.nulls = np.zeros(capacity, dtype=bool)
+
+    def resize(self, capacity: int):
+        """Grow the offset and null arrays."""
+        self.offsets = np.resize(self.offsets, capacity + 1)
+        self.nulls = np.resize(self.nulls, capacity)
+
+    def set(self, position: int, value: str | None):
+        """Append a value at position (positions must be filled in order)."""
+        self.nulls[position] = value is None
+        if value:
+            self.heap += value.encode("utf-8")
+        self.offsets[position + 1] = len(self.heap)
+
+    def set_many(self, start: int, values: np.ndarray, nullable: bool = False):
+        """Append an array of strings at positions start..start+len(values)."""
+        encoded = np.strings.encode(values, "utf-8")
+        lengths = np.strings.str_len(encoded)
+        width = encoded.dtype.itemsize
+        if width:
+            # Drop the fixed-width padding to pack values back to back
+            matrix = np.frombuffer(encoded.tobytes(), dtype=np.uint8).reshape(len(values), width)
+            self.heap += matrix[np.arange(width) < lengths[:, None]].tobytes()
+        count = len(values)
+        self.offsets[start + 1 : start + count + 1] = self.offsets[start] + np.cumsum(lengths)
+        self.nulls[start : start + count] = (lengths == 0) if nullable else False
+
+    def get(self, position: int) -> str | None:
+        """Decode the value at position."""
+        if self.nulls[position]:
+            return None
+        return self.heap[self.offsets[position] : self.offsets[position + 1]].decode("utf-8")
+
+    def drop_front(self, count: int, length: int):
+        """Discard the first count of length rows, rebasing offsets to the new first row."""
+        first, last = int(self.offsets[count]), int(self.offsets[length])
+        self.heap = bytearray(self.heap[first:last])
+        self.offsets[: length - count + 1] = self.offsets[count : length + 1] - first
+        self.nulls[: length - count] = self.nulls[count:length]
+
+    def take(self, positions: np.ndarray) -> list[str | None]:
+        """Decode values at the given positions."""
+        heap, offsets, nulls = self.heap, self.offsets, self.nulls
+        return [
+            None if nulls[i] else heap[offsets[i] : offsets[i + 1]].decode("utf-8")
+            for i in positions.tolist()
+        ]
+
+    def nbytes(self, length: int) -> int:
+        """Bytes used by heap, offsets and null flags for the first length rows."""
+        return (
+            int(self.offsets[length])
+            + self.offsets[: length + 1].nbytes
+            + self.nulls[:length].nbytes
+        )
+
+
+class ColumnarRecordStore:
+    """
+    Append-only, struct-of-arrays store for GL records.
+
+    Numeric and date fields live in typed NumPy arrays, low-cardinality strings are
+    dictionary-encoded and high-cardinality strings are packed into a UTF-8 heap, which
+    takes several times fewer bytes per record than a list of GLRecord instances.
+    Rows are addressed by position (insertion order) and materialized as GLRecord on read.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        """
+        Initialize an empty store.
+
+        Args:
+            capacity: Initial number of rows to allocate (grows by doubling)
+        """
+        self._length = 0
+        self._capacity = max(capacity, 1)
+        self._read_only = False
+        self._numeric = {
+            name: np.zeros(self._capacity, dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()
+        }
+        self._categorical = {
+            name: CategoricalColumn(self._capacity) for name in CATEGORICAL_COLUMNS
+        }
+        self._text = {name: TextColumn(self._capacity) for name in TEXT_COLUMNS}
+
+    def __len__(self) -> int:
+        """Number of records stored."""
+        return self._length
+
+    def _reserve(self, count: int):
+        """Make room for count more rows."""
+        if self._read_only:
+            raise ValueError("Record store is read-only")
+        required = self._length + count
+        if required <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        for name, array in self._numeric.items():
+            self._numeric[name] = np.resize(array, capacity)
+        for column in (*self._categorical.values(), *self._text.values()):
+            column.resize(capacity)
+        self._capacity = capacity
+
+    def append(self, record: GLRecord):
+        """Append a single record."""
+        self._reserve(1)
+        position = self._length
+        for name in NUMERIC_COLUMNS:
+            value = getattr(record, name)
+            if name in DATE_COLUMNS:
+                value = value.toordinal() - EPOCH_ORDINAL
+            elif name in TIMESTAMP_COLUMNS:
+                value = (value - EPOCH_DATETIME) // ONE_MICROSECOND
+            self._numeric[name][position] = value
+        for name, column in self._categorical.items():
+            column.codes[position] = column.encode(getattr(record, name))
+        for name, column in self._text.items():
+            column.set(position, getattr(record, name))
+        self._length += 1
+
+    def extend(self, records: Iterable[GLRecord]):
+        """Append records one by one."""
+        for record in records:
+            self.append(record)
+
+    def extend_batch(self, batch: GLRecordBatch):
+        """Append a columnar batch without materializing GLRecord instances."""
+        count = len(batch)
+        self._reserve(count)
+        start, stop = self._length, self._length + count
+        columns = batch.columns
+        for name in NUMERIC_COLUMNS:
+            values = columns[name]
+            if name in DATE_COLUMNS:
+                values = values.astype("datetime64[D]").astype(np.int64)
+            elif name in TIMESTAMP_COLUMNS:
+                values = values.astype("datetime64[us]").astype(np.int64)
+            self._numeric[name][start:stop] = values
+        for name, column in self._categorical.items():
+            column.set_many(start, columns[name], nullable=name in GL_NULLABLE_FIELDS)
+        for name, column in self._text.items():
+            column.set_many(start, columns[name], nullable=name in GL_NULLABLE_FIELDS)
+        self._length = stop
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        Get a read-only view of a fixed-width or categorical column.
+
+        Dates are returned as datetime64[D], timestamps as datetime64[us] and categorical
+        columns as decoded object arrays (copies); other numeric columns are zero-copy views.
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        if name in self._categorical:
+            column = self._categorical[name]
+            return np.array(column.values, dtype=object)[column.codes[start:stop]]
+        values = self._numeric[name][start:stop]
+        if name in DATE_COLUMNS:
+            return values.astype("datetime64[D]")
+        if name in TIMESTAMP_COLUMNS:
+            return values.astype("datetime64[us]")
+        view = values.view()
+        view.flags.writeable = False
+        return view
+
+    def searchsorted(self, name: str, value: int, side: str = "left") -> int:
+        """Binary-search a numeric column that is sorted by position (e.g. gl_entry_id)."""
+        return int(np.searchsorted(self._numeric[name][: self._length], value, side=side))
+
+    def filter(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        date_range: tuple[date, date] | None = None,
+        **equals: str,
+    ) -> np.ndarray:
+        """
+        Find positions of records matching all given predicates.
+
+        Args:
+            start: First position to consider
+            stop: Position to stop before (default: end of store)
+            date_range: Inclusive (start_date, end_date) bound on transaction_date
+            **equals: Exact-match conditions on categorical or gl_entry_id columns
+
+        Returns:
+            Sorted array of matching positions
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        mask = np.ones(max(stop - start, 0), dtype=bool)
+        if date_range is not None:
+            days = self._numeric["transaction_date"][start:stop]
+            first, last = (day.toordinal() - EPOCH_ORDINAL for day in date_range)
+            mask &= (days >= first) & (days <= last)
+        for name, value in equals.items():
+            if name in self._categorical:
+                column = self._categorical[name]
+                code = column.lookup(value)
+                if code is None:
+                    return np.empty(0, dtype=np.int64)
+                mask &= column.codes[start:stop] == code
+            else:
+                mask &= self._numeric[name][start:stop] == value
+        return np.flatnonzero(mask) + start
+
+    def get(self, position: int) -> GLRecord:
+        """Materialize the record at position."""
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("record position out of range")
+        return self.take(np.array([position]))[0]
+
+    def slice(self, start: int = 0, stop: int | None = None) -> list[GLRecord]:
+        """Materialize records in positions [start, stop)."""
+        stop = self._length if stop is None else min(stop, self._length)
+        return self.take(np.arange(start, max(stop, start)))
+
+    def take(self, positions: np.ndarray) -> list[GLRecord]:
+        """Materialize records at the given positions, in order."""
+        positions = np.asarray(positions, dtype=np.int64)
+        values = {}
+        for name, array in self._numeric.items():
+            selected = array[positions]
+            if name in DATE_COLUMNS:
+                selected = selected.astype("datetime64[D]")
+            elif name in TIMESTAMP_COLUMNS:
+                selected = selected.astype("datetime64[us]")
+            values[name] = selected.tolist()
+        for name, column in (*self._categorical.items(), *self._text.items()):
+            values[name] = column.take(positions)
+        return [
+            GLRecord(*row) for row in zip(*(values[name] for name in GL_RECORD_FIELDS), strict=True)
+        ]
+
+    def take_batch(self, positions: np.ndarray) -> GLRecordBatch:
+        """Gather records at the given positions into a GLRecordBatch without GLRecord instances."""
+        positions = np.asarray(positions, dtype=np.int64)
+        columns = {}
+        for name, array in self._numeric.items():
+            selected = array[positions]
+            if name in DATE_COLUMNS:
+                selected = selected.astype("datetime64[D]")
+            elif name in TIMESTAMP_COLUMNS:
+                selected = selected.astype("datetime64[us]")
+            columns[name] = selected
+        for name, column in self._categorical.items():
+            values = np.array([value or "" for value in column.values] or [""], dtype=str)
+            columns[name] = values[column.codes[positions]]
+        for name, column in self._text.items():
+            columns[name] = np.array([value or "" for value in column.take(positions)], dtype=str)
+        return GLRecordBatch(columns=columns)
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the stored records."""
+        length = self._length
+        return (
+            sum(array[:length].nbytes for array in self._numeric.values())
+            + sum(column.nbytes(length) for column in self._categorical.values())
+            + sum(column.nbytes(length) for column in self._text.values())
+        )
+
+    def drop_front(self, count: int):
+        """
+        Discard the oldest count records, shifting the rest to position 0.
+
+        Dictionaries are rebuilt from the remaining rows so evicted values do not linger.
+        """
+        if self._read_only:
+            raise ValueError("Record store is read-only")
+        count = min(count, self._length)
+        remaining = self._length - count
+        for array in self._numeric.values():
+            array[:remaining] = array[count : self._length]
+        for column in self._categorical.values():
+            codes, values = column.compacted(count, self._length)
+            column.reset(codes, values, self._capacity)
+        for column in self._text.values():
+            column.drop_front(count, self._length)
+        self._length = remaining
+
+    def save(self, directory: str | Path, start: int = 0, stop: int | None = None) -> int:
+        """
+        Write records in positions [start, stop) to a directory that load() can memory-map.
+
+        Fixed-width columns and categorical codes become .npy files, text columns a raw
+        UTF-8 heap plus offsets, and dictionaries go into manifest.json.
+
+        Returns:
+            Number of bytes written
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stop = self._length if stop is None else min(stop, self._length)
+        manifest = {
+            "format_version": STORE_FORMAT_VERSION,
+            "length": stop - start,
+            "categories": {},
+        }
+
+        for name, array in self._numeric.items():
+            np.save(directory / f"{name}.npy", array[start:stop])
+        for name, column in self._categorical.items():
+            codes, values = column.compacted(start, stop)
+            np.save(directory / f"{name}.codes.npy", codes)
+            manifest["categories"][name] = values
+        for name, column in self._text.items():
+            first, last = int(column.offsets[start]), int(column.offsets[stop])
+            (directory / f"{name}.heap").write_bytes(column.heap[first:last])
+            np.save(directory / f"{name}.offsets.npy", column.offsets[start : stop + 1] - first)
+            np.save(directory / f"{name}.nulls.npy", column.nulls[start:stop])
+
+        (directory / "manifest.json").write_text(json.dumps(manifest))
+        return sum(path.stat().st_size for path in directory.iterdir())
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap_mode: str | None = "r") -> "ColumnarRecordStore":
+        """
+        Open a directory written by save() as a read-only store.
+
+        Args:
+            directory: Directory written by save()
+            mmap_mode: NumPy mmap mode for the column files ("r" maps them; None reads into memory)
+
+        Raises:
+            ValueError: If the directory was written with a different format version
+        """
+        directory = Path(directory)
+        manifest = json.loads((directory / "manifest.json").read_text())
+        if manifest.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported record store format in {directory}")
+
+        store = cls.__new__(cls)
+        store._length = manifest["length"]
+        store._capacity = store._length
+        store._read_only = True
+        store._numeric = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in NUMERIC_COLUMNS
+        }
+        store._categorical = {}
+        for name in CATEGORICAL_COLUMNS:
+            column = CategoricalColumn(0)
+            codes = np.load(directory / f"{name}.codes.npy", mmap_mode=mmap_mode)
+            column.reset(codes, manifest["categories"][name], len(codes))
+            store._categorical[name] = column
+        store._text = {}
+        for name in TEXT_COLUMNS:
+            column = TextColumn(0)
+            column.heap = (
+                _map_bytes(directory / f"{name}.heap")
+                if mmap_mode
+                else ((directory / f"{name}.heap").read_bytes())
+            )
+            column.offsets = np.load(directory / f"{name}.offsets.npy", mmap_mode=mmap_mode)
+            column.nulls = np.load(directory / f"{name}.nulls.npy", mmap_mode=mmap_mode)
+            store._text[name] = column
+        return store
+
+
+def _map_bytes(path: Path) -> bytes | mmap.mmap:
+    """Memory-map a file read-only (empty files cannot be mapped)."""
+    if path.stat().st_size == 0:
+        return b""
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,120 @@
+"""Size-bounded LRU cache of fully encoded responses, with strong ETags."""
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+# Default bound on the bytes of cached response bodies
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A complete response body with its headers and a strong ETag over the exact bytes."""
+
+    body: bytes
+    headers: dict[str, str]
+    etag: str
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a body (the bytes as sent, so each content encoding gets its own tag)."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches etag.
+
+    If-None-Match uses the weak comparison, so a W/ prefix on a listed tag is ignored.
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded responses, bounded by the total size of their bodies.
+
+    Only for responses that never change for a given key (e.g. queries over the
+    deterministic history): entries are never invalidated, only evicted. Accessed from
+    the event loop only, so no locking is needed.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total bytes of cached bodies (0 disables caching); a body
+                larger than this is served but never cached
+        """
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_bytes(self) -> int:
+        """Maximum total bytes of cached bodies (and so the largest body that can be cached)."""
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes of cached bodies."""
+        return self._nbytes
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        """Look up a response, marking it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, body: bytes, headers: dict[str, str]) -> CachedResponse:
+        """
+        Cache a response, evicting the least recently used ones to stay within max_bytes.
+
+        Args:
+            key: Everything the response depends on
+            body: Encoded response body
+            headers: Response headers (without Content-Length or ETag)
+
+        Returns:
+            The entry with its ETag (returned even if it was too large to cache)
+        """
+        entry = CachedResponse(body=body, headers=headers, etag=compute_etag(body))
+        if len(body) > self._max_bytes:
+            return entry
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._nbytes -= len(previous.body)
+        self._entries[key] = entry
+        self._nbytes += len(body)
+        while self._nbytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= len(evicted.body)
+        return entry
+
+    def stats(self) -> dict:
+        """Entry count, cached bytes and hit/miss counters, for health reporting."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._nbytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,137 @@
+"""Incrementally maintained aggregates of GL amounts per group-by dimension."""
+
+import numpy as np
+from core.models import GLRecord, GLRecordBatch
+
+from .segment_store import TieredRecordStore
+
+# Fields records can be grouped by
+ROLLUP_DIMENSIONS = ("fiscal_period", "basin", "state", "account_code", "well_id")
+# Amount fields that are summed and averaged
+ROLLUP_MEASURES = ("debit_amount", "credit_amount", "net_amount")
+
+
+class RecordRollups:
+    """
+    Running counts and amount sums, overall and per value of each group-by dimension.
+
+    Each appended record or batch is folded in as it arrives, so an aggregate query
+    reads one small dictionary per dimension instead of scanning records. Groups hold
+    [count, debit sum, credit sum, net sum]; averages are derived when queried. Records
+    are only ever added: evicting old records from the buffer does not remove them here.
+    """
+
+    def __init__(self, dimensions: tuple[str, ...] = ROLLUP_DIMENSIONS):
+        """
+        Initialize empty rollups.
+
+        Args:
+            dimensions: Fields to maintain per-value groups for
+        """
+        self._totals = [0, 0.0, 0.0, 0.0]
+        self._groups: dict[str, dict[str, list]] = {dimension: {} for dimension in dimensions}
+        # Buffer position the rollups have been brought up to
+        self.stop = 0
+
+    @property
+    def dimensions(self) -> tuple[str, ...]:
+        """Fields that records can be grouped by."""
+        return tuple(self._groups)
+
+    def add_record(self, record: GLRecord):
+        """Fold in one record appended at position stop."""
+        amounts = (record.debit_amount, record.credit_amount, record.net_amount)
+        self._fold(self._totals, 1, amounts)
+        for dimension, groups in self._groups.items():
+            value = getattr(record, dimension)
+            totals = groups.get(value)
+            if totals is None:
+                groups[value] = [1, *amounts]
+            else:
+                self._fold(totals, 1, amounts)
+        self.stop += 1
+
+    def add_batch(self, batch: GLRecordBatch):
+        """Fold in a batch appended at position stop."""
+        self._add_columns(batch.columns, len(batch))
+
+    def add_unbuffered_batch(self, batch: GLRecordBatch):
+        """Fold in a batch that is never appended to the buffer (stop stays where it is)."""
+        stop = self.stop
+        self._add_columns(batch.columns, len(batch))
+        self.stop = stop
+
+    def add_range(self, store: TieredRecordStore, stop: int | None = None):
+        """
+        Fold in the store's records from position stop up to a later position.
+
+        Args:
+            store: Store the records were appended to
+            stop: Position to catch up to (default: end of store); records evicted from
+                the store before they were folded in are skipped
+        """
+        stop = len(store) if stop is None else stop
+        start = max(self.stop, store.first_position)
+        if start < stop:
+            columns = {
+                name: store.column(name, start, stop) for name in (*self._groups, *ROLLUP_MEASURES)
+            }
+            self._add_columns(columns, stop - start)
+        self.stop = max(self.stop, stop)
+
+    def _add_columns(self, columns: dict[str, np.ndarray], count: int):
+        """Fold in count records given as columns."""
+        measures = [np.asarray(columns[name], dtype=np.float64) for name in ROLLUP_MEASURES]
+        self._fold(self._totals, count, [float(values.sum()) for values in measures])
+        for dimension, groups in self._groups.items():
+            values, inverse = np.unique(columns[dimension], return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(values)).tolist()
+            sums = [
+                np.bincount(inverse, weights=measure, minlength=len(values)).tolist()
+                for measure in measures
+            ]
+            for value, group_count, *amounts in zip(values.tolist(), counts, *sums, strict=True):
+                totals = groups.get(value)
+                if totals is None:
+                    groups[value] = [group_count, *amounts]
+                else:
+                    self._fold(totals, group_count, amounts)
+        self.stop += count
+
+    @staticmethod
+    def _fold(totals: list, count: int, amounts):
+        """Add a count and amount sums to a group's totals in place."""
+        totals[0] += count
+        for index, amount in enumerate(amounts, start=1):
+            totals[index] += amount
+
+    def reset(self):
+        """Drop all aggregates (e.g. when the records are replaced from scratch)."""
+        self._totals = [0, 0.0, 0.0, 0.0]
+        for groups in self._groups.values():
+            groups.clear()
+        self.stop = 0
+
+    @staticmethod
+    def _summary(totals: list) -> dict:
+        """Count plus sum and average of each measure for one group."""
+        count = totals[0]
+        summary = {"count": count}
+        for name, total in zip(ROLLUP_MEASURES, totals[1:], strict=True):
+            summary[f"{name}_sum"] = round(total, 2)
+            summary[f"{name}_avg"] = round(total / count, 2) if count else None
+        return summary
+
+    def totals(self) -> dict:
+        """Aggregates over every record folded in."""
+        return self._summary(self._totals)
+
+    def group(self, dimension: str) -> list[dict]:
+        """
+        Aggregates per value of one dimension, ordered by value.
+
+        Raises:
+            KeyError: If dimension is not maintained
+        """
+        groups = self._groups[dimension]
+        return [{dimension: value, **self._summary(groups[value])} for value in sorted(groups)]
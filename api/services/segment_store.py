@@ -0,0 +1,448 @@
+"""Bounded in-memory record store that spills older records to memory-mapped segments."""
+
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+from core.models import GLRecord, GLRecordBatch
+
+from .record_store import ColumnarRecordStore
+
+DEFAULT_HOT_CAPACITY = 100_000
+
+# Name of the file listing the published segments of a shared store (see publish())
+SHARED_MANIFEST_NAME = "shared-manifest.json"
+SHARED_MANIFEST_VERSION = 1
+
+# Name prefixes of the spilled segment and published delta directories this store writes
+SEGMENT_PREFIX = "segment-"
+DELTA_PREFIX = "delta-"
+
+
+@dataclass
+class Segment:
+    """Read-only block of records spilled to disk."""
+
+    start: int
+    store: ColumnarRecordStore
+    path: Path
+    nbytes: int
+    # Whether the store deletes the files when the segment is evicted (False for attached snapshots)
+    owned: bool = True
+
+    @property
+    def stop(self) -> int:
+        """Position after the last record in the segment."""
+        return self.start + len(self.store)
+
+
+class TieredRecordStore:
+    """
+    Record store with a bounded in-memory hot tier and append-only segment files on disk.
+
+    New records go to a ColumnarRecordStore; once it holds hot_capacity records the oldest
+    segment_records of them are written out as a segment directory and memory-mapped back,
+    so reads of older records page in from the OS cache instead of the Python heap.
+
+    Positions are absolute: a record keeps its position for as long as it is retained,
+    len() is the position after the newest record and first_position the oldest one still
+    retained. Cursors can therefore move across the disk and memory tiers without
+    noticing, and a cursor that falls behind retention simply resumes at first_position.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        hot_capacity: int = DEFAULT_HOT_CAPACITY,
+        segment_records: int | None = None,
+        max_records: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        """
+        Initialize an empty tiered store.
+
+        Args:
+            directory: Directory for segment files (default: a new temporary directory,
+                removed by close())
+            hot_capacity: Maximum number of records kept in memory
+            segment_records: Records per spilled segment (default: half of hot_capacity)
+            max_records: Retain at most this many records across both tiers (default: unbounded)
+            max_bytes: Retain at most this many bytes across both tiers (default: unbounded)
+
+        Raises:
+            ValueError: If hot_capacity or segment_records is not positive
+        """
+        if hot_capacity < 1:
+            raise ValueError("hot_capacity must be positive")
+        segment_records = segment_records or max(hot_capacity // 2, 1)
+        if not 0 < segment_records <= hot_capacity:
+            raise ValueError("segment_records must be between 1 and hot_capacity")
+
+        self._owns_directory = directory is None
+        self._directory = Path(
+            tempfile.mkdtemp(prefix="gl-segments-") if directory is None else directory
+        )
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._hot_capacity = hot_capacity
+        self._segment_records = segment_records
+        self._max_records = max_records
+        self._max_bytes = max_bytes
+        # Spilled segments, oldest first
+        self._segments: list[Segment] = []
+        self._hot = ColumnarRecordStore(min(hot_capacity, 1024))
+        # Absolute position of the first record in the hot tier
+        self._hot_start = 0
+        # Published copies of hot-tier records for other processes (see publish()), oldest first
+        self._deltas: list[Segment] = []
+        self._published = False
+        self._published_stop = 0
+        self._publish_sequence = 0
+        self._manifest_sequence = 0
+        # Files superseded since the last publish, removed once the new manifest is written
+        self._retired: list[Path] = []
+
+    def __len__(self) -> int:
+        """Position after the newest record (total records ever appended)."""
+        return self._hot_start + len(self._hot)
+
+    @property
+    def first_position(self) -> int:
+        """Position of the oldest record still retained."""
+        return self._segments[0].start if self._segments else self._hot_start
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments currently on disk."""
+        return len(self._segments)
+
+    def append(self, record: GLRecord):
+        """Append a single record."""
+        self._hot.append(record)
+        self._maintain()
+
+    def extend(self, records: Iterable[GLRecord]):
+        """Append records one by one."""
+        for record in records:
+            self._hot.append(record)
+            self._maintain()
+
+    def extend_batch(self, batch: GLRecordBatch):
+        """Append a columnar batch (spilling as many segments as it fills)."""
+        self._hot.extend_batch(batch)
+        self._maintain()
+
+    def _maintain(self):
+        """Spill full segments out of the hot tier, then apply retention."""
+        while len(self._hot) >= self._hot_capacity:
+            self._spill(self._segment_records)
+        self._evict()
+
+    def _spill(self, count: int):
+        """Move the oldest count hot records into a new memory-mapped segment."""
+        path = self._directory / f"{SEGMENT_PREFIX}{self._hot_start:012d}"
+        nbytes = self._hot.save(path, 0, count)
+        segment = Segment(self._hot_start, ColumnarRecordStore.load(path), path, nbytes)
+        self._segments.append(segment)
+        self._hot.drop_front(len(segment.store))
+        self._hot_start = segment.stop
+        # Published hot ranges now overlap the segment; the rest of the hot tier is republished
+        self._retired.extend(delta.path for delta in self._deltas)
+        self._deltas.clear()
+        self._published_stop = min(self._published_stop, self._hot_start)
+
+    def _over_retention(self) -> bool:
+        """Whether the retained records exceed the record or byte retention limit."""
+        return (
+            self._max_records is not None and len(self) - self.first_position > self._max_records
+        ) or (self._max_bytes is not None and self.nbytes() > self._max_bytes)
+
+    def _evict(self):
+        """Delete the oldest segments, then the oldest hot records, until retention limits hold."""
+        while self._segments and self._over_retention():
+            segment = self._segments.pop(0)
+            if segment.owned:
+                self._retired.append(segment.path)
+        while len(self._hot) and self._over_retention():
+            self._trim_hot()
+        if not self._published:
+            # Nothing was published, so no other process can be reading these files
+            self._remove_retired()
+
+    def _trim_hot(self):
+        """
+        Drop the oldest hot records once no segment is left to evict (limits below hot_capacity).
+
+        At least a quarter of the hot tier goes at a time, so the O(hot tier) compaction
+        happens once per many appends rather than on every one.
+        """
+        hot_records = len(self._hot)
+        excess = 0
+        if self._max_records is not None:
+            excess = hot_records - self._max_records
+        if self._max_bytes is not None:
+            excess_bytes = self.nbytes() - self._max_bytes
+            excess = max(excess, -(-excess_bytes * hot_records // max(self._hot.nbytes(), 1)))
+        count = min(hot_records, max(excess, hot_records // 4, 1))
+        self._hot.drop_front(count)
+        self._hot_start += count
+        # Published hot ranges may hold dropped records; the rest of the hot tier is republished
+        self._retired.extend(delta.path for delta in self._deltas)
+        self._deltas.clear()
+        self._published_stop = min(self._published_stop, self._hot_start)
+
+    def _remove_retired(self):
+        """Delete superseded segment files (processes that still map them keep their mapping)."""
+        for path in self._retired:
+            shutil.rmtree(path, ignore_errors=True)
+        self._retired.clear()
+
+    def publish(self, metadata: dict | None = None):
+        """
+        Make every record appended so far readable by other processes via SharedRecordReader.
+
+        Spilled segments are already files; hot-tier records not yet published are written
+        as a delta segment. A new delta absorbs the deltas before it that are no bigger, so
+        only O(log n) deltas exist and each record is rewritten O(log n) times between
+        spills. The manifest listing segments and deltas is then replaced atomically, so
+        readers always see a complete, contiguous set of files.
+
+        Args:
+            metadata: JSON-serializable values published with the manifest
+        """
+        if self._published_stop < len(self):
+            start = max(self._published_stop, self._hot_start)
+            while self._deltas and len(self._deltas[-1].store) <= len(self) - start:
+                merged = self._deltas.pop()
+                self._retired.append(merged.path)
+                start = merged.start
+            self._publish_sequence += 1
+            path = self._directory / f"{DELTA_PREFIX}{self._publish_sequence:08d}-{start:012d}"
+            nbytes = self._hot.save(path, start - self._hot_start, len(self) - self._hot_start)
+            self._deltas.append(Segment(start, ColumnarRecordStore.load(path), path, nbytes))
+            self._published_stop = len(self)
+
+        self._manifest_sequence += 1
+        manifest = {
+            "version": SHARED_MANIFEST_VERSION,
+            "sequence": self._manifest_sequence,
+            "stop": len(self),
+            "segments": [
+                {
+                    "start": segment.start,
+                    "path": os.path.relpath(segment.path, self._directory),
+                    "nbytes": segment.nbytes,
+                }
+                for segment in self._segments + self._deltas
+            ],
+            "metadata": metadata or {},
+        }
+        staging = self._directory / f".{SHARED_MANIFEST_NAME}.tmp"
+        staging.write_text(json.dumps(manifest))
+        os.replace(staging, self._directory / SHARED_MANIFEST_NAME)
+        self._published = True
+        self._remove_retired()
+
+    def attach(self, path: str | Path) -> Segment:
+        """
+        Append a segment saved elsewhere (e.g. a snapshot) by memory-mapping it in place.
+
+        The files are only read, never deleted by this store.
+
+        Raises:
+            ValueError: If the hot tier holds records (attached records must come after them)
+        """
+        if len(self._hot):
+            raise ValueError("Segments can only be attached while the hot tier is empty")
+        path = Path(path)
+        store = ColumnarRecordStore.load(path)
+        segment = Segment(
+            len(self), store, path, sum(file.stat().st_size for file in path.iterdir()), owned=False
+        )
+        self._segments.append(segment)
+        self._hot_start = segment.stop
+        # Segments are always listed in the shared manifest, so nothing is left to publish
+        self._published_stop = self._hot_start
+        self._evict()
+        return segment
+
+    def save(self, directory: str | Path, start: int = 0, stop: int | None = None) -> int:
+        """
+        Write retained records [start, stop) as one segment directory
+        (see ColumnarRecordStore.save).
+
+        Returns:
+            Number of bytes written
+        """
+        start, stop = self._clamp(start, stop)
+        for offset, store in self._tiers():
+            if offset <= start and stop <= offset + len(store):
+                return store.save(directory, start - offset, stop - offset)
+        # The range spans tiers: gather it into one store first
+        gathered = ColumnarRecordStore(max(stop - start, 1))
+        gathered.extend_batch(self.take_batch(np.arange(start, stop)))
+        return gathered.save(directory)
+
+    def _tiers(self) -> list[tuple[int, ColumnarRecordStore]]:
+        """(start position, store) for each tier, oldest first."""
+        return [(segment.start, segment.store) for segment in self._segments] + [
+            (self._hot_start, self._hot)
+        ]
+
+    def _clamp(self, start: int, stop: int | None) -> tuple[int, int]:
+        """Clamp an absolute [start, stop) range to the retained records."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return max(start, self.first_position), stop
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Get a fixed-width column for retained positions [start, stop) across tiers."""
+        start, stop = self._clamp(start, stop)
+        parts = [
+            store.column(name, max(start - offset, 0), stop - offset)
+            for offset, store in self._tiers()
+            if offset < stop and offset + len(store) > start
+        ]
+        if not parts:
+            return self._hot.column(name, 0, 0)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def searchsorted(self, name: str, value: int, side: str = "left") -> int:
+        """
+        Binary-search a numeric column sorted by position across tiers (e.g. gl_entry_id).
+
+        Returns:
+            Absolute position where value would be inserted (first_position if it sorts
+            before every retained record, len() if after)
+        """
+        for offset, store in self._tiers():
+            index = store.searchsorted(name, value, side)
+            if index < len(store):
+                return offset + index
+        return len(self)
+
+    def filter(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        date_range: tuple[date, date] | None = None,
+        **equals: str,
+    ) -> np.ndarray:
+        """
+        Find absolute positions of retained records matching all given predicates.
+
+        See ColumnarRecordStore.filter for the predicates.
+        """
+        start, stop = self._clamp(start, stop)
+        matches = [
+            store.filter(max(start - offset, 0), stop - offset, date_range, **equals) + offset
+            for offset, store in self._tiers()
+            if offset < stop and offset + len(store) > start
+        ]
+        return np.concatenate(matches) if matches else np.empty(0, dtype=np.int64)
+
+    def get(self, position: int) -> GLRecord:
+        """Materialize the record at position (negative positions count from the end)."""
+        if position < 0:
+            position += len(self)
+        if not self.first_position <= position < len(self):
+            raise IndexError("record position out of range or no longer retained")
+        return self.take(np.array([position]))[0]
+
+    def slice(self, start: int = 0, stop: int | None = None) -> list[GLRecord]:
+        """Materialize retained records in positions [start, stop)."""
+        start, stop = self._clamp(start, stop)
+        return self.take(np.arange(start, max(stop, start)))
+
+    def take(self, positions: np.ndarray) -> list[GLRecord]:
+        """
+        Materialize records at the given absolute positions, in order.
+
+        Raises:
+            IndexError: If a position is no longer retained or not yet written
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) and (
+            positions.min() < self.first_position or positions.max() >= len(self)
+        ):
+            raise IndexError("record position out of range or no longer retained")
+
+        tiers = self._tiers()
+        starts = [offset for offset, _store in tiers]
+        tier_index = np.searchsorted(starts, positions, side="right") - 1
+        records: list[GLRecord | None] = [None] * len(positions)
+        for index in np.unique(tier_index).tolist():
+            selected = np.flatnonzero(tier_index == index)
+            offset, store = tiers[index]
+            for slot, record in zip(
+                selected.tolist(), store.take(positions[selected] - offset), strict=True
+            ):
+                records[slot] = record
+        return records
+
+    def take_batch(self, positions: np.ndarray) -> GLRecordBatch:
+        """
+        Gather records at the given absolute positions into a GLRecordBatch, in order.
+
+        Raises:
+            IndexError: If a position is no longer retained or not yet written
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) and (
+            positions.min() < self.first_position or positions.max() >= len(self)
+        ):
+            raise IndexError("record position out of range or no longer retained")
+
+        tiers = self._tiers()
+        tier_index = (
+            np.searchsorted([offset for offset, _store in tiers], positions, side="right") - 1
+        )
+        # Gather tier by tier, then restore the requested order
+        order = np.argsort(tier_index, kind="stable")
+        batches = []
+        for index in np.unique(tier_index).tolist():
+            offset, store = tiers[index]
+            batches.append(store.take_batch(positions[tier_index == index] - offset))
+        if len(batches) <= 1:
+            return batches[0] if batches else self._hot.take_batch(positions)
+        restore = np.argsort(order)
+        return GLRecordBatch(
+            columns={
+                name: np.concatenate([batch.columns[name] for batch in batches])[restore]
+                for name in batches[0].columns
+            }
+        )
+
+    def tier_of(self, position: int) -> str:
+        """Name the tier holding position: "memory", "disk" or "evicted"."""
+        if position < self.first_position:
+            return "evicted"
+        return "memory" if position >= self._hot_start else "disk"
+
+    def nbytes(self) -> int:
+        """Bytes retained: segment files on disk plus the in-memory hot tier."""
+        return sum(segment.nbytes for segment in self._segments) + self._hot.nbytes()
+
+    def memory_nbytes(self) -> int:
+        """Approximate bytes held in memory by the hot tier."""
+        return self._hot.nbytes()
+
+    def close(self):
+        """
+        Drop all segments and delete the files this store wrote.
+
+        The segment directory itself is only removed if this store created it; attached
+        segments (e.g. snapshots) are left in place.
+        """
+        self._retired.extend(
+            segment.path for segment in self._segments + self._deltas if segment.owned
+        )
+        self._segments.clear()
+        self._deltas.clear()
+        self._remove_retired()
+        if self._owns_directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
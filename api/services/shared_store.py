@@ -0,0 +1,149 @@
+"""Read-only view of a record store published by another process, plus producer election."""
+
+import fcntl
+import json
+import shutil
+from pathlib import Path
+from typing import IO
+
+from core.models import GLRecord, GLRecordBatch
+
+from .record_store import ColumnarRecordStore
+from .segment_store import (
+    DELTA_PREFIX,
+    SEGMENT_PREFIX,
+    SHARED_MANIFEST_NAME,
+    SHARED_MANIFEST_VERSION,
+    Segment,
+    TieredRecordStore,
+)
+
+PRODUCER_LOCK_NAME = "producer.lock"
+
+
+def acquire_producer_lock(directory: str | Path) -> IO | None:
+    """
+    Try to become the single producer for a shared store directory.
+
+    The lock is an exclusive flock held for as long as the returned file stays open,
+    and the OS releases it if the process dies.
+
+    Returns:
+        The open lock file if this process is the producer, None if another process is
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    lock_file = open(directory / PRODUCER_LOCK_NAME, "a")  # held open while producing
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def reset_shared_directory(directory: str | Path):
+    """
+    Remove segments and the manifest left by a previous producer (call while holding the lock).
+
+    Only the store's own segment and delta directories are matched, so other files kept in
+    the same directory (e.g. history snapshots) survive.
+    """
+    directory = Path(directory)
+    (directory / SHARED_MANIFEST_NAME).unlink(missing_ok=True)
+    for prefix in (SEGMENT_PREFIX, DELTA_PREFIX):
+        for path in directory.glob(f"{prefix}[0-9]*"):
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+
+
+class SharedRecordReader(TieredRecordStore):
+    """
+    Read-only TieredRecordStore over the segments another process publishes.
+
+    The producer's TieredRecordStore.publish() writes every record as immutable segment
+    files and atomically replaces a manifest listing them; refresh() re-reads the manifest
+    and memory-maps segments it has not seen yet. Reads are zero-copy views of the page
+    cache, so any number of processes can share one producer's records. Files the producer
+    deletes stay readable through existing mappings until the next refresh drops them.
+    """
+
+    def __init__(self, directory: str | Path):
+        """
+        Open a shared store directory (it may not have been published to yet).
+
+        Args:
+            directory: Directory the producer publishes to
+        """
+        super().__init__(directory=directory)
+        self._manifest_sequence: int | None = None
+        self.metadata: dict = {}
+
+    def refresh(self) -> bool:
+        """
+        Pick up the producer's latest manifest.
+
+        Returns:
+            True if the view changed, False if nothing new was published (or the manifest
+            referenced files that were just replaced; the next refresh will see the new one)
+
+        Raises:
+            ValueError: If the manifest was written in an unsupported format version
+        """
+        path = self._directory / SHARED_MANIFEST_NAME
+        try:
+            manifest = json.loads(path.read_text())
+            if manifest.get("version") != SHARED_MANIFEST_VERSION:
+                raise ValueError(f"Unsupported shared store manifest in {self._directory}")
+            if manifest["sequence"] == self._manifest_sequence:
+                return False
+
+            loaded = {segment.path: segment for segment in self._segments}
+            segments = []
+            for entry in manifest["segments"]:
+                segment_path = self._directory / entry["path"]
+                segment = loaded.get(segment_path)
+                if segment is None:
+                    segment = Segment(
+                        entry["start"],
+                        ColumnarRecordStore.load(segment_path),
+                        segment_path,
+                        entry["nbytes"],
+                    )
+                segments.append(segment)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        self._segments = segments
+        self._hot_start = manifest["stop"]
+        self._manifest_sequence = manifest["sequence"]
+        self.metadata = manifest["metadata"]
+        return True
+
+    def append(self, record: GLRecord):
+        """Not supported: the store is written by the producer process."""
+        raise TypeError("SharedRecordReader is read-only")
+
+    def extend(self, records):
+        """Not supported: the store is written by the producer process."""
+        raise TypeError("SharedRecordReader is read-only")
+
+    def extend_batch(self, batch: GLRecordBatch):
+        """Not supported: the store is written by the producer process."""
+        raise TypeError("SharedRecordReader is read-only")
+
+    def publish(self, metadata: dict | None = None):
+        """Not supported: the store is written by the producer process."""
+        raise TypeError("SharedRecordReader is read-only")
+
+    def tier_of(self, position: int) -> str:
+        """Name the tier holding position: "disk" (shared) or "evicted"."""
+        return "evicted" if position < self.first_position else "disk"
+
+    def memory_nbytes(self) -> int:
+        """Bytes held privately in memory (none: every record is memory-mapped)."""
+        return 0
+
+    def close(self):
+        """Drop the mappings (the directory belongs to the producer)."""
+        self._segments.clear()
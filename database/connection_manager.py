@@ -1,4 +1,5 @@
 """DuckDB Connection Manager with access control and auditing."""
+
 import hashlib
 import logging
 import uuid
@@ -9,6 +10,8 @@ from typing import Any
 
 import duckdb
 
+from .migrations import migrate_ingestion_log_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,7 +32,7 @@ class DuckDBConnectionManager:
         self,
         database_path: str = "/app/data/analytics.duckdb",
         init_scripts_dir: str = "/app/database/init",
-        max_connections: int = 10
+        max_connections: int = 10,
     ):
         self.database_path = Path(database_path)
         self.init_scripts_dir = Path(init_scripts_dir)
@@ -52,7 +55,6 @@ class DuckDBConnectionManager:
         try:
             conn = self._get_admin_connection()
 
-
             # Standard DuckDB initialization
             logger.info("Initializing DuckDB database...")
 
@@ -65,13 +67,16 @@ class DuckDBConnectionManager:
                     sql_content = f.read()
 
                 # Split by semicolon and execute each statement
-                statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+                statements = [stmt.strip() for stmt in sql_content.split(";") if stmt.strip()]
                 for statement in statements:
                     try:
                         conn.execute(statement)
                     except Exception as e:
                         logger.warning(f"Error executing statement in {init_file.name}: {e}")
 
+            # Changes the init scripts cannot make to tables that already exist
+            migrate_ingestion_log_key(conn)
+
             logger.info("Database initialization completed")
             self._initialized = True
             conn.close()
@@ -81,10 +86,7 @@ class DuckDBConnectionManager:
             raise
 
     def create_api_key(
-        self,
-        user_id: str,
-        permissions: list[str] = None,
-        description: str = ""
+        self, user_id: str, permissions: list[str] = None, description: str = ""
     ) -> str:
         """
         Create an API key for database access.
@@ -98,7 +100,7 @@ class DuckDBConnectionManager:
             Generated API key
         """
         if permissions is None:
-            permissions = ['read']
+            permissions = ["read"]
 
         # Generate API key
         key_data = f"{user_id}:{datetime.now().isoformat()}:{uuid.uuid4()}"
@@ -106,18 +108,18 @@ class DuckDBConnectionManager:
 
         # Store API key metadata
         self._api_keys[api_key] = {
-            'user_id': user_id,
-            'permissions': permissions,
-            'description': description,
-            'created_at': datetime.now(),
-            'last_used': None,
-            'active': True
+            "user_id": user_id,
+            "permissions": permissions,
+            "description": description,
+            "created_at": datetime.now(),
+            "last_used": None,
+            "active": True,
         }
 
         logger.info(f"Created API key for user {user_id} with permissions: {permissions}")
         return api_key
 
-    def validate_api_key(self, api_key: str, required_permission: str = 'read') -> bool:
+    def validate_api_key(self, api_key: str, required_permission: str = "read") -> bool:
         """
         Validate API key and check permissions.
 
@@ -133,22 +135,25 @@ class DuckDBConnectionManager:
 
         key_info = self._api_keys[api_key]
 
-        if not key_info['active']:
+        if not key_info["active"]:
             return False
 
-        if required_permission not in key_info['permissions'] and 'admin' not in key_info['permissions']:
+        if (
+            required_permission not in key_info["permissions"]
+            and "admin" not in key_info["permissions"]
+        ):
             return False
 
         # Update last used timestamp
-        key_info['last_used'] = datetime.now()
+        key_info["last_used"] = datetime.now()
         return True
 
     @contextmanager
     def get_connection(
         self,
         api_key: str | None = None,
-        connection_type: str = 'read',
-        client_info: str = "unknown"
+        connection_type: str = "read",
+        client_info: str = "unknown",
     ):
         """
         Get a database connection with access control.
@@ -163,10 +168,12 @@ class DuckDBConnectionManager:
         """
         # Validate API key if provided
         if api_key and not self.validate_api_key(api_key, connection_type):
-            raise PermissionError(f"Invalid API key or insufficient permissions for {connection_type}")
+            raise PermissionError(
+                f"Invalid API key or insufficient permissions for {connection_type}"
+            )
 
         connection_id = str(uuid.uuid4())
-        user_id = self._api_keys.get(api_key, {}).get('user_id', 'admin') if api_key else 'admin'
+        user_id = self._api_keys.get(api_key, {}).get("user_id", "admin") if api_key else "admin"
 
         try:
             # Create connection
@@ -178,8 +185,8 @@ class DuckDBConnectionManager:
                 connection_type=connection_type,
                 user_identifier=user_id,
                 client_info=client_info,
-                operation='CONNECT',
-                success=True
+                operation="CONNECT",
+                success=True,
             )
 
             logger.info(f"Connection {connection_id} established for user {user_id}")
@@ -191,9 +198,9 @@ class DuckDBConnectionManager:
                 connection_type=connection_type,
                 user_identifier=user_id,
                 client_info=client_info,
-                operation='CONNECT',
+                operation="CONNECT",
                 success=False,
-                error_message=str(e)
+                error_message=str(e),
             )
             raise
         finally:
@@ -222,47 +229,55 @@ class DuckDBConnectionManager:
         operation: str,
         success: bool = True,
         table_accessed: str = None,
-        error_message: str = None
+        error_message: str = None,
     ):
         """Log connection audit information."""
         try:
             with self._get_admin_connection() as conn:
                 audit_id = str(uuid.uuid4())
-                conn.execute("""
+                conn.execute(
+                    """
                     INSERT INTO metadata.connection_audit (
                         audit_id, connection_type, user_identifier, client_info,
                         database_name, table_accessed, operation, timestamp,
                         success, error_message
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    audit_id, connection_type, user_identifier, client_info,
-                    str(self.database_path), table_accessed, operation,
-                    datetime.now(), success, error_message
-                ])
+                """,
+                    [
+                        audit_id,
+                        connection_type,
+                        user_identifier,
+                        client_info,
+                        str(self.database_path),
+                        table_accessed,
+                        operation,
+                        datetime.now(),
+                        success,
+                        error_message,
+                    ],
+                )
         except Exception as e:
             logger.error(f"Failed to log audit information: {e}")
 
     def get_connection_stats(self) -> dict[str, Any]:
         """Get connection statistics."""
         return {
-            'active_connections': len(self._connections),
-            'max_connections': self.max_connections,
-            'api_keys_count': len(self._api_keys),
-            'database_path': str(self.database_path),
-            'initialized': self._initialized
+            "active_connections": len(self._connections),
+            "max_connections": self.max_connections,
+            "api_keys_count": len(self._api_keys),
+            "database_path": str(self.database_path),
+            "initialized": self._initialized,
         }
 
-
     def revoke_api_key(self, api_key: str) -> bool:
         """Revoke an API key."""
         if api_key in self._api_keys:
-            self._api_keys[api_key]['active'] = False
+            self._api_keys[api_key]["active"] = False
             logger.info(f"API key revoked for user {self._api_keys[api_key]['user_id']}")
             return True
         return False
 
 
-
 # Global connection manager instance
 connection_manager = DuckDBConnectionManager()
 
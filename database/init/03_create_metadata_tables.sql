@@ -53,16 +53,27 @@ CREATE TABLE IF NOT EXISTS connection_audit (
 );
 
 -- Ingestion watermark tracking (in raw schema for easier access)
+-- One row per source and stream: the highest gl_entry_id ingested, updated in the
+-- same transaction as the records it covers
 USE raw;
 CREATE TABLE IF NOT EXISTS metadata_ingestion_log (
-    table_name VARCHAR PRIMARY KEY,
+    source VARCHAR NOT NULL, -- e.g. 'fastapi'
+    stream VARCHAR NOT NULL, -- e.g. 'gl_records'
+    table_name VARCHAR NOT NULL,
+    last_gl_entry_id BIGINT NOT NULL DEFAULT 0,
     last_ingestion_time TIMESTAMP NOT NULL,
     records_processed INTEGER DEFAULT 0,
     ingestion_status VARCHAR DEFAULT 'success', -- 'success', 'failed', 'partial'
     error_message TEXT,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, stream)
 );
 
+-- Databases created before watermarks were tracked: add the watermark columns
+ALTER TABLE metadata_ingestion_log ADD COLUMN IF NOT EXISTS source VARCHAR DEFAULT 'fastapi';
+ALTER TABLE metadata_ingestion_log ADD COLUMN IF NOT EXISTS stream VARCHAR DEFAULT 'gl_records';
+ALTER TABLE metadata_ingestion_log ADD COLUMN IF NOT EXISTS last_gl_entry_id BIGINT DEFAULT 0;
+
 -- Create indexes for metadata tables
 USE metadata;
 CREATE INDEX IF NOT EXISTS idx_pipeline_runs_status ON metadata.pipeline_runs(status);
@@ -0,0 +1,77 @@
+"""Migrations for databases created by older versions of the init scripts."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_ingestion_log_key(conn) -> bool:
+    """
+    Re-key raw.metadata_ingestion_log on (source, stream) if it is still keyed on table_name.
+
+    Databases created before per-stream watermarks keep their table_name primary key
+    (03_create_metadata_tables.sql only adds the new columns), which would collide as soon
+    as two streams write the same table. DuckDB cannot change a primary key in place, so
+    the table is rebuilt in one transaction: the rows are copied into a table with the
+    new key (keeping the highest watermark if several rows map to one stream), the old
+    table is dropped and the new one renamed over it.
+
+    Run after the init scripts, which add the source, stream and last_gl_entry_id columns.
+
+    Args:
+        conn: DuckDB connection to the database
+
+    Returns:
+        True if the table was rebuilt, False if it already had the new key
+    """
+    key = conn.execute("""
+        SELECT constraint_column_names FROM duckdb_constraints()
+        WHERE schema_name = 'raw' AND table_name = 'metadata_ingestion_log'
+          AND constraint_type = 'PRIMARY KEY'
+    """).fetchone()
+    if key is None or key[0] == ["source", "stream"]:
+        return False
+
+    logger.info("Re-keying raw.metadata_ingestion_log on (source, stream)")
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute("DROP INDEX IF EXISTS raw.idx_metadata_ingestion_log_table")
+        conn.execute("""
+            CREATE TABLE raw.metadata_ingestion_log_rekeyed (
+                source VARCHAR NOT NULL,
+                stream VARCHAR NOT NULL,
+                table_name VARCHAR NOT NULL,
+                last_gl_entry_id BIGINT NOT NULL DEFAULT 0,
+                last_ingestion_time TIMESTAMP NOT NULL,
+                records_processed INTEGER DEFAULT 0,
+                ingestion_status VARCHAR DEFAULT 'success',
+                error_message TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (source, stream)
+            )
+        """)
+        conn.execute("""
+            INSERT INTO raw.metadata_ingestion_log_rekeyed
+            SELECT
+                COALESCE(source, 'fastapi'), COALESCE(stream, 'gl_records'), table_name,
+                COALESCE(last_gl_entry_id, 0), last_ingestion_time, records_processed,
+                ingestion_status, error_message, updated_at
+            FROM raw.metadata_ingestion_log
+            QUALIFY row_number() OVER (
+                PARTITION BY COALESCE(source, 'fastapi'), COALESCE(stream, 'gl_records')
+                ORDER BY last_gl_entry_id DESC NULLS LAST, last_ingestion_time DESC
+            ) = 1
+        """)
+        conn.execute("DROP TABLE raw.metadata_ingestion_log")
+        conn.execute(
+            "ALTER TABLE raw.metadata_ingestion_log_rekeyed RENAME TO metadata_ingestion_log"
+        )
+        conn.execute(
+            "CREATE INDEX idx_metadata_ingestion_log_table "
+            "ON raw.metadata_ingestion_log(table_name)"
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return True
@@ -1,16 +1,44 @@
 """Auto-partitioned incremental ingestion for GL records."""
-from datetime import UTC, date, datetime
 
-import pandas as pd
+from datetime import UTC, date, datetime, timedelta
+
+import pyarrow.compute as pc
 from dagster import (
     AssetExecutionContext,
+    Config,
     MaterializeResult,
     MetadataValue,
     StaticPartitionsDefinition,
     asset,
 )
 
-from ..resources import DuckDBWarehouse, FastAPIClient
+from ..resources import (
+    DuckDBWarehouse,
+    FastAPIClient,
+    GLRecordAppender,
+    read_watermark,
+    upsert_gl_records,
+    write_watermark,
+)
+
+# Key of the raw.gl_records watermark in raw.metadata_ingestion_log (advanced by the simple asset)
+WATERMARK_SOURCE = "fastapi"
+WATERMARK_STREAM = "gl_records"
+# Stream of the partitioned asset's watermark: a partition's highest gl_entry_id says nothing
+# about the IDs below it in other partitions, so it must not move the incremental watermark
+PARTITION_WATERMARK_STREAM = "gl_records_partitions"
+
+
+class LiveIngestionConfig(Config):
+    """Run config of raw_gl_records_simple (set by live_ingestion_sensor)."""
+
+    # API restarts seen by the sensor; the API's IDs start over in each new epoch
+    epoch: int = 0
+
+
+def live_watermark_stream(epoch: int) -> str:
+    """Watermark stream of the simple asset in an API epoch (epoch 0 keeps the original stream)."""
+    return WATERMARK_STREAM if epoch == 0 else f"{WATERMARK_STREAM}@epoch{epoch}"
 
 
 # Auto-generating quarterly partitions
@@ -22,14 +50,16 @@ def generate_quarterly_partitions(start_year=2024, num_years=5):
             partitions.append(f"{year}-Q{quarter}")
     return partitions
 
+
 quarterly_partitions = StaticPartitionsDefinition(
     generate_quarterly_partitions(start_year=2024, num_years=5)  # 2024-2028
 )
 
+
 # Helper function to get date range for quarter partition
 def get_quarter_date_range(quarter_key):
     """Convert quarter key like '2025-Q1' to start/end dates."""
-    year, quarter = quarter_key.split('-Q')
+    year, quarter = quarter_key.split("-Q")
     year, quarter = int(year), int(quarter)
 
     if quarter == 1:
@@ -76,77 +106,63 @@ def raw_gl_records(
     start_date, end_date = get_quarter_date_range(partition_quarter)
     context.log.info(f"Quarter {partition_quarter} covers {start_date} to {end_date}")
 
-    # Get records from API
+    # Get only this quarter's records from the API as an Arrow table (no JSON parsing or
+    # pandas round trip); the client fetches month-sized windows of the range concurrently
     context.log.info(f"Fetching GL records for {partition_quarter}...")
-    gl_records = fastapi_client.get_gl_records(limit=5000)
-
-    if not gl_records:
-        context.log.info(f"No records from API for {partition_quarter}")
-        return MaterializeResult(
-            metadata={
-                "partition_quarter": partition_quarter,
-                "records_processed": 0,
-            }
-        )
-
-    # Convert to DataFrame
-    df = pd.DataFrame(gl_records)
-    context.log.info(f"Got {len(df)} records from API")
-
-    # Filter records for this quarter's date range
-    df['transaction_date'] = pd.to_datetime(df['transaction_date']).dt.date
-    quarter_records = df[
-        (df['transaction_date'] >= start_date) &
-        (df['transaction_date'] < end_date)
-    ]
+    quarter_records = fastapi_client.get_gl_table(
+        start_date.isoformat(), (end_date - timedelta(days=1)).isoformat()
+    )
 
-    if quarter_records.empty:
+    if quarter_records.num_rows == 0:
         context.log.info(f"No records found for quarter {partition_quarter}")
         return MaterializeResult(
             metadata={
                 "partition_quarter": partition_quarter,
                 "records_processed": 0,
-                "total_api_records": len(df),
                 "date_range": f"{start_date} to {end_date}",
             }
         )
 
-    context.log.info(f"Found {len(quarter_records)} records for {partition_quarter}")
-    context.log.info(f"ID range: {quarter_records['gl_entry_id'].min()} - {quarter_records['gl_entry_id'].max()}")
-    context.log.info(f"Date range: {quarter_records['transaction_date'].min()} - {quarter_records['transaction_date'].max()}")
+    id_range = pc.min_max(quarter_records.column("gl_entry_id"))
+    date_range = pc.min_max(quarter_records.column("transaction_date"))
+    context.log.info(f"Found {quarter_records.num_rows} records for {partition_quarter}")
+    context.log.info(f"ID range: {id_range['min']} - {id_range['max']}")
+    context.log.info(f"Date range: {date_range['min']} - {date_range['max']}")
 
-    # Add ingestion metadata
+    # Upsert into DuckDB: re-processing only writes records that are new or changed, and
+    # removes records of this quarter the API no longer returns. Its watermark is kept apart
+    # from the simple asset's, which still fetches every ID after its own (records this
+    # upsert already wrote are skipped by the appender)
     current_time = datetime.now(UTC)
-    quarter_records = quarter_records.copy()
-    quarter_records['ingested_at'] = current_time
-    quarter_records['source'] = 'fastapi'
-
-    # Insert into DuckDB
     with duckdb_warehouse.get_connection() as conn:
         try:
-            # Delete existing records for this quarter to handle re-processing
-            conn.execute(f"""
-                DELETE FROM raw.gl_records
-                WHERE DATE(transaction_date) >= '{start_date}'
-                AND DATE(transaction_date) < '{end_date}'
-                AND source = 'fastapi'
-            """)
-
-            conn.execute("INSERT INTO raw.gl_records SELECT * FROM quarter_records")
-            context.log.info(f"Successfully inserted {len(quarter_records)} records for {partition_quarter}")
+            result = upsert_gl_records(
+                conn,
+                quarter_records,
+                start_date,
+                end_date,
+                source=WATERMARK_SOURCE,
+                watermark_stream=PARTITION_WATERMARK_STREAM,
+            )
+            context.log.info(
+                f"Upserted {partition_quarter}: {result.inserted} inserted, "
+                f"{result.updated} updated, {result.unchanged} unchanged, {result.deleted} deleted"
+            )
 
         except Exception as e:
-            context.log.error(f"Failed to insert records for {partition_quarter}: {e}")
+            context.log.error(f"Failed to upsert records for {partition_quarter}: {e}")
             raise
 
     return MaterializeResult(
         metadata={
             "partition_quarter": partition_quarter,
-            "records_processed": len(quarter_records),
-            "id_range": f"{quarter_records['gl_entry_id'].min()}-{quarter_records['gl_entry_id'].max()}",
+            "records_processed": quarter_records.num_rows,
+            "records_inserted": result.inserted,
+            "records_updated": result.updated,
+            "records_deleted": result.deleted,
+            "id_range": f"{id_range['min']}-{id_range['max']}",
             "date_range": f"{start_date} to {end_date}",
             "ingestion_time": MetadataValue.timestamp(current_time),
-            "total_api_records": len(df),
         }
     )
 
@@ -158,65 +174,78 @@ def raw_gl_records(
 )
 def raw_gl_records_simple(
     context: AssetExecutionContext,
+    config: LiveIngestionConfig,
     duckdb_warehouse: DuckDBWarehouse,
     fastapi_client: FastAPIClient,
 ) -> MaterializeResult:
-    """Simple incremental loading using gl_entry_id as watermark."""
-
-    # Get records from API
-    context.log.info("Fetching GL records from API...")
-    gl_records = fastapi_client.get_gl_records(limit=5000)
-
-    if not gl_records:
-        context.log.info("No records from API")
-        return MaterializeResult(metadata={"records_processed": 0})
+    """
+    Simple incremental loading using gl_entry_id as watermark.
 
-    # Convert to DataFrame
-    df = pd.DataFrame(gl_records)
-    context.log.info(f"Got {len(df)} records from API")
+    The watermark is kept per source and stream in raw.metadata_ingestion_log and
+    advanced in the same transaction as each micro-batch of records, so a run reads one
+    row instead of scanning raw.gl_records, and a run with nothing new costs one small
+    API request.
 
+    Each API epoch has its own watermark stream: after a restart the API's IDs start
+    over, so the new epoch reads from the first ID and its records replace the stored
+    ones they re-issue, instead of waiting for the IDs to pass the old watermark.
+    """
+    stream = live_watermark_stream(config.epoch)
     with duckdb_warehouse.get_connection() as conn:
-        # Find the highest gl_entry_id we already have
+        watermark = read_watermark(conn, WATERMARK_SOURCE, stream)
+        if watermark is None and config.epoch == 0:
+            # First run against this database: seed from the records already loaded
+            watermark = conn.execute(
+                "SELECT COALESCE(MAX(gl_entry_id), 0) FROM raw.gl_records"
+            ).fetchone()[0]
+        elif watermark is None:
+            watermark = 0
+        context.log.info(f"Watermark gl_entry_id: {watermark} (stream {stream})")
+
+        # Ask the API only for records after the watermark; pages arrive in gl_entry_id
+        # order, so a failed run leaves a consistent prefix and the next run resumes after it
+        context.log.info("Streaming new GL records from API...")
+        appender = GLRecordAppender(
+            conn,
+            source=WATERMARK_SOURCE,
+            watermark_stream=stream,
+            replace_existing=config.epoch > 0,
+        )
         try:
-            result = conn.execute("SELECT COUNT(*), COALESCE(MAX(gl_entry_id), 0) FROM raw.gl_records").fetchone()
-            record_count = result[0]
-            max_existing_id = result[1]
-            context.log.info(f"Database has {record_count} existing records")
-            context.log.info(f"Highest existing gl_entry_id: {max_existing_id}")
+            for page in fastapi_client.iter_gl_tables(after_gl_entry_id=watermark):
+                appender.append(page)
+            appender.flush()
         except Exception as e:
-            context.log.info(f"Error querying database (table might not exist): {e}")
-            max_existing_id = 0
-            record_count = 0
-
-        # If database is empty, insert all records
-        if record_count == 0:
-            context.log.info("Database is empty, inserting all records")
-            new_records = df.copy()
-        else:
-            # Only keep records with gl_entry_id higher than what we have
-            new_records = df[df['gl_entry_id'] > max_existing_id]
-
-        if new_records.empty:
-            context.log.info("No new records to insert")
-            return MaterializeResult(metadata={"records_processed": 0})
-
-        context.log.info(f"Found {len(new_records)} new records to insert")
-
-        # Add metadata columns
-        current_time = datetime.now(UTC)
-        new_records = new_records.copy()
-        new_records['ingested_at'] = current_time
-        new_records['source'] = 'fastapi'
+            write_watermark(
+                conn,
+                WATERMARK_SOURCE,
+                stream,
+                "raw.gl_records",
+                appender.max_gl_entry_id or watermark,
+                appender.rows_appended,
+                ingestion_status="partial" if appender.rows_appended else "failed",
+                error_message=str(e),
+            )
+            raise
 
-        # Insert directly into DuckDB
-        conn.execute("INSERT INTO raw.gl_records SELECT * FROM new_records")
+        if appender.rows_skipped:
+            context.log.info(f"Skipped {appender.rows_skipped} records already in raw.gl_records")
+        if appender.rows_appended == 0:
+            context.log.info("No new records to insert")
+            return MaterializeResult(
+                metadata={
+                    "records_processed": 0,
+                    "watermark": appender.max_gl_entry_id or watermark,
+                }
+            )
 
-        context.log.info(f"Successfully inserted {len(new_records)} records")
+        context.log.info(f"Successfully inserted {appender.rows_appended} records")
 
         return MaterializeResult(
             metadata={
-                "records_processed": len(new_records),
-                "highest_id_inserted": int(new_records['gl_entry_id'].max()),
-                "ingestion_time": MetadataValue.timestamp(current_time),
+                "records_processed": appender.rows_appended,
+                "highest_id_inserted": appender.max_gl_entry_id,
+                "watermark": appender.max_gl_entry_id,
+                "ingestion_time": MetadataValue.timestamp(datetime.now(UTC)),
             }
         )
@@ -1,13 +1,22 @@
 """Dagster definitions for the Dakota Analytics pipeline."""
+
 import os
 
 from dagster import (
     AssetSelection,
+    DagsterRunStatus,
     DefaultScheduleStatus,
+    DefaultSensorStatus,
     Definitions,
+    RunConfig,
+    RunRequest,
+    RunsFilter,
     ScheduleDefinition,
+    SensorEvaluationContext,
+    SkipReason,
     define_asset_job,
     load_assets_from_modules,
+    sensor,
 )
 
 # Temporarily comment out dbt integration to get Dagster working first
@@ -31,7 +40,7 @@ ingestion_assets = load_assets_from_modules([ingestion])
 daily_ingestion_job = define_asset_job(
     name="daily_ingestion_job",
     selection=AssetSelection.assets(ingestion.raw_gl_records),
-    description="Daily ingestion of GL records from FastAPI to DuckDB"
+    description="Daily ingestion of GL records from FastAPI to DuckDB",
 )
 
 # Schedule for the job
@@ -41,14 +50,95 @@ daily_ingestion_schedule = ScheduleDefinition(
     default_status=DefaultScheduleStatus.STOPPED,
 )
 
+# Continuous micro-batch ingestion: appends records after the stored watermark
+live_ingestion_job = define_asset_job(
+    name="live_ingestion_job",
+    selection=AssetSelection.assets(ingestion.raw_gl_records_simple),
+    description="Incremental ingestion of new GL records from FastAPI to DuckDB",
+)
+
+# How often the sensor polls the API for new records (freshness SLA is under a minute)
+LIVE_INGESTION_POLL_SECONDS = int(os.getenv("LIVE_INGESTION_POLL_SECONDS", "10"))
+
+# Run states that count as an ingestion already in flight
+ACTIVE_RUN_STATUSES = [
+    DagsterRunStatus.NOT_STARTED,
+    DagsterRunStatus.QUEUED,
+    DagsterRunStatus.STARTING,
+    DagsterRunStatus.STARTED,
+]
+
+
+def parse_live_cursor(cursor: str | None) -> tuple[int, int]:
+    """
+    Split a live_ingestion_sensor cursor into (epoch, last requested gl_entry_id).
+
+    The epoch counts API restarts seen by the sensor; cursors written before it was
+    tracked hold only the ID and count as epoch 0.
+    """
+    if not cursor:
+        return 0, 0
+    epoch, _, requested_id = cursor.rpartition(":")
+    return int(epoch or 0), int(requested_id)
+
+
+@sensor(
+    job=live_ingestion_job,
+    minimum_interval_seconds=LIVE_INGESTION_POLL_SECONDS,
+    default_status=DefaultSensorStatus.RUNNING,
+)
+def live_ingestion_sensor(context: SensorEvaluationContext, fastapi_client: FastAPIClient):
+    """
+    Launch a live ingestion run whenever the API has records past the last one requested.
+
+    The sensor cursor holds the API's last_gl_entry_id when the previous run was
+    requested, so a tick with nothing new costs one /health call. While a run is in
+    flight no other is launched; the records that arrive meanwhile are picked up
+    together by the next run, which resumes from the watermark in DuckDB.
+
+    If the API reports a last_gl_entry_id below the cursor it has restarted with its
+    IDs starting over, so the cursor follows it down in a new epoch instead of waiting
+    for the old high-water mark to be passed again. The epoch is passed to the run,
+    which then resumes from that epoch's own watermark (see LiveIngestionConfig), and
+    keeps run keys unique.
+    """
+    try:
+        last_gl_entry_id = fastapi_client.get_health()["last_gl_entry_id"]
+    except Exception as e:
+        return SkipReason(f"FastAPI health check failed: {e}")
+
+    epoch, requested_id = parse_live_cursor(context.cursor)
+    if last_gl_entry_id < requested_id:
+        context.log.info(
+            f"FastAPI last_gl_entry_id {last_gl_entry_id} is below the cursor {requested_id}; "
+            "it has restarted, following its IDs from here"
+        )
+        epoch, requested_id = epoch + 1, 0
+    if last_gl_entry_id <= requested_id:
+        return SkipReason(f"No new records after gl_entry_id {requested_id}")
+
+    active_runs = context.instance.get_run_records(
+        filters=RunsFilter(job_name=live_ingestion_job.name, statuses=ACTIVE_RUN_STATUSES),
+        limit=1,
+    )
+    if active_runs:
+        return SkipReason(f"Ingestion run {active_runs[0].dagster_run.run_id} still in progress")
+
+    context.update_cursor(f"{epoch}:{last_gl_entry_id}")
+    return RunRequest(
+        run_key=f"live-{epoch}-{last_gl_entry_id}" if epoch else f"live-{last_gl_entry_id}",
+        run_config=RunConfig(
+            ops={"raw_gl_records_simple": ingestion.LiveIngestionConfig(epoch=epoch)}
+        ),
+    )
+
+
 # Resources - FastAPI to DuckDB only
 resources = {
     "duckdb_warehouse": DuckDBWarehouse(
         database_path=os.getenv("DUCKDB_PATH", "/app/data/analytics.duckdb")
     ),
-    "fastapi_client": FastAPIClient(
-        base_url=os.getenv("FASTAPI_URL", "http://fastapi:8000")
-    ),
+    "fastapi_client": FastAPIClient(base_url=os.getenv("FASTAPI_URL", "http://fastapi:8000")),
     # TODO: Add back dbt resource once dbt integration is working
     # "dbt": DbtCliResource(
     #     project_dir=dbt_project.project_dir,
@@ -66,10 +156,14 @@ defs = Definitions(
     ],
     jobs=[
         daily_ingestion_job,
+        live_ingestion_job,
     ],
     schedules=[
         daily_ingestion_schedule,
     ],
+    sensors=[
+        live_ingestion_sensor,
+    ],
     resources=resources,
 )
 
@@ -1,14 +1,23 @@
 """Dagster resources for the Dakota Analytics pipeline."""
+
 import os
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 
 import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
 import requests
 from dagster import ConfigurableResource
+from pydantic import PrivateAttr
+from requests.adapters import HTTPAdapter
 
 # Add the app directory to Python path for imports
-sys.path.insert(0, '/app')
+sys.path.insert(0, "/app")
 
 try:
     from database.connection_manager import get_connection_manager
@@ -17,6 +26,334 @@ except ImportError:
     get_connection_manager = None
 
 
+# Fields of a GL record as served by the FastAPI service, in API field order (the columns
+# of raw.gl_records before the ingestion metadata columns)
+GL_RECORD_COLUMNS = (
+    "gl_entry_id",
+    "journal_batch",
+    "journal_entry",
+    "transaction_date",
+    "posting_date",
+    "account_code",
+    "account_name",
+    "account_type",
+    "debit_amount",
+    "credit_amount",
+    "net_amount",
+    "well_id",
+    "lease_name",
+    "property_id",
+    "afe_number",
+    "jib_number",
+    "cost_center",
+    "journal_source",
+    "transaction_type",
+    "description",
+    "fiscal_period",
+    "fiscal_year",
+    "fiscal_month",
+    "state",
+    "county",
+    "basin",
+    "created_timestamp",
+    "created_by",
+    "last_modified",
+)
+
+
+# Rows per INSERT when streaming records into raw.gl_records
+MICRO_BATCH_ROWS = 50_000
+
+
+def read_watermark(conn, source: str, stream: str) -> int | None:
+    """Highest gl_entry_id ingested for a source and stream (None if never recorded)."""
+    row = conn.execute(
+        "SELECT last_gl_entry_id FROM raw.metadata_ingestion_log WHERE source = ? AND stream = ?",
+        [source, stream],
+    ).fetchone()
+    return row[0] if row else None
+
+
+def write_watermark(
+    conn,
+    source: str,
+    stream: str,
+    table_name: str,
+    last_gl_entry_id: int,
+    records_processed: int,
+    ingestion_status: str = "success",
+    error_message: str | None = None,
+):
+    """
+    Record an ingestion for a source and stream in raw.metadata_ingestion_log.
+
+    Call inside the transaction that wrote the records, so the watermark never runs
+    ahead of (or behind) the data it describes. The stored watermark only moves
+    forward: a lower last_gl_entry_id leaves it where it is.
+
+    Args:
+        conn: DuckDB connection
+        source: Source system, e.g. "fastapi"
+        stream: Stream within the source, e.g. "gl_records"
+        table_name: Table the records were written to
+        last_gl_entry_id: Highest gl_entry_id ingested by this ingestion
+        records_processed: Records written by this ingestion
+        ingestion_status: "success", "failed" or "partial"
+        error_message: Failure details, if any
+    """
+    values = [
+        table_name,
+        last_gl_entry_id,
+        records_processed,
+        ingestion_status,
+        error_message,
+        source,
+        stream,
+    ]
+    updated = conn.execute(
+        """
+        UPDATE raw.metadata_ingestion_log
+        SET table_name = ?, last_gl_entry_id = GREATEST(last_gl_entry_id, ?),
+            last_ingestion_time = now() AT TIME ZONE 'UTC', records_processed = ?,
+            ingestion_status = ?, error_message = ?, updated_at = now() AT TIME ZONE 'UTC'
+        WHERE source = ? AND stream = ?
+    """,
+        values,
+    ).fetchone()[0]
+    if not updated:
+        conn.execute(
+            """
+            INSERT INTO raw.metadata_ingestion_log (
+                table_name, last_gl_entry_id, last_ingestion_time, records_processed,
+                ingestion_status, error_message, updated_at, source, stream
+            )
+            VALUES (?, ?, now() AT TIME ZONE 'UTC', ?, ?, ?, now() AT TIME ZONE 'UTC', ?, ?)
+        """,
+            values,
+        )
+
+
+class GLRecordAppender:
+    """
+    Append streamed GL record tables to raw.gl_records in fixed-size micro-batches.
+
+    Incoming tables are held only until micro_batch_rows rows have accumulated, then
+    inserted in one statement with the ingestion metadata columns added, so memory stays
+    bounded by the micro-batch size however many records are streamed through. Records
+    already in the table (e.g. written by upsert_gl_records) are left as they are, or
+    replaced with replace_existing, so overlapping ingestions never fail on the
+    gl_entry_id key. With a watermark stream,
+    each micro-batch commits together with the advanced watermark, so an interrupted run
+    resumes exactly after the last committed record.
+    """
+
+    def __init__(
+        self,
+        conn,
+        micro_batch_rows: int = MICRO_BATCH_ROWS,
+        source: str = "fastapi",
+        watermark_stream: str | None = None,
+        replace_existing: bool = False,
+    ):
+        """
+        Initialize an appender.
+
+        Args:
+            conn: DuckDB connection to insert with
+            micro_batch_rows: Rows per INSERT
+            source: Value of the source column for every appended row
+            watermark_stream: Stream whose watermark (for source) to advance with each
+                micro-batch; records must then arrive in gl_entry_id order
+            replace_existing: Overwrite stored records with the same gl_entry_id instead
+                of skipping them (e.g. when the API has restarted and re-issues IDs)
+        """
+        self._conn = conn
+        self._micro_batch_rows = micro_batch_rows
+        self._source = source
+        self._watermark_stream = watermark_stream
+        self._insert_sql = (
+            "INSERT OR REPLACE INTO raw.gl_records SELECT * FROM gl_micro_batch"
+            if replace_existing
+            else "INSERT INTO raw.gl_records SELECT * FROM gl_micro_batch ON CONFLICT DO NOTHING"
+        )
+        self._pending: list[pa.Table] = []
+        self._pending_rows = 0
+        self.rows_appended = 0
+        self.rows_skipped = 0
+        self.max_gl_entry_id: int | None = None
+
+    def append(self, table: pa.Table):
+        """Queue a table of GL records (API field order), inserting full micro-batches."""
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        while self._pending_rows >= self._micro_batch_rows:
+            self._insert(self._micro_batch_rows)
+
+    def flush(self):
+        """Insert every queued row."""
+        while self._pending_rows:
+            self._insert(self._pending_rows)
+
+    def _insert(self, rows: int):
+        """Insert the first rows queued rows as one micro-batch."""
+        queued = pa.concat_tables(self._pending)
+        micro_batch, rest = queued.slice(0, rows), queued.slice(rows)
+        self._pending = [rest] if rest.num_rows else []
+        self._pending_rows = rest.num_rows
+
+        ingested_at = pa.scalar(datetime.now(UTC), type=pa.timestamp("us", tz="UTC"))
+        micro_batch = micro_batch.append_column(
+            "ingested_at", pa.repeat(ingested_at, micro_batch.num_rows)
+        ).append_column("source", pa.repeat(pa.scalar(self._source), micro_batch.num_rows))
+        batch_max = pc.max(micro_batch.column("gl_entry_id")).as_py()
+        # DuckDB scans the registered Arrow table in place
+        self._conn.register("gl_micro_batch", micro_batch)
+        try:
+            self._conn.execute("BEGIN TRANSACTION")
+            try:
+                inserted = self._conn.execute(self._insert_sql).fetchone()[0]
+                if self._watermark_stream is not None:
+                    write_watermark(
+                        self._conn,
+                        self._source,
+                        self._watermark_stream,
+                        "raw.gl_records",
+                        batch_max,
+                        inserted,
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        finally:
+            self._conn.unregister("gl_micro_batch")
+
+        self.rows_appended += inserted
+        self.rows_skipped += micro_batch.num_rows - inserted
+        self.max_gl_entry_id = max(self.max_gl_entry_id or 0, batch_max)
+
+
+@dataclass
+class GLUpsertResult:
+    """Row counts of one upsert into raw.gl_records."""
+
+    inserted: int
+    updated: int
+    unchanged: int
+    deleted: int
+
+
+# Columns the API sends, which decide whether a stored record changed
+_RECORD_COLUMNS = ", ".join(GL_RECORD_COLUMNS)
+_RECORD_CHANGED = "({}) IS DISTINCT FROM ({})".format(
+    ", ".join(f"batch.{name}" for name in GL_RECORD_COLUMNS),
+    ", ".join(f"stored.{name}" for name in GL_RECORD_COLUMNS),
+)
+
+
+def upsert_gl_records(
+    conn,
+    table: pa.Table,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    source: str = "fastapi",
+    watermark_stream: str | None = None,
+) -> GLUpsertResult:
+    """
+    Idempotently upsert GL records from an Arrow table into raw.gl_records, keyed on gl_entry_id.
+
+    Records are compared with the stored rows first, so only new and changed records are
+    written (INSERT OR REPLACE, stamped with a fresh ingested_at) and re-processing
+    unchanged data writes nothing. With a date range, stored records from the same source
+    in [start_date, end_date) that are no longer in the table are deleted, so the range
+    ends up exactly matching the table. With a watermark stream, that stream's watermark
+    is advanced to the highest gl_entry_id in the table (never lowered); give upserts a
+    stream of their own, since a date range does not cover every lower gl_entry_id and
+    must not move an incremental stream past IDs it never ingested. Everything runs in
+    one transaction, scanning the Arrow table in place.
+
+    Args:
+        conn: DuckDB connection
+        table: GL records in API field order, unique by gl_entry_id
+        start_date: Start of the range the table covers (inclusive)
+        end_date: End of the range the table covers (exclusive)
+        source: Value of the source column for written rows
+        watermark_stream: Stream whose watermark (for source) to advance, if any
+
+    Returns:
+        Counts of inserted, updated, unchanged and deleted rows
+    """
+    conn.register("gl_upsert_batch", table)
+    try:
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            # Records that are new or differ from the stored row (NULL-safe comparison)
+            conn.execute(f"""
+                CREATE OR REPLACE TEMP TABLE gl_upsert_changes AS
+                SELECT batch.*, stored.gl_entry_id IS NOT NULL AS is_update
+                FROM gl_upsert_batch AS batch
+                LEFT JOIN raw.gl_records AS stored USING (gl_entry_id)
+                WHERE stored.gl_entry_id IS NULL OR {_RECORD_CHANGED}
+            """)
+            inserted, updated = conn.execute(
+                "SELECT COUNT(*) FILTER (NOT is_update), COUNT(*) FILTER (is_update) "
+                "FROM gl_upsert_changes"
+            ).fetchone()
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO raw.gl_records
+                SELECT {_RECORD_COLUMNS}, now() AT TIME ZONE 'UTC' AS ingested_at, ? AS source
+                FROM gl_upsert_changes
+            """,
+                [source],
+            )
+
+            deleted = 0
+            if start_date is not None and end_date is not None:
+                # Plain comparisons on the column, so zone maps can skip unrelated row groups
+                deleted = conn.execute(
+                    """
+                    DELETE FROM raw.gl_records
+                    WHERE transaction_date >= ? AND transaction_date < ? AND source = ?
+                      AND gl_entry_id NOT IN (SELECT gl_entry_id FROM gl_upsert_batch)
+                """,
+                    [start_date, end_date, source],
+                ).fetchone()[0]
+            if watermark_stream is not None and table.num_rows:
+                write_watermark(
+                    conn,
+                    source,
+                    watermark_stream,
+                    "raw.gl_records",
+                    pc.max(table.column("gl_entry_id")).as_py(),
+                    inserted + updated,
+                )
+            conn.execute("DROP TABLE gl_upsert_changes")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.unregister("gl_upsert_batch")
+
+    return GLUpsertResult(
+        inserted=inserted,
+        updated=updated,
+        unchanged=table.num_rows - inserted - updated,
+        deleted=deleted,
+    )
+
+
+def split_date_range(start_date: date, end_date: date, window_days: int) -> list[tuple[date, date]]:
+    """Split an inclusive date range into consecutive inclusive windows of at most window_days."""
+    windows = []
+    while start_date <= end_date:
+        window_end = min(start_date + timedelta(days=window_days - 1), end_date)
+        windows.append((start_date, window_end))
+        start_date = window_end + timedelta(days=1)
+    return windows
+
+
 class DuckDBWarehouse(ConfigurableResource):
     """DuckDB warehouse resource for direct database access."""
 
@@ -32,26 +369,134 @@ class DuckDBWarehouse(ConfigurableResource):
 
 
 class FastAPIClient(ConfigurableResource):
-    """FastAPI client resource for ingesting GL data."""
+    """
+    FastAPI client resource for ingesting GL data.
+
+    Requests share one pooled session (keep-alive connections, at most max_concurrency
+    of them) and time out after timeout_seconds.
+    """
 
     base_url: str = os.getenv("FASTAPI_URL", "http://fastapi:8000")
+    timeout_seconds: float = 30.0
+    # Date-range fetches are split into windows of window_days, max_concurrency at a time
+    window_days: int = 31
+    max_concurrency: int = 4
+
+    _session: requests.Session | None = PrivateAttr(default=None)
+
+    def _get(self, path: str, params: dict | None = None) -> requests.Response:
+        """GET a path of the API over the pooled session, raising on HTTP errors."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        response = self._session.get(
+            f"{self.base_url}{path}", params=params, timeout=self.timeout_seconds
+        )
+        response.raise_for_status()
+        return response
 
     def get_health(self) -> dict:
         """Get FastAPI service health."""
-        response = requests.get(f"{self.base_url}/health")
-        response.raise_for_status()
-        return response.json()
+        return self._get("/health").json()
+
+    def get_gl_table(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        page_size: int = 10000,
+        max_records: int | None = None,
+    ) -> pa.Table:
+        """
+        Get GL records from the batch endpoint as an Arrow table (Arrow IPC stream format),
+        following the cursor until every matching record has been read.
 
-    def get_gl_records(self, start_date: str = None, end_date: str = None, limit: int = 1000) -> list:
-        """Get GL records from FastAPI batch endpoint (non-streaming)."""
+        A date range is filtered by the server. Ranges longer than window_days are split
+        into windows that are fetched concurrently (at most max_concurrency at a time) and
+        concatenated in date order. Each page's table references its response buffer
+        directly, so the concatenated table can be handed to DuckDB without another copy.
 
-        params = {"limit": limit}
+        Args:
+            start_date: Start of the transaction date range (YYYY-MM-DD, inclusive)
+            end_date: End of the transaction date range (YYYY-MM-DD, inclusive)
+            page_size: Records requested per page (the endpoint allows at most 10,000)
+            max_records: Stop once this many records have been read (default: all)
+        """
         if start_date and end_date:
-            params.update({"start_date": start_date, "end_date": end_date})
+            windows = split_date_range(
+                date.fromisoformat(start_date), date.fromisoformat(end_date), self.window_days
+            )
+        else:
+            windows = [(start_date, end_date)]
 
-        # Use the new batch endpoint for predictable, finite data
-        response = requests.get(f"{self.base_url}/get-gl-batch", params=params)
-        response.raise_for_status()
-        return response.json().get("data", [])
+        def fetch_window(window: tuple) -> list[pa.Table]:
+            window_start, window_end = (str(day) if day else None for day in window)
+            return list(self._get_pages(window_start, window_end, page_size, max_records))
+
+        if len(windows) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(windows))) as pool:
+                tables = [
+                    table
+                    for window_tables in pool.map(fetch_window, windows)
+                    for table in window_tables
+                ]
+        else:
+            tables = fetch_window(windows[0])
+        table = pa.concat_tables(tables)
+        return table.slice(0, max_records) if max_records is not None else table
+
+    def iter_gl_tables(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        page_size: int = 10000,
+        after_gl_entry_id: int | None = None,
+    ) -> Iterator[pa.Table]:
+        """
+        Stream GL records from the batch endpoint one Arrow page at a time, in gl_entry_id order.
+
+        Only the current page is held in memory, so any number of records can be passed
+        on (e.g. to a GLRecordAppender) with flat memory use.
+
+        Args:
+            start_date: Start of the transaction date range (YYYY-MM-DD)
+            end_date: End of the transaction date range (YYYY-MM-DD)
+            page_size: Records requested per page (the endpoint allows at most 10,000)
+            after_gl_entry_id: Only records with a greater gl_entry_id (default: all)
+        """
+        for page in self._get_pages(start_date, end_date, page_size, None, after_gl_entry_id):
+            if page.num_rows:
+                yield page
+
+    def _get_pages(
+        self,
+        start_date,
+        end_date,
+        page_size: int,
+        max_records: int | None,
+        after_gl_entry_id: int | None = None,
+    ) -> Iterator[pa.Table]:
+        """
+        Yield each page of /get-gl-batch in gl_entry_id order as an Arrow table, following
+        the cursor read from the X-Next-Cursor/X-Has-More headers.
+        """
+        params = {"limit": page_size, "format": "arrow"}
+        if start_date and end_date:
+            params.update({"start_date": start_date, "end_date": end_date})
+        if after_gl_entry_id:
+            params["after_gl_entry_id"] = after_gl_entry_id
 
+        read = 0
+        while True:
+            response = self._get("/get-gl-batch", params=params)
+            page = pa.ipc.open_stream(pa.py_buffer(response.content)).read_all()
+            next_cursor = response.headers.get("X-Next-Cursor")
+            has_more = response.headers.get("X-Has-More") == "true"
+            yield page
 
+            read += page.num_rows
+            if not has_more or not next_cursor or (max_records is not None and read >= max_records):
+                return
+            params["cursor"] = next_cursor
@@ -0,0 +1,86 @@
+"""Shared pytest setup: import paths, a DuckDB warehouse, GL record tables and live records."""
+
+import asyncio
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The API imports its packages relative to api/ (as in its container); orchestration
+# and database import relative to the repository root
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "api"))
+
+from services.record_export import GL_ARROW_SCHEMA  # noqa: E402
+
+from database.migrations import migrate_ingestion_log_key  # noqa: E402
+
+
+def init_warehouse(conn):
+    """Create the schemas and tables of database/init, as the connection manager does."""
+    for script in sorted((ROOT / "database" / "init").glob("*.sql")):
+        conn.execute(script.read_text())
+    migrate_ingestion_log_key(conn)
+
+
+@pytest.fixture
+def warehouse():
+    """In-memory DuckDB connection with the schemas and tables of database/init."""
+    conn = duckdb.connect(":memory:")
+    init_warehouse(conn)
+    conn.execute("USE memory.main")
+    yield conn
+    conn.close()
+
+
+def gl_table(ids, transaction_date: date = date(2025, 11, 10), amount: float = 100.0) -> pa.Table:
+    """Arrow table of GL records with the given ids, in API field order."""
+    created = datetime.combine(transaction_date, datetime.min.time())
+    rows = [
+        {
+            "gl_entry_id": gl_entry_id,
+            "journal_batch": "JB-1",
+            "journal_entry": f"JE-{gl_entry_id}",
+            "transaction_date": transaction_date,
+            "posting_date": transaction_date + timedelta(days=1),
+            "account_code": "5000",
+            "account_name": "Lease Operating Expense",
+            "account_type": "Expense",
+            "debit_amount": amount,
+            "credit_amount": 0.0,
+            "net_amount": amount,
+            "well_id": "W-1",
+            "lease_name": "Lease 1",
+            "property_id": "P-1",
+            "afe_number": None,
+            "jib_number": None,
+            "cost_center": "CC-1",
+            "journal_source": "AP",
+            "transaction_type": "Invoice",
+            "description": "test",
+            "fiscal_period": transaction_date.strftime("%Y-%m"),
+            "fiscal_year": transaction_date.year,
+            "fiscal_month": transaction_date.month,
+            "state": "TX",
+            "county": "Midland",
+            "basin": "Permian",
+            "created_timestamp": created,
+            "created_by": "test",
+            "last_modified": created,
+        }
+        for gl_entry_id in ids
+    ]
+    return pa.Table.from_pylist(rows, schema=GL_ARROW_SCHEMA)
+
+
+async def generate_live(streamer, count: int):
+    """Run the interval generator (without delays) until count live records exist."""
+    task = asyncio.create_task(streamer.background_generate(interval_seconds=0))
+    while streamer.get_current_records_count() < count:
+        await asyncio.sleep(0)
+    task.cancel()
@@ -0,0 +1,132 @@
+"""Endpoint tests against a small in-process streamer (no background generation)."""
+
+import asyncio
+from datetime import timedelta
+
+import main
+import pyarrow as pa
+import pytest
+from conftest import generate_live
+from fastapi.testclient import TestClient
+from services.gl_streamer import GLDataStreamer
+from services.response_cache import ResponseCache
+
+
+def make_client(monkeypatch, cache_bytes: int = 1024 * 1024, **streamer_options) -> TestClient:
+    """TestClient for the app with its streamer and response cache replaced."""
+    streamer = GLDataStreamer(historical_days=60, **streamer_options)
+    monkeypatch.setattr(main, "gl_streamer", streamer)
+    monkeypatch.setattr(main, "response_cache", ResponseCache(cache_bytes))
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def counter_client(monkeypatch):
+    return make_client(monkeypatch, counter_based=True, preload_days=10)
+
+
+def test_id_range_regenerates_history_before_the_preloaded_window(counter_client, monkeypatch):
+    response = counter_client.get(
+        "/get-gl-by-id", params={"first_gl_entry_id": 1, "last_gl_entry_id": 60}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 60
+    assert [record["gl_entry_id"] for record in body["data"]] == list(range(1, 61))
+
+    # Same records as a streamer that preloaded the whole history
+    full = make_client(monkeypatch, counter_based=True)
+    assert (
+        full.get("/get-gl-by-id", params={"first_gl_entry_id": 1, "last_gl_entry_id": 60}).content
+        == response.content
+    )
+
+
+def test_id_range_is_capped_at_the_last_generated_record(counter_client):
+    body = counter_client.get(
+        "/get-gl-by-id", params={"first_gl_entry_id": 55, "last_gl_entry_id": 500}
+    ).json()
+    assert [record["gl_entry_id"] for record in body["data"]] == list(range(55, 61))
+
+
+def test_id_range_in_sequential_mode_serves_buffered_records(monkeypatch):
+    client = make_client(monkeypatch)
+    body = client.get(
+        "/get-gl-by-id", params={"first_gl_entry_id": 10, "last_gl_entry_id": 12}
+    ).json()
+    assert [record["gl_entry_id"] for record in body["data"]] == [10, 11, 12]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"first_gl_entry_id": 5, "last_gl_entry_id": 4},
+        {"first_gl_entry_id": 1, "last_gl_entry_id": 10001},
+    ],
+)
+def test_id_range_rejects_invalid_ranges(counter_client, params):
+    assert counter_client.get("/get-gl-by-id", params=params).status_code == 400
+
+
+def historical_batch_params(**params) -> dict:
+    end = main.gl_streamer.FIXED_START_DATE - timedelta(days=1)
+    return {
+        "start_date": str(end - timedelta(days=29)),
+        "end_date": str(end),
+        "format": "arrow",
+        **params,
+    }
+
+
+def test_historical_batch_is_cached_with_an_etag(monkeypatch):
+    client = make_client(monkeypatch)
+    first = client.get("/get-gl-batch", params=historical_batch_params())
+    assert first.status_code == 200 and first.headers["etag"]
+    assert pa.ipc.open_stream(first.content).read_all().num_rows == 30
+
+    repeated = client.get(
+        "/get-gl-batch",
+        params=historical_batch_params(),
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert repeated.status_code == 304
+    assert main.response_cache.hits == 1
+
+
+def test_batch_larger_than_the_cache_is_streamed_uncached(monkeypatch):
+    cached = make_client(monkeypatch).get("/get-gl-batch", params=historical_batch_params())
+
+    client = make_client(monkeypatch, cache_bytes=1024)
+    response = client.get("/get-gl-batch", params=historical_batch_params())
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.headers["x-record-count"] == "30"
+    assert response.content == cached.content
+    assert len(main.response_cache) == 0
+
+
+def test_cached_history_follows_retention(monkeypatch):
+    client = make_client(monkeypatch, max_records=60)
+    batch = client.get("/get-gl-batch", params=historical_batch_params())
+    ranged = client.get("/get-gl", params=historical_batch_params(format=None))
+    assert pa.ipc.open_stream(batch.content).read_all().num_rows == 30
+    assert ranged.json()["count"] == 30
+
+    # Live records push the oldest history out of the retention window
+    asyncio.run(generate_live(main.gl_streamer, 40))
+    evicted = main.gl_streamer.get_evicted_historical_count()
+    assert evicted > 30
+
+    after = client.get(
+        "/get-gl-batch",
+        params=historical_batch_params(),
+        headers={"If-None-Match": batch.headers["etag"]},
+    )
+    assert after.status_code == 200
+    assert after.headers["etag"] != batch.headers["etag"]
+    ids = pa.ipc.open_stream(after.content).read_all().column("gl_entry_id").to_pylist()
+    assert ids == list(range(evicted + 1, 61))
+    assert client.get("/get-gl", params=historical_batch_params(format=None)).json()[
+        "count"
+    ] == len(ids)
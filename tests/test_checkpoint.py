@@ -0,0 +1,110 @@
+"""Checkpointing the live generator and resuming the stream after a restart."""
+
+import asyncio
+import json
+import random
+
+import pytest
+from conftest import generate_live
+from services.checkpoint import checkpoint_path, load_checkpoint, write_checkpoint
+from services.gl_streamer import GLDataStreamer
+from services.history_snapshot import rng_state_to_json
+
+KEY = {
+    "seed": 1,
+    "start_date": "2025-01-01",
+    "historical_days": 30,
+    "counter_based": False,
+    "preload_days": None,
+}
+
+
+def live_records(streamer: GLDataStreamer, first_gl_entry_id: int) -> list:
+    return streamer.get_records_by_id_range(first_gl_entry_id, streamer.get_last_gl_entry_id())
+
+
+def test_checkpoint_round_trips_and_rejects_other_configurations(tmp_path):
+    path = checkpoint_path(tmp_path, KEY)
+    state = {
+        "counter": 57,
+        "journal_batch": 3,
+        "rng_state": rng_state_to_json(random.Random(5).getstate()),
+        "live_datetime": "2025-01-01T00:00:27",
+        "current_records_count": 57,
+        "total_streamed_count": 57,
+    }
+    write_checkpoint(path, KEY, state)
+
+    checkpoint = load_checkpoint(path, KEY)
+    assert checkpoint.counter == 57
+    assert checkpoint.rng_state == random.Random(5).getstate()
+    assert load_checkpoint(path, {**KEY, "seed": 2}) is None
+    assert load_checkpoint(tmp_path / "missing.json", KEY) is None
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_unreadable_checkpoint_is_ignored(tmp_path):
+    path = checkpoint_path(tmp_path, KEY)
+    path.write_text("{not json")
+    assert load_checkpoint(path, KEY) is None
+    path.write_text(json.dumps({"version": 0, "key": KEY}))
+    assert load_checkpoint(path, KEY) is None
+
+
+def test_restarted_stream_continues_where_it_stopped(tmp_path):
+    uninterrupted = GLDataStreamer(historical_days=30, seed=9)
+    asyncio.run(generate_live(uninterrupted, 30))
+
+    first = GLDataStreamer(historical_days=30, seed=9, checkpoint_directory=str(tmp_path))
+    asyncio.run(generate_live(first, 20))
+    stopped_at = first.get_last_gl_entry_id()
+    first.close()
+
+    resumed = GLDataStreamer(historical_days=30, seed=9, checkpoint_directory=str(tmp_path))
+    assert resumed.get_last_gl_entry_id() == stopped_at
+    asyncio.run(generate_live(resumed, 30))
+
+    expected = [
+        record
+        for record in live_records(uninterrupted, stopped_at + 1)
+        if record.gl_entry_id <= resumed.get_last_gl_entry_id()
+    ]
+    assert live_records(resumed, stopped_at + 1) == expected
+    assert expected
+
+
+async def generate_load(streamer: GLDataStreamer, count: int):
+    """Run the load generator until count live records exist."""
+    task = asyncio.create_task(
+        streamer.background_generate_load(records_per_second=100_000, tick_seconds=0.001)
+    )
+    while streamer.get_current_records_count() < count:
+        await asyncio.sleep(0.001)
+    task.cancel()
+
+
+@pytest.mark.parametrize("options", [{}, {"counter_based": True}, {"records_per_day": 1000}])
+def test_records_before_the_checkpoint_are_regenerated(tmp_path, options):
+    first = GLDataStreamer(
+        historical_days=30, seed=9, checkpoint_directory=str(tmp_path), **options
+    )
+    asyncio.run((generate_load if options.get("records_per_day") else generate_live)(first, 20))
+    stopped_at = first.get_last_gl_entry_id()
+    before = first.get_records_by_id_range(1, stopped_at)
+    aggregates = first.get_aggregates("basin")
+    buffered = first.encode_page_json(first.select_records())
+    first.close()
+
+    resumed = GLDataStreamer(
+        historical_days=30, seed=9, checkpoint_directory=str(tmp_path), **options
+    )
+    page = resumed.select_id_range(1, stopped_at)
+    assert page.last_gl_entry_id == stopped_at
+    assert resumed.get_records_by_id_range(1, stopped_at) == before
+    # Sums may differ in the last cent: the records are folded in other batches than before
+    regenerated = resumed.get_aggregates("basin")
+    assert regenerated["totals"] == pytest.approx(aggregates["totals"], abs=0.02)
+    assert [group["count"] for group in regenerated["groups"]] == [
+        group["count"] for group in aggregates["groups"]
+    ]
+    assert resumed.encode_page_json(resumed.select_records()) == buffered
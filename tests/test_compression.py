@@ -0,0 +1,53 @@
+"""Accept-Encoding negotiation and flushed streaming compression."""
+
+import zlib
+
+import pytest
+from services.compression import (
+    SUPPORTED_ENCODINGS,
+    StreamCompressor,
+    compress_body,
+    compress_chunks,
+    negotiate_encoding,
+)
+
+
+def make_decoder(encoding: str):
+    """Incremental decoder for a gzip or zstd stream."""
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(wbits=31)
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    return make_decoder(encoding).decompress(data)
+
+
+def test_negotiation_honours_quality_values():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("gzip") == "gzip"
+    assert negotiate_encoding("*") == SUPPORTED_ENCODINGS[0]
+    if "zstd" in SUPPORTED_ENCODINGS:
+        assert negotiate_encoding("gzip, zstd") == "zstd"
+        assert negotiate_encoding("gzip, zstd;q=0.5") == "gzip"
+
+
+@pytest.mark.parametrize("encoding", SUPPORTED_ENCODINGS)
+def test_each_streamed_chunk_is_decodable_on_its_own(encoding):
+    compressor = StreamCompressor(encoding)
+    decoder = make_decoder(encoding)
+    for line in (b'{"gl_entry_id":1}\n', b'{"gl_entry_id":2}\n'):
+        assert decoder.decompress(compressor.compress(line)) == line
+
+
+@pytest.mark.parametrize("encoding", SUPPORTED_ENCODINGS)
+def test_stream_and_body_compression_round_trip(encoding):
+    chunks = [b"a" * 1000, b"", b"b" * 1000]
+    assert decompress(b"".join(compress_chunks(iter(chunks), encoding)), encoding) == b"".join(
+        chunks
+    )
+    assert decompress(compress_body(b"c" * 2000, encoding), encoding) == b"c" * 2000
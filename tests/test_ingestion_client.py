@@ -0,0 +1,55 @@
+"""FastAPIClient reading Arrow pages from the app and loading them into DuckDB."""
+
+from datetime import timedelta
+
+import main
+import pytest
+from fastapi.testclient import TestClient
+from services.gl_streamer import GLDataStreamer
+from services.response_cache import ResponseCache
+
+from orchestration.resources import FastAPIClient, GLRecordAppender, upsert_gl_records
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """FastAPIClient whose requests are served in-process by the app."""
+    monkeypatch.setattr(main, "gl_streamer", GLDataStreamer(historical_days=90))
+    monkeypatch.setattr(main, "response_cache", ResponseCache(1024 * 1024))
+    app_client = TestClient(main.app)
+
+    def get(self, path, params=None):
+        response = app_client.get(path, params=params)
+        response.raise_for_status()
+        return response
+
+    monkeypatch.setattr(FastAPIClient, "_get", get)
+    return FastAPIClient(window_days=10, max_concurrency=3)
+
+
+def test_date_range_windows_are_fetched_in_order(client):
+    end = main.gl_streamer.FIXED_START_DATE - timedelta(days=1)
+    start = end - timedelta(days=44)
+
+    table = client.get_gl_table(str(start), str(end), page_size=4)
+
+    assert table.column("gl_entry_id").to_pylist() == list(range(46, 91))
+
+
+def test_pages_after_a_watermark_append_into_duckdb(client, warehouse):
+    appender = GLRecordAppender(warehouse, micro_batch_rows=25, watermark_stream="gl_records")
+    for page in client.iter_gl_tables(page_size=10, after_gl_entry_id=30):
+        appender.append(page)
+    appender.flush()
+
+    assert appender.rows_appended == 60
+    stored = warehouse.execute(
+        "SELECT MIN(gl_entry_id), MAX(gl_entry_id) FROM raw.gl_records"
+    ).fetchone()
+    assert stored == (31, 90)
+
+
+def test_fetched_table_upserts_into_duckdb(client, warehouse):
+    table = client.get_gl_table(page_size=50)
+    assert upsert_gl_records(warehouse, table).inserted == 90
+    assert upsert_gl_records(warehouse, table).unchanged == 90
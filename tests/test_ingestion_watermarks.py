@@ -0,0 +1,182 @@
+"""Upserts, micro-batch appends and the shared ingestion watermark in DuckDB."""
+
+from datetime import date, timedelta
+
+import duckdb
+import pyarrow as pa
+import pytest
+from conftest import gl_table
+
+from database.migrations import migrate_ingestion_log_key
+from orchestration.resources import (
+    GL_RECORD_COLUMNS,
+    GLRecordAppender,
+    read_watermark,
+    upsert_gl_records,
+    write_watermark,
+)
+
+SOURCE = "fastapi"
+STREAM = "gl_records"
+PARTITION_STREAM = "gl_records_partitions"
+
+
+def stored_ids(conn) -> list[int]:
+    return [
+        row[0]
+        for row in conn.execute("SELECT gl_entry_id FROM raw.gl_records ORDER BY 1").fetchall()
+    ]
+
+
+def test_record_columns_match_the_api_and_the_table(warehouse):
+    stored = [row[0] for row in warehouse.execute("DESCRIBE raw.gl_records").fetchall()]
+    assert stored[: len(GL_RECORD_COLUMNS)] == list(GL_RECORD_COLUMNS)
+    assert gl_table([1]).column_names == list(GL_RECORD_COLUMNS)
+
+
+def test_upsert_is_idempotent(warehouse):
+    table = gl_table(range(1, 11))
+    first = upsert_gl_records(warehouse, table)
+    second = upsert_gl_records(warehouse, table)
+
+    assert (first.inserted, first.updated, first.unchanged) == (10, 0, 0)
+    assert (second.inserted, second.updated, second.unchanged) == (0, 0, 10)
+    assert stored_ids(warehouse) == list(range(1, 11))
+
+
+def test_upsert_updates_changed_and_deletes_missing_records_in_range(warehouse):
+    day = date(2025, 11, 10)
+    upsert_gl_records(warehouse, gl_table(range(1, 6), day), day, day + timedelta(days=1))
+
+    changed = pa.concat_tables([gl_table([1, 2], day, amount=250.0), gl_table([3], day)])
+    result = upsert_gl_records(warehouse, changed, day, day + timedelta(days=1))
+
+    assert (result.inserted, result.updated, result.unchanged, result.deleted) == (0, 2, 1, 2)
+    assert stored_ids(warehouse) == [1, 2, 3]
+
+
+def test_appender_inserts_micro_batches_and_advances_watermark(warehouse):
+    appender = GLRecordAppender(warehouse, micro_batch_rows=4, watermark_stream=STREAM)
+    appender.append(gl_table(range(1, 4)))
+    appender.append(gl_table(range(4, 11)))
+    appender.flush()
+
+    assert appender.rows_appended == 10
+    assert appender.max_gl_entry_id == 10
+    assert stored_ids(warehouse) == list(range(1, 11))
+    assert read_watermark(warehouse, SOURCE, STREAM) == 10
+
+
+def test_upsert_advances_watermark_inside_its_transaction(warehouse):
+    upsert_gl_records(warehouse, gl_table(range(1, 21)), watermark_stream=STREAM)
+    assert read_watermark(warehouse, SOURCE, STREAM) == 20
+
+    # An older range never moves the watermark back
+    upsert_gl_records(warehouse, gl_table(range(1, 6)), watermark_stream=STREAM)
+    assert read_watermark(warehouse, SOURCE, STREAM) == 20
+
+
+def test_appender_after_upsert_skips_records_already_stored(warehouse):
+    # The partitioned asset wrote a quarter that reaches into the live records...
+    upsert_gl_records(warehouse, gl_table(range(360, 371)), watermark_stream=None)
+    write_watermark(warehouse, SOURCE, STREAM, "raw.gl_records", 365, 0)
+
+    # ...then the live asset resumes from an older watermark and overlaps it
+    appender = GLRecordAppender(warehouse, micro_batch_rows=5, watermark_stream=STREAM)
+    appender.append(gl_table(range(366, 381)))
+    appender.flush()
+
+    assert appender.rows_appended == 10
+    assert appender.rows_skipped == 5
+    assert stored_ids(warehouse) == list(range(360, 381))
+    assert read_watermark(warehouse, SOURCE, STREAM) == 380
+
+
+def test_upsert_after_appender_replaces_nothing_unchanged(warehouse):
+    appender = GLRecordAppender(warehouse, watermark_stream=STREAM)
+    appender.append(gl_table(range(1, 11)))
+    appender.flush()
+
+    result = upsert_gl_records(warehouse, gl_table(range(1, 16)), watermark_stream=PARTITION_STREAM)
+
+    assert (result.inserted, result.updated, result.unchanged) == (5, 0, 10)
+    assert read_watermark(warehouse, SOURCE, PARTITION_STREAM) == 15
+    assert read_watermark(warehouse, SOURCE, STREAM) == 10
+
+    # The live asset resumes after its own watermark, skipping the upserted records
+    resumed = GLRecordAppender(warehouse, watermark_stream=STREAM)
+    resumed.append(gl_table(range(read_watermark(warehouse, SOURCE, STREAM) + 1, 21)))
+    resumed.flush()
+    assert (resumed.rows_appended, resumed.rows_skipped) == (5, 5)
+    assert stored_ids(warehouse) == list(range(1, 21))
+    assert read_watermark(warehouse, SOURCE, STREAM) == 20
+
+
+def test_partition_upsert_does_not_skip_lower_ids_for_the_live_asset(warehouse):
+    # A later quarter is upserted before the live asset has caught up to it
+    upsert_gl_records(warehouse, gl_table(range(500, 511)), watermark_stream=PARTITION_STREAM)
+    assert read_watermark(warehouse, SOURCE, STREAM) is None
+
+    appender = GLRecordAppender(warehouse, micro_batch_rows=100, watermark_stream=STREAM)
+    appender.append(gl_table(range(1, 511)))
+    appender.flush()
+
+    assert appender.rows_appended == 499
+    assert stored_ids(warehouse) == list(range(1, 511))
+
+
+def test_failed_micro_batch_rolls_back_with_its_watermark(warehouse):
+    appender = GLRecordAppender(warehouse, watermark_stream=STREAM)
+    broken = gl_table([1]).set_column(1, "journal_batch", pa.array([None], type=pa.string()))
+    appender.append(broken)
+
+    with pytest.raises(Exception, match="NOT NULL"):
+        appender.flush()
+    assert stored_ids(warehouse) == []
+    assert read_watermark(warehouse, SOURCE, STREAM) is None
+
+
+def test_legacy_log_is_rekeyed_on_source_and_stream():
+    conn = duckdb.connect(":memory:")
+    conn.execute("CREATE SCHEMA raw")
+    # The table as created before watermarks, then upgraded by the init scripts
+    conn.execute("""
+        CREATE TABLE raw.metadata_ingestion_log (
+            table_name VARCHAR PRIMARY KEY,
+            last_ingestion_time TIMESTAMP NOT NULL,
+            records_processed INTEGER DEFAULT 0,
+            ingestion_status VARCHAR DEFAULT 'success',
+            error_message TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX idx_metadata_ingestion_log_table ON raw.metadata_ingestion_log(table_name)"
+    )
+    conn.execute(
+        "INSERT INTO raw.metadata_ingestion_log "
+        "VALUES ('raw.gl_records', now(), 7, 'success', NULL, now())"
+    )
+    for column, definition in [
+        ("source", "VARCHAR DEFAULT 'fastapi'"),
+        ("stream", "VARCHAR DEFAULT 'gl_records'"),
+        ("last_gl_entry_id", "BIGINT DEFAULT 0"),
+    ]:
+        conn.execute(
+            f"ALTER TABLE raw.metadata_ingestion_log ADD COLUMN IF NOT EXISTS {column} {definition}"
+        )
+    conn.execute("UPDATE raw.metadata_ingestion_log SET last_gl_entry_id = 42")
+
+    assert migrate_ingestion_log_key(conn)
+    assert not migrate_ingestion_log_key(conn)
+    assert read_watermark(conn, SOURCE, STREAM) == 42
+
+    # Two streams writing the same table no longer collide
+    write_watermark(conn, SOURCE, STREAM, "raw.gl_records", 50, 8)
+    write_watermark(conn, SOURCE, PARTITION_STREAM, "raw.gl_records", 900, 100)
+    assert read_watermark(conn, SOURCE, STREAM) == 50
+    assert read_watermark(conn, SOURCE, PARTITION_STREAM) == 900
+
+
+def test_fresh_log_needs_no_migration(warehouse):
+    assert not migrate_ingestion_log_key(warehouse)
@@ -0,0 +1,133 @@
+"""live_ingestion_sensor: when runs are requested, how the cursor moves and what the runs ingest."""
+
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+from conftest import gl_table, init_warehouse
+from dagster import DagsterInstance, RunRequest, SkipReason, build_sensor_context, materialize
+
+from orchestration.assets.ingestion import raw_gl_records_simple
+from orchestration.definitions import live_ingestion_sensor, parse_live_cursor
+from orchestration.resources import DuckDBWarehouse, FastAPIClient
+
+
+@pytest.fixture
+def instance():
+    with DagsterInstance.ephemeral() as instance:
+        yield instance
+
+
+def evaluate(instance, monkeypatch, last_gl_entry_id: int, cursor: str | None = None):
+    """Run one sensor tick against an API at last_gl_entry_id; returns (result, new cursor)."""
+    monkeypatch.setattr(
+        FastAPIClient, "get_health", lambda self: {"last_gl_entry_id": last_gl_entry_id}
+    )
+    context = build_sensor_context(
+        instance=instance, cursor=cursor, resources={"fastapi_client": FastAPIClient()}
+    )
+    result = live_ingestion_sensor(context)
+    return result, context.cursor
+
+
+def test_new_records_request_a_run(instance, monkeypatch):
+    result, cursor = evaluate(instance, monkeypatch, 400, "0:380")
+    assert isinstance(result, RunRequest)
+    assert result.run_key == "live-400"
+    assert parse_live_cursor(cursor) == (0, 400)
+
+
+def test_nothing_new_skips(instance, monkeypatch):
+    result, cursor = evaluate(instance, monkeypatch, 400, "0:400")
+    assert isinstance(result, SkipReason)
+    assert cursor == "0:400"
+
+
+def test_cursors_without_an_epoch_are_still_read(instance, monkeypatch):
+    assert parse_live_cursor("400") == (0, 400)
+    result, _ = evaluate(instance, monkeypatch, 400, "400")
+    assert isinstance(result, SkipReason)
+
+
+def test_api_restart_resets_the_cursor(instance, monkeypatch):
+    result, cursor = evaluate(instance, monkeypatch, 370, "0:5000")
+    assert isinstance(result, RunRequest)
+    assert result.run_key == "live-1-370"
+    assert parse_live_cursor(cursor) == (1, 370)
+
+    # Following ticks compare against the restarted API's IDs
+    result, cursor = evaluate(instance, monkeypatch, 371, cursor)
+    assert isinstance(result, RunRequest)
+    assert result.run_key == "live-1-371"
+
+
+def test_failed_health_check_skips(instance, monkeypatch):
+    def unreachable(self):
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(FastAPIClient, "get_health", unreachable)
+    context = build_sensor_context(instance=instance, resources={"fastapi_client": FastAPIClient()})
+    assert isinstance(live_ingestion_sensor(context), SkipReason)
+
+
+def serve(monkeypatch, table: pa.Table):
+    """Make FastAPIClient talk to an API holding table (in gl_entry_id order)."""
+    last_gl_entry_id = pc.max(table.column("gl_entry_id")).as_py()
+
+    def iter_gl_tables(
+        self, start_date=None, end_date=None, page_size=10000, after_gl_entry_id=None
+    ):
+        yield table.filter(pc.field("gl_entry_id") > (after_gl_entry_id or 0))
+
+    monkeypatch.setattr(
+        FastAPIClient, "get_health", lambda self: {"last_gl_entry_id": last_gl_entry_id}
+    )
+    monkeypatch.setattr(FastAPIClient, "iter_gl_tables", iter_gl_tables)
+
+
+def tick_and_run(instance, database_path: str, cursor: str | None) -> tuple[str, int]:
+    """Run one sensor tick and materialize the run it requests; returns (cursor, rows stored)."""
+    resources = {
+        "duckdb_warehouse": DuckDBWarehouse(database_path=database_path),
+        "fastapi_client": FastAPIClient(),
+    }
+    context = build_sensor_context(instance=instance, cursor=cursor, resources=resources)
+    request = live_ingestion_sensor(context)
+    assert isinstance(request, RunRequest)
+    assert materialize(
+        [raw_gl_records_simple], resources=resources, run_config=request.run_config
+    ).success
+    with duckdb.connect(database_path) as conn:
+        return context.cursor, conn.execute("SELECT COUNT(*) FROM raw.gl_records").fetchone()[0]
+
+
+def test_run_after_api_restart_ingests_the_reissued_ids(instance, monkeypatch, tmp_path):
+    database_path = str(tmp_path / "analytics.duckdb")
+    with duckdb.connect(database_path) as conn:
+        init_warehouse(conn)
+
+    serve(monkeypatch, gl_table(range(1, 501)))
+    cursor, stored = tick_and_run(instance, database_path, None)
+    assert (parse_live_cursor(cursor), stored) == ((0, 500), 500)
+
+    # The API restarts and issues IDs from 1 again, for different records
+    serve(monkeypatch, gl_table(range(1, 371), amount=250.0))
+    cursor, stored = tick_and_run(instance, database_path, cursor)
+    assert parse_live_cursor(cursor) == (1, 370)
+    with duckdb.connect(database_path) as conn:
+        amounts = conn.execute(
+            "SELECT gl_entry_id <= 370, MIN(debit_amount), COUNT(*) "
+            "FROM raw.gl_records GROUP BY 1 ORDER BY 1"
+        ).fetchall()
+        watermarks = dict(
+            conn.execute(
+                "SELECT stream, last_gl_entry_id FROM raw.metadata_ingestion_log"
+            ).fetchall()
+        )
+    assert amounts == [(False, 100.0, 130), (True, 250.0, 370)]
+    assert watermarks == {"gl_records": 500, "gl_records@epoch1": 370}
+
+    # Later records of the restarted API continue from its own watermark
+    serve(monkeypatch, gl_table(range(1, 401), amount=250.0))
+    cursor, stored = tick_and_run(instance, database_path, cursor)
+    assert (parse_live_cursor(cursor), stored) == ((1, 400), 500)
@@ -0,0 +1,104 @@
+"""Cursor pagination across the historical batch and the live records after it."""
+
+import asyncio
+from datetime import timedelta
+
+import main
+import numpy as np
+import pytest
+import services.gl_streamer as gl_streamer_module
+from conftest import generate_live
+from fastapi.testclient import TestClient
+from services.gl_streamer import GLDataStreamer
+from services.response_cache import ResponseCache
+
+
+def make_streamer(live_records: int = 40, **options) -> GLDataStreamer:
+    streamer = GLDataStreamer(historical_days=30, **options)
+    asyncio.run(generate_live(streamer, live_records))
+    return streamer
+
+
+@pytest.fixture
+def client(monkeypatch):
+    streamer = make_streamer()
+    monkeypatch.setattr(main, "gl_streamer", streamer)
+    monkeypatch.setattr(main, "response_cache", ResponseCache(1024 * 1024))
+    return TestClient(main.app)
+
+
+def read_all_pages(client: TestClient, **params) -> list[int]:
+    """gl_entry_ids of every page of /get-gl-batch, following next_cursor."""
+    ids = []
+    params = {"limit": 7, **params}
+    while True:
+        body = client.get("/get-gl-batch", params=params).json()
+        ids += [record["gl_entry_id"] for record in body["data"]]
+        if not body["has_more"]:
+            return ids
+        params["cursor"] = body["next_cursor"]
+
+
+def test_pages_cover_every_buffered_record_once(client):
+    ids = read_all_pages(client)
+    assert ids == list(range(1, main.gl_streamer.get_last_gl_entry_id() + 1))
+
+
+def test_date_range_pages_cross_from_history_into_live_records(client):
+    start = main.gl_streamer.FIXED_START_DATE
+    ids = read_all_pages(
+        client, start_date=str(start - timedelta(days=10)), end_date=str(start + timedelta(days=1))
+    )
+    last_id = main.gl_streamer.get_last_gl_entry_id()
+    # The last 10 historical days, then every live record
+    assert ids == list(range(21, 31)) + list(range(31, last_id + 1))
+
+
+def test_filtered_pages_match_an_unpaged_filter(client):
+    basin = main.gl_streamer.get_buffered_records()[0].basin
+    expected = [
+        record.gl_entry_id
+        for record in main.gl_streamer.get_buffered_records(filters={"basin": basin})
+    ]
+    assert read_all_pages(client, basin=basin) == expected
+
+
+def test_records_appended_between_pages_are_picked_up(client):
+    first = client.get("/get-gl-batch", params={"limit": 1000}).json()
+    assert not first["has_more"]
+    asyncio.run(generate_live(main.gl_streamer, main.gl_streamer.get_current_records_count() + 3))
+
+    following = client.get("/get-gl-batch", params={"cursor": first["next_cursor"]}).json()
+    assert following["data"][0]["gl_entry_id"] == first["data"][-1]["gl_entry_id"] + 1
+
+
+def test_filtered_page_scans_only_until_it_is_full(monkeypatch):
+    monkeypatch.setattr(gl_streamer_module, "PAGE_SCAN_RECORDS", 8)
+    streamer = make_streamer(live_records=400)
+    scanned = []
+    original_filter = streamer._record_buffer.filter
+
+    def counting_filter(start=0, stop=None, *args, **kwargs):
+        scanned.append(stop - start)
+        return original_filter(start, stop, *args, **kwargs)
+
+    monkeypatch.setattr(streamer._record_buffer, "filter", counting_filter)
+    page = streamer.select_records(filters={"account_type": "EXPENSE"}, limit=2)
+
+    assert len(page) == 2 and page.has_more
+    assert sum(scanned) < 64
+
+
+def test_counter_based_date_range_pages_match_sequential_ids():
+    streamer = make_streamer(counter_based=True, preload_days=5)
+    start = streamer.FIXED_START_DATE
+    ids, after = [], 0
+    while True:
+        page = streamer.select_records(
+            start - timedelta(days=30), start, limit=9, after_gl_entry_id=after
+        )
+        ids += [record.gl_entry_id for record in page.records]
+        if not page.has_more:
+            break
+        after = page.last_gl_entry_id
+    assert ids == list(np.arange(1, streamer.get_last_gl_entry_id() + 1))
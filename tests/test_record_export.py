@@ -0,0 +1,48 @@
+"""Arrow IPC, Parquet and CSV export of GL record batches."""
+
+import io
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+from generators import BatchGenerator
+from services.record_export import GL_ARROW_SCHEMA, batch_to_arrow, iter_encoded
+
+
+@pytest.fixture
+def table() -> pa.Table:
+    ids = np.arange(1, 251, dtype=np.int64)
+    dates = np.datetime64("2025-01-01", "D") + ids % 90
+    return batch_to_arrow(BatchGenerator(seed=11).generate_for_ids(ids, dates))
+
+
+def test_arrow_stream_round_trips(table):
+    body = b"".join(iter_encoded(table, "arrow", chunk_rows=64))
+    decoded = pa.ipc.open_stream(body).read_all()
+    assert decoded.schema == GL_ARROW_SCHEMA
+    assert decoded.equals(table)
+
+
+def test_parquet_writes_one_row_group_per_chunk(table):
+    body = b"".join(iter_encoded(table, "parquet", chunk_rows=64))
+    parquet_file = pq.ParquetFile(io.BytesIO(body))
+    assert parquet_file.num_row_groups == 4
+    assert parquet_file.read().equals(table)
+
+
+def test_csv_has_a_header_and_every_row(table):
+    body = b"".join(iter_encoded(table, "csv", chunk_rows=64))
+    decoded = pa_csv.read_csv(io.BytesIO(body))
+    assert decoded.column_names == GL_ARROW_SCHEMA.names
+    assert decoded["gl_entry_id"].to_pylist() == table["gl_entry_id"].to_pylist()
+
+
+def test_chunks_are_yielded_before_the_stream_ends(table):
+    assert len(list(iter_encoded(table, "arrow", chunk_rows=64))) > 2
+
+
+def test_unsupported_format_is_rejected(table):
+    with pytest.raises(ValueError):
+        list(iter_encoded(table, "xml"))
@@ -0,0 +1,40 @@
+"""Size-bounded LRU response cache and ETag matching."""
+
+from services.response_cache import ResponseCache, compute_etag, etag_matches
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = ResponseCache(max_bytes=30)
+    cache.put("a", b"a" * 10, {})
+    cache.put("b", b"b" * 10, {})
+    cache.put("c", b"c" * 10, {})
+    assert cache.get("a") is not None
+
+    cache.put("d", b"d" * 10, {})
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    assert cache.nbytes == 30
+
+
+def test_bodies_larger_than_the_cache_are_not_stored():
+    cache = ResponseCache(max_bytes=8)
+    entry = cache.put("big", b"x" * 9, {})
+    assert entry.etag == compute_etag(b"x" * 9)
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_replacing_a_key_keeps_the_byte_count_exact():
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", b"x" * 40, {})
+    cache.put("a", b"y" * 10, {})
+    assert cache.nbytes == 10 and len(cache) == 1
+
+
+def test_etags_are_strong_and_match_weakly():
+    etag = compute_etag(b"body")
+    assert etag.startswith('"') and etag != compute_etag(b"other")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"stale", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"stale"', etag)
@@ -0,0 +1,99 @@
+"""Tiered record store: spilling to segments, retention limits and cleanup."""
+
+import numpy as np
+import pytest
+from generators import BatchGenerator
+from services.segment_store import TieredRecordStore
+
+
+def make_batch(first_id: int, count: int):
+    ids = np.arange(first_id, first_id + count, dtype=np.int64)
+    return BatchGenerator(seed=1).generate_for_ids(
+        ids, np.datetime64("2025-01-01", "D") + ids % 365
+    )
+
+
+@pytest.fixture
+def segment_directory(tmp_path):
+    return tmp_path / "segments"
+
+
+def test_spilled_records_read_back_unchanged(segment_directory):
+    store = TieredRecordStore(segment_directory, hot_capacity=100, segment_records=40)
+    batch = make_batch(1, 250)
+    store.extend_batch(batch)
+
+    assert store.segment_count == 4
+    assert store.tier_of(0) == "disk" and store.tier_of(249) == "memory"
+    assert store.slice(0) == batch.to_records()
+
+
+def test_record_limit_evicts_oldest_segments_first(segment_directory):
+    store = TieredRecordStore(
+        segment_directory, hot_capacity=100, segment_records=40, max_records=150
+    )
+    store.extend_batch(make_batch(1, 400))
+
+    assert len(store) == 400
+    assert len(store) - store.first_position <= 150
+    assert store.column("gl_entry_id", store.first_position)[-1] == 400
+    # Evicted segments are deleted once nobody can read them
+    assert len(list(segment_directory.glob("segment-*"))) == store.segment_count
+
+
+@pytest.mark.parametrize("append_one_by_one", [False, True])
+def test_record_limit_below_hot_capacity_trims_the_hot_tier(segment_directory, append_one_by_one):
+    store = TieredRecordStore(segment_directory, hot_capacity=1000, max_records=50)
+    batch = make_batch(1, 300)
+    if append_one_by_one:
+        for record in batch.to_records():
+            store.append(record)
+            assert len(store) - store.first_position <= 50
+    else:
+        store.extend_batch(batch)
+
+    assert store.segment_count == 0
+    retained = store.slice(store.first_position)
+    assert 0 < len(retained) <= 50
+    assert [record.gl_entry_id for record in retained] == list(range(301 - len(retained), 301))
+
+
+def test_byte_limit_holds_across_both_tiers(segment_directory):
+    store = TieredRecordStore(segment_directory, hot_capacity=200, max_bytes=20_000)
+    for first_id in range(1, 1001, 100):
+        store.extend_batch(make_batch(first_id, 100))
+        assert store.nbytes() <= 20_000
+
+    assert store.first_position > 0
+    assert store.get(-1).gl_entry_id == 1000
+
+
+def test_filter_skips_evicted_positions(segment_directory):
+    store = TieredRecordStore(
+        segment_directory, hot_capacity=100, segment_records=50, max_records=100
+    )
+    store.extend_batch(make_batch(1, 300))
+
+    positions = store.filter(0, None, account_type="EXPENSE")
+    assert len(positions) and positions.min() >= store.first_position
+
+
+def test_close_removes_written_segments_from_a_given_directory(segment_directory):
+    store = TieredRecordStore(segment_directory, hot_capacity=100, segment_records=40)
+    store.extend_batch(make_batch(1, 250))
+    store.publish()
+    assert any(segment_directory.glob("segment-*"))
+
+    store.close()
+    assert not any(segment_directory.glob("segment-*"))
+    assert not any(segment_directory.glob("delta-*"))
+    assert segment_directory.exists()
+
+
+def test_close_removes_a_temporary_directory():
+    store = TieredRecordStore(hot_capacity=10)
+    store.extend_batch(make_batch(1, 30))
+    directory = store._directory
+
+    store.close()
+    assert not directory.exists()
@@ -0,0 +1,80 @@
+"""Producer election and record sharing between streamers over one directory."""
+
+import asyncio
+import json
+
+import pytest
+from conftest import generate_live
+from services.gl_streamer import GLDataStreamer
+from services.segment_store import SHARED_MANIFEST_NAME
+from services.shared_store import reset_shared_directory
+
+
+async def follow_until(reader: GLDataStreamer, last_gl_entry_id: int, timeout: float = 5.0):
+    task = asyncio.create_task(reader.follow_shared(poll_seconds=0.001))
+    try:
+        async with asyncio.timeout(timeout):
+            while reader.get_last_gl_entry_id() < last_gl_entry_id:
+                assert not task.done(), task.exception()
+                await asyncio.sleep(0.001)
+    finally:
+        task.cancel()
+
+
+@pytest.fixture
+def producer(tmp_path):
+    streamer = GLDataStreamer(historical_days=20, shared_directory=tmp_path, hot_capacity=16)
+    yield streamer
+    streamer.close()
+
+
+def test_first_streamer_produces_and_the_next_reads(producer, tmp_path):
+    reader = GLDataStreamer(historical_days=20, shared_directory=tmp_path)
+
+    assert producer.get_shared_role() == "producer"
+    assert reader.get_shared_role() == "reader"
+    assert reader.get_buffered_records() == producer.get_buffered_records()
+
+
+def test_reader_follows_records_published_off_the_event_loop(producer, tmp_path):
+    reader = GLDataStreamer(historical_days=20, shared_directory=tmp_path)
+
+    async def scenario():
+        await generate_live(producer, 40)
+        await follow_until(reader, producer.get_last_gl_entry_id())
+
+    asyncio.run(scenario())
+    assert reader.get_buffered_records() == producer.get_buffered_records()
+
+
+def test_reader_survives_an_unsupported_manifest(producer, tmp_path, caplog):
+    reader = GLDataStreamer(historical_days=20, shared_directory=tmp_path)
+    manifest_path = tmp_path / SHARED_MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest_path.write_text(json.dumps({**manifest, "version": 999, "sequence": -1}))
+
+    async def scenario():
+        task = asyncio.create_task(reader.follow_shared(poll_seconds=0.001))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        # A compatible producer publishes again and the reader carries on
+        await generate_live(producer, 5)
+        await follow_until(reader, producer.get_last_gl_entry_id())
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert "Cannot follow shared record store" in caplog.text
+    assert caplog.text.count("Cannot follow shared record store") == 1
+
+
+def test_reset_keeps_history_snapshots_in_the_shared_directory(tmp_path):
+    streamer = GLDataStreamer(historical_days=20, snapshot_directory=tmp_path)
+    streamer.close()
+    snapshots = [path.name for path in tmp_path.iterdir() if path.name.startswith("history-")]
+    assert snapshots
+
+    (tmp_path / "segment-000000000000").mkdir()
+    (tmp_path / "delta-00000001-000000000000").mkdir()
+    reset_shared_directory(tmp_path)
+
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_dir()) == sorted(snapshots)